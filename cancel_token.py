@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+CANCELLED_MESSAGE = "job cancelled"
+
+
+class JobCancelled(BaseException):
+    """Raised from a wait or sleep once the job's token is cancelled.
+
+    A ``BaseException`` like ``KeyboardInterrupt``, so the many ``except
+    Exception`` fallbacks in the browser helpers do not swallow it.
+    """
+
+    def __init__(self, message: str = CANCELLED_MESSAGE) -> None:
+        super().__init__(message)
+
+
+class CancelToken:
+    """Stop flag that sleeps and polls can wait on.
+
+    ``event`` may be a ``threading.Event`` (GUI Stop button) or a
+    ``multiprocessing.Event`` shared with worker processes; waiting on it
+    instead of ``time.sleep`` lets a stop cut any pause short.
+    """
+
+    def __init__(self, event: Any | None = None) -> None:
+        self.event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        self.event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.event.is_set()
+
+    def check(self) -> None:
+        if self.event.is_set():
+            raise JobCancelled()
+
+    def sleep(self, seconds: float) -> None:
+        if self.event.wait(max(0.0, seconds)):
+            raise JobCancelled()
+
+
+_bound = threading.local()
+
+
+def current() -> CancelToken | None:
+    """The token bound to this thread, if any."""
+    return getattr(_bound, "token", None)
+
+
+@contextmanager
+def bind(token: CancelToken | None) -> Iterator[CancelToken | None]:
+    """Make ``token`` the one :func:`check` and :func:`sleep` use on this thread.
+
+    The browser helpers are many layers deep, so they look the token up
+    here instead of taking it as a parameter on every function.
+    """
+    previous = current()
+    _bound.token = token
+    try:
+        yield token
+    finally:
+        _bound.token = previous
+
+
+def check() -> None:
+    """Raise :class:`JobCancelled` if this thread's job was cancelled."""
+    token = current()
+    if token is not None:
+        token.check()
+
+
+def sleep(seconds: float) -> None:
+    """``time.sleep`` that a cancel interrupts right away."""
+    token = current()
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.sleep(seconds)
@@ -46,7 +46,60 @@ SEL_MEDIUM = {
 MEDIUM_SELENIUM_RETRIES = 1          # number of re-attempts on failure
 MEDIUM_RETRY_DELAY_S = 1.2           # delay between attempts
 
+# Medium publish quota, checked before a browser is launched
+MEDIUM_PUBLISH_QUOTA = 3             # stories per profile...
+MEDIUM_PUBLISH_WINDOW_S = 24 * 3600  # ...per rolling window (seconds)
+MEDIUM_QUOTA_RECHECK_S = 300.0       # a quota filled by running jobs is looked at again after this
+
 # Schedule runner defaults
 SCHEDULE_TABLE_PATH = "schedule_template.csv"
 SCHEDULE_CONCURRENCY = 1
 SCHEDULE_SHOW_CONSOLE = True
+SCHEDULE_DAEMON = False              # keep a warm worker pool alive for the whole run
+SCHEDULE_OVERLAP_SLOTS = False       # let a slot start while earlier slots are still running
+SCHEDULE_SHUTDOWN_TIMEOUT_S = 60.0   # after Ctrl+C, how long cancelled jobs get to wind down
+SCHEDULE_LINK_FLUSH_S = 0.5          # batch window for writing published links back to the table
+SCHEDULE_LEDGER_PATH = "schedule_ledger.sqlite3"  # job state database ("" disables the ledger)
+SCHEDULE_WATCH = False               # keep running and pick up edits to the schedule table
+SCHEDULE_WATCH_INTERVAL_S = 2.0      # how often the table's mtime is checked in watch mode
+SCHEDULE_JOB_ESTIMATE_S = 150.0      # expected seconds per job, used to plan slot order
+DURATION_EWMA_ALPHA = 0.3            # weight of the newest sample in per-step duration averages
+DURATION_SAMPLES = 200               # samples kept per profile/step for percentiles
+SCHEDULE_ADAPTIVE_CONCURRENCY = False  # shrink the worker budget under memory/CPU load (needs psutil)
+SCHEDULE_CONCURRENCY_MIN = 1         # adaptive lower bound of live profile workers
+SCHEDULE_CONCURRENCY_MAX = 6         # adaptive upper bound of live profile workers; --limit, when given, caps it
+SCHEDULE_ADAPT_INTERVAL_S = 5.0      # seconds between resource samples
+SCHEDULE_MEM_FLOOR_PCT = 15.0        # shrink when available RAM drops below this share
+SCHEDULE_CPU_HIGH_PCT = 90.0         # shrink when smoothed CPU load is above this
+SCHEDULE_CPU_LOW_PCT = 60.0          # only grow while smoothed CPU load is below this
+SCHEDULE_WORKER_RSS_MB = 700         # assumed Chrome RSS per worker until one is measured
+SCHEDULE_RETRY_MAX_DELAY_S = 900.0   # cap for the exponential retry backoff of failed jobs
+CONTENT_CACHE_MB = 64                # budget of the cache for @file title/content references
+CONTENT_MMAP_MIN_KB = 256            # read referenced files at least this large through mmap
+SCHEDULE_SIM_DURATION = "model:0.25" # simulated job duration distribution (see schedule_sim.FakeRunner)
+SCHEDULE_SIM_SEED = 1                # random seed of simulated durations, so replays are comparable
+SCHEDULE_PROFILES_ROOT = r"D:\TOOL\social-poster\profiles"  # profile names in the table resolve under this
+SCHEDULE_SERVE = ""                  # "host:port" to hand jobs to remote agents instead of local workers
+SCHEDULE_COORDINATOR_URL = "http://127.0.0.1:8765"  # where worker agents pull jobs from
+SCHEDULE_LEASE_S = 120.0             # profile lease lifetime; agents renew it at a third of this
+SCHEDULE_AGENT_SLOTS = 2             # profile groups one agent runs at a time; a coordinator runs their sum
+SCHEDULE_AGENT_TOKEN = ""            # shared secret agents send; required to serve beyond 127.0.0.1
+SCHEDULE_RING_VNODES = 64            # points per agent on the profile hash ring
+SCHEDULE_SHARD_STEAL_S = 300.0       # a group waits this long for its own agent before another may take it
+SCHEDULE_NODE_TIMEOUT_S = 90.0       # an agent silent this long leaves the ring
+SCHEDULE_WATCHDOG = True             # kill browsers of workers stuck in one publish step (needs psutil)
+SCHEDULE_HEARTBEAT_S = 5.0           # how often a worker reports its job and step
+SCHEDULE_HEARTBEAT_SILENCE_S = 60.0  # a worker quiet this long counts as hung
+SCHEDULE_WATCHDOG_GRACE_S = 30.0     # after killing its browser, kill a still-stuck worker too
+SCHEDULE_STEP_BUDGET_S = {           # longest a job may stay in one step ("*" = any other)
+    "launch_browser": 180.0,
+    "open_editor": 120.0,
+    "fill_title": 90.0,
+    "paste_body": 180.0,
+    "wait_ready": 180.0,
+    "publish": 120.0,
+    "await_url": 180.0,
+    "*": 300.0,
+}
+SCHEDULE_START_METHOD = ""           # "" = platform default; "forkserver" forks workers from a preloaded server
+SCHEDULE_PRELOAD = ("schedule_reader", "social_poster")  # imported once by the forkserver
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import mmap
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Tuple
+
+from config import CONTENT_CACHE_MB, CONTENT_MMAP_MIN_KB
+
+REFERENCE_PREFIX = "@"
+# what the Medium editor can take as is; markdown would be pasted raw
+REFERENCE_SUFFIXES = (".html", ".htm", ".txt")
+
+
+def is_reference(value: str) -> bool:
+    """``@path/to/post.html`` style cell; a bare ``@mention`` is not a reference."""
+    value = (value or "").strip()
+    return (
+        value.startswith(REFERENCE_PREFIX)
+        and "\n" not in value
+        and value.lower().endswith(REFERENCE_SUFFIXES)
+    )
+
+
+def reference_path(value: str, base_dir: Path | None = None) -> Path:
+    """Resolve ``@path`` relative to the table it came from."""
+    path = Path(value.strip()[len(REFERENCE_PREFIX) :].strip()).expanduser()
+    if not path.is_absolute() and base_dir is not None:
+        path = base_dir / path
+    return path
+
+
+class ContentCache:
+    """Text and digests of referenced files, keyed by path, mtime and size.
+
+    An edited file gets a new key, so stale text is never served. Text is
+    kept in LRU order within ``max_bytes``; files of ``mmap_min_bytes`` or
+    more are decoded and hashed straight from an ``mmap``, so their bytes are
+    never copied into a buffer of their own.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CONTENT_CACHE_MB * 1024 * 1024,
+        mmap_min_bytes: int = CONTENT_MMAP_MIN_KB * 1024,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.mmap_min_bytes = mmap_min_bytes
+        self._texts: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._digests: dict[Tuple[str, int, int], str] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Path) -> Tuple[str, int, int]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"content file not found: {path}") from None
+        return str(path), stat.st_mtime_ns, stat.st_size
+
+    def _read_text(self, path: Path, size: int) -> str:
+        with path.open("rb") as fh:
+            if size < self.mmap_min_bytes or size == 0:
+                return codecs.decode(fh.read(), "utf-8-sig", "replace")
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view, memoryview(view) as buffer:
+                return codecs.decode(buffer, "utf-8-sig", "replace")
+
+    def text(self, path: Path) -> str:
+        key = self._key(path)
+        with self._lock:
+            cached = self._texts.get(key)
+            if cached is not None:
+                self._texts.move_to_end(key)
+                return cached
+        text = self._read_text(path, key[2])
+        if key[2] <= self.max_bytes:
+            with self._lock:
+                self._texts[key] = text
+                self._size += key[2]
+                while self._size > self.max_bytes and self._texts:
+                    old_key, _old = self._texts.popitem(last=False)
+                    self._size -= old_key[2]
+        return text
+
+    def digest(self, path: Path) -> str:
+        """sha256 of the file without keeping its text around."""
+        key = self._key(path)
+        with self._lock:
+            cached = self._digests.get(key)
+        if cached is not None:
+            return cached
+        hasher = hashlib.sha256()
+        with path.open("rb") as fh:
+            if key[2] >= self.mmap_min_bytes:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    hasher.update(view)
+            else:
+                for chunk in iter(lambda: fh.read(1 << 16), b""):
+                    hasher.update(chunk)
+        with self._lock:
+            self._digests[key] = hasher.hexdigest()
+        return self._digests[key]
+
+
+_cache = ContentCache()
+
+
+def load_cell(value: str, base_dir: Path | None = None) -> str:
+    """The cell's text, reading ``@file`` references through the process cache."""
+    if not is_reference(value):
+        return value
+    return _cache.text(reference_path(value, base_dir))
+
+
+def cell_digest(value: str, base_dir: Path | None = None) -> str:
+    """Content identity of a cell: the file's digest for references, else the text."""
+    if not is_reference(value):
+        return value
+    try:
+        return "sha256:" + _cache.digest(reference_path(value, base_dir))
+    except OSError:
+        return value
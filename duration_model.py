@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple
+
+from config import DURATION_EWMA_ALPHA, DURATION_SAMPLES, SCHEDULE_JOB_ESTIMATE_S
+
+# Phases reported by medium_publish_article_selenium, plus what the runner
+# and scheduler wrap around them.
+STEP_LAUNCH = "launch_browser"
+STEP_TOTAL = "job_total"
+PUBLISH_STEPS = ("open_editor", "fill_title", "paste_body", "wait_ready", "publish", "await_url")
+ALL_PROFILES = "*"
+
+
+class DurationModel:
+    """EWMA and percentiles of how long each publish step takes, per profile.
+
+    Samples also feed an all-profiles entry (``ALL_PROFILES``) that stands in
+    for profiles without history. With a ledger the samples are persisted
+    and the model is rebuilt from them on start.
+    """
+
+    def __init__(
+        self,
+        ledger=None,
+        alpha: float = DURATION_EWMA_ALPHA,
+        samples: int = DURATION_SAMPLES,
+    ) -> None:
+        self.ledger = ledger
+        self.alpha = alpha
+        self._ewma: Dict[Tuple[str, str], float] = {}
+        self._recent: Dict[Tuple[str, str], Deque[float]] = defaultdict(lambda: deque(maxlen=samples))
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        if ledger is not None:
+            for profile, step, seconds in ledger.recent_durations(samples):
+                self._add(profile, step, seconds)
+
+    def _add(self, profile: str, step: str, seconds: float) -> None:
+        for key in ((profile, step), (ALL_PROFILES, step)):
+            previous = self._ewma.get(key)
+            self._ewma[key] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+            self._recent[key].append(seconds)
+            self._counts[key] += 1
+
+    def record(self, profile: str, step: str, seconds: float) -> None:
+        seconds = max(0.0, float(seconds))
+        self._add(profile, step, seconds)
+        if self.ledger is not None:
+            self.ledger.record_duration(profile, step, seconds)
+
+    def ewma(self, profile: str, step: str) -> float | None:
+        return self._ewma.get((profile, step), self._ewma.get((ALL_PROFILES, step)))
+
+    def percentile(self, profile: str, step: str, pct: float) -> float | None:
+        recent = self._recent.get((profile, step)) or self._recent.get((ALL_PROFILES, step))
+        if not recent:
+            return None
+        ordered = sorted(recent)
+        idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def estimate(self, profile: str) -> float:
+        """Expected seconds for one whole job of ``profile``."""
+        value = self.ewma(profile, STEP_TOTAL)
+        return SCHEDULE_JOB_ESTIMATE_S if value is None else value
+
+    def estimate_job(self, job) -> float:
+        return self.estimate(job.profile_key)
+
+    def rows(self) -> List[Tuple[str, str, int, float, float, float]]:
+        """``(profile, step, samples, ewma, p50, p95)`` for every known key."""
+        order = {step: idx for idx, step in enumerate((STEP_LAUNCH,) + PUBLISH_STEPS + (STEP_TOTAL,))}
+        keys = sorted(self._ewma, key=lambda key: (key[0] != ALL_PROFILES, key[0], order.get(key[1], 99), key[1]))
+        return [
+            (
+                profile,
+                step,
+                self._counts[(profile, step)],
+                self._ewma[(profile, step)],
+                self.percentile(profile, step, 50) or 0.0,
+                self.percentile(profile, step, 95) or 0.0,
+            )
+            for profile, step in keys
+        ]
+
+    def format_table(self) -> str:
+        lines = [f"{'profile':<32} {'step':<16} {'n':>5} {'ewma':>8} {'p50':>8} {'p95':>8}"]
+        for profile, step, count, ewma, p50, p95 in self.rows():
+            name = Path(profile).name or profile
+            lines.append(f"{name:<32} {step:<16} {count:>5} {ewma:>7.1f}s {p50:>7.1f}s {p95:>7.1f}s")
+        return "\n".join(lines)
@@ -3,7 +3,6 @@
 GPM Login App Profile Management Module
 Handles finding, creating, and starting profiles via GPM Login API
 """
-import time
 import requests
 import json
 import logging
@@ -11,6 +10,7 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from openWeb import open_chrome_with_selenium
+import cancel_token
 
 try:
     from config import CHROME_USER_DATA_DIR, CHROME_PROFILE_DIR
@@ -217,6 +217,7 @@ def start_profile(profile_id: str, win_width: int = 1280, win_height: int = 720,
     )
 
     for attempt in range(retry_attempts):
+        cancel_token.check()
         try:
             logging.info(
                 f"Starting Chrome profile '{resolved_profile_name}' from '{resolved_user_data_dir}' "
@@ -237,7 +238,7 @@ def start_profile(profile_id: str, win_width: int = 1280, win_height: int = 720,
             return driver
         except Exception as e:
             logging.warning(f"Failed to start profile (attempt {attempt + 1}): {e}")
-            time.sleep(2)
+            cancel_token.sleep(2)
 
     logging.error(f"Failed to start profile after {retry_attempts} attempts")
     return None
@@ -255,6 +256,7 @@ def start_profile_api(profile_id: str, win_width: int = 1280, win_height: int =
     resolved_profile_name = profile_name or profile_id
 
     for attempt in range(retry_attempts):
+        cancel_token.check()
         try:
             logging.info(
                 f"Starting profile via API (attempt {attempt + 1}/{retry_attempts}) profile_id={profile_id}"
@@ -271,7 +273,7 @@ def start_profile_api(profile_id: str, win_width: int = 1280, win_height: int =
             success = payload.get("success") if isinstance(payload, dict) else False
             if not success or not isinstance(data, dict):
                 logging.warning(f"Start profile failed (attempt {attempt + 1}): {payload}")
-                time.sleep(2)
+                cancel_token.sleep(2)
                 continue
 
             remote_addr = data.get("remote_debugging_address") or data.get("remoteDebuggingAddress")
@@ -287,7 +289,7 @@ def start_profile_api(profile_id: str, win_width: int = 1280, win_height: int =
             )
             if not remote_addr or not driver_path:
                 logging.warning("Missing remote_debugging_address or driver_path from start API response")
-                time.sleep(2)
+                cancel_token.sleep(2)
                 continue
 
             chrome_options = Options()
@@ -326,7 +328,7 @@ def start_profile_api(profile_id: str, win_width: int = 1280, win_height: int =
             return driver
         except Exception as e:
             logging.warning(f"Failed to start profile (attempt {attempt + 1}): {e}")
-            time.sleep(2)
+            cancel_token.sleep(2)
 
     logging.error(f"Failed to start profile after {retry_attempts} attempts")
     return None
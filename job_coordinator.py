@@ -0,0 +1,632 @@
+from __future__ import annotations
+
+import hmac
+import inspect
+import ipaddress
+import itertools
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from config import (
+    SCHEDULE_AGENT_SLOTS,
+    SCHEDULE_AGENT_TOKEN,
+    SCHEDULE_COORDINATOR_URL,
+    SCHEDULE_LEASE_S,
+    SCHEDULE_NODE_TIMEOUT_S,
+    SCHEDULE_SHARD_STEAL_S,
+    SCHEDULE_WATCHDOG,
+)
+from cancel_token import CANCELLED_MESSAGE
+from content_refs import load_cell
+from job_ledger import EVENT_PUBLISHED, EVENT_STEP, JobJournal, JobLedger
+from profile_ring import HashRing, rebalance
+from resource_monitor import Watchdog
+from schedule_reader import ScheduleJob, run_worker
+from worker_context import mp_context
+
+LEASE_WAIT_MAX_S = 30.0  # longest a /lease long-poll is held open
+EVENT_FLUSH_S = 0.5      # how often an agent forwards its workers' events
+TOKEN_HEADER = "X-Agent-Token"
+
+
+def _log(message: str) -> None:
+    caller = inspect.currentframe().f_back  # type: ignore[assignment]
+    line = caller.f_lineno if caller else -1
+    pid = os.getpid()
+    formatted = f"[pid {pid:>6}] [line {line:04d}] {message}"
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    try:
+        sys.stdout.buffer.write((formatted + "\n").encode(encoding, errors="replace"))
+        sys.stdout.flush()
+    except Exception:
+        print(formatted)
+
+
+def _is_loopback(host: str) -> bool:
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False  # a host name may resolve to any interface
+
+
+def job_payload(job: ScheduleJob) -> Dict[str, Any]:
+    """JSON form of ``job`` for an agent that cannot see the coordinator's files.
+
+    ``@file`` cells are resolved here; the identity and key are sent along
+    because they hash the cells as written in the table and resolve the
+    table path on this host.
+    """
+    payload = {field.name: getattr(job, field.name) for field in fields(job)}
+    payload["table_path"] = str(job.table_path) if job.table_path is not None else None
+    for name in ("title", "content"):
+        try:
+            payload[name] = load_cell(payload[name], job.base_dir)
+        except OSError:
+            pass  # the agent fails the job with the same "content file not found"
+    payload["identity"] = job.identity
+    payload["key"] = job.key
+    return payload
+
+
+def job_from_payload(payload: Dict[str, Any]) -> ScheduleJob:
+    values = dict(payload)
+    identity = values.pop("identity")
+    key = values.pop("key")
+    table_path = values.pop("table_path")
+    job = ScheduleJob(**values, table_path=Path(table_path) if table_path else None)
+    job.identity = identity
+    job.key = key  # the ledger, results and events all use the coordinator's key
+    return job
+
+
+class _Grant:
+    def __init__(self, group_id: str, jobs: List[ScheduleJob]) -> None:
+        self.group_id = group_id
+        self.jobs = jobs
+        self.keys = {job.key for job in jobs}
+        self.future: Future = Future()
+        self.lease_id = ""
+        self.agent = ""
+        self.expires = 0.0
+        self.queued = time.monotonic()
+
+
+class AgentHub:
+    """Hands profile groups to remote worker agents instead of local processes.
+
+    Stands in for :class:`schedule_reader.WorkerPool`: ``submit`` queues a
+    group and returns a future that resolves once the agent holding the
+    group's profile lease releases it. Leases live in the ledger, so a
+    restarted coordinator does not hand out a profile an agent may still
+    have open. A lease that is not renewed in time fails the future and the
+    scheduler retries the group's unreported jobs. Agent events are fed
+    into ``channel`` exactly like a local worker's, so the ledger and the
+    table write-back stay with the coordinator.
+
+    Agents are nodes of a consistent-hash ring (:mod:`profile_ring`) and a
+    group is only leased to the node its profile hashes to, so profiles
+    keep their warm Chrome data; another node may take it after waiting
+    ``SCHEDULE_SHARD_STEAL_S``. Nodes join on their first request and leave
+    after ``SCHEDULE_NODE_TIMEOUT_S`` of silence.
+
+    Each agent advertises how many groups it runs at once; whenever the
+    sum over the live nodes changes it is passed to ``on_capacity``, which
+    the scheduler uses as its worker budget.
+    """
+
+    def __init__(self, address: str, channel: Any, ledger: JobLedger, lease_s: float = SCHEDULE_LEASE_S) -> None:
+        host, _, port = address.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        if not SCHEDULE_AGENT_TOKEN and not _is_loopback(self.address[0]):
+            # anyone who can reach the port could lease jobs and post results
+            raise ValueError(
+                f"refusing to serve agents on {self.address[0]} without SCHEDULE_AGENT_TOKEN; "
+                "set a token or bind to 127.0.0.1"
+            )
+        self.channel = channel
+        self.ledger = ledger
+        self.lease_s = max(5.0, lease_s)
+        self.journal = JobJournal(ledger.path)
+        self._queue: Deque[_Grant] = deque()
+        self._grants: Dict[str, _Grant] = {}
+        self._cond = threading.Condition()
+        self._server: ThreadingHTTPServer | None = None
+        self._threads: List[threading.Thread] = []
+        self._closing = threading.Event()
+        self.ring = HashRing()
+        self._seen: Dict[str, float] = {}
+        self._homes: Dict[str, str] = {}  # profile -> node that last ran it
+        self._slots: Dict[str, int] = {}  # node -> groups it runs at once
+        self.on_capacity: Callable[[int], Any] | None = None
+        self.cold_moves = 0
+        self.cancelled = False
+
+    @property
+    def capacity(self) -> int:
+        """Groups the live agents run at once."""
+        return sum(self._slots.values())
+
+    def _touch(self, agent: str, slots: int | None = None) -> None:
+        # caller holds self._cond
+        self._seen[agent] = time.monotonic()
+        if agent not in self.ring:
+            self._rebalance(join=agent)
+        if slots is not None and self._slots.get(agent) != slots:
+            self._slots[agent] = slots
+            self._capacity_changed()
+
+    def _capacity_changed(self) -> None:
+        _log(f"INFO:HUB_CAPACITY slots={self.capacity} nodes={len(self._slots)}")
+        if self.on_capacity is not None:
+            self.on_capacity(self.capacity)
+
+    def _rebalance(self, join: str | None = None, leave: str | None = None) -> None:
+        profiles = set(self._homes) | {grant.group_id for grant in self._queue}
+        result = rebalance(self.ring, profiles, self._homes, join=join, leave=leave)
+        _log(
+            f"INFO:SHARD_REBALANCE {'join=' + join if join else 'leave=' + str(leave)} "
+            f"nodes={len(self.ring)} profiles={len(profiles)} {result.summary()}"
+        )
+        self._cond.notify_all()
+
+    def start(self) -> "AgentHub":
+        self._server = ThreadingHTTPServer(self.address, _HubHandler)
+        self._server.daemon_threads = True
+        self._server.hub = self  # type: ignore[attr-defined]
+        for name, target in (("hub-http", self._server.serve_forever), ("hub-reaper", self._reap)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        _log(f"INFO:HUB_START address={self.address[0]}:{self.address[1]} lease={self.lease_s:.0f}s")
+        return self
+
+    def submit(self, group_id: str, jobs: List[ScheduleJob]) -> Future:
+        grant = _Grant(group_id, jobs)
+        with self._cond:
+            self._queue.append(grant)
+            self._cond.notify_all()
+        _log(f"INFO:HUB_QUEUE profile={group_id} jobs={len(jobs)} queued={len(self._queue)}")
+        return grant.future
+
+    def lease(self, agent: str, wait: float = 0.0, slots: int = 1) -> Dict[str, Any] | None:
+        """Lease the oldest queued group whose profile is free to ``agent``."""
+        deadline = time.monotonic() + min(max(0.0, wait), LEASE_WAIT_MAX_S)
+        with self._cond:
+            self._touch(agent, max(1, slots))
+            while not self._closing.is_set():
+                for grant in list(self._queue):
+                    owner = self.ring.owner(grant.group_id)
+                    if owner != agent and time.monotonic() - grant.queued < SCHEDULE_SHARD_STEAL_S:
+                        continue
+                    lease_id = f"{agent}/{uuid.uuid4().hex[:12]}"
+                    if not self.ledger.acquire_lease(grant.group_id, lease_id, self.lease_s):
+                        continue
+                    self._queue.remove(grant)
+                    grant.lease_id, grant.agent = lease_id, agent
+                    grant.expires = time.time() + self.lease_s
+                    self._grants[lease_id] = grant
+                    home = self._homes.get(grant.group_id)
+                    if home is not None and home != agent:
+                        self.cold_moves += 1
+                        _log(
+                            f"INFO:COLD_MOVE profile={grant.group_id} from={home} to={agent} "
+                            f"reason={'steal' if owner != agent else 'rebalance'} total={self.cold_moves}"
+                        )
+                    self._homes[grant.group_id] = agent
+                    _log(f"INFO:LEASE_GRANT profile={grant.group_id} agent={agent} lease={lease_id} jobs={len(grant.jobs)}")
+                    return {
+                        "lease": lease_id,
+                        "profile": grant.group_id,
+                        "ttl": self.lease_s,
+                        "jobs": [job_payload(job) for job in grant.jobs],
+                    }
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+        return None
+
+    def renew(self, lease_id: str) -> bool:
+        with self._cond:
+            grant = self._grants.get(lease_id)
+            if grant is None or not self.ledger.renew_lease(grant.group_id, lease_id, self.lease_s):
+                return False
+            self._touch(grant.agent)
+            grant.expires = time.time() + self.lease_s
+            return True
+
+    def deliver(self, lease_id: str, messages: List[List[Any]]) -> bool:
+        """Feed an agent's worker messages into the scheduler's channel."""
+        with self._cond:
+            grant = self._grants.get(lease_id)
+            if grant is not None:
+                self._touch(grant.agent)
+        if grant is None:
+            return False
+        for kind, *payload in messages:
+            if kind in ("result", "event", "stall") and payload[1 if kind == "event" else 0] not in grant.keys:
+                _log(f"WARN:HUB_FOREIGN_JOB lease={lease_id} kind={kind}")
+                continue
+            if kind == "timing":
+                payload[0] = grant.group_id  # the agent resolves profile paths under its own root
+            elif kind == "event":
+                payload[2] = grant.group_id
+                self._journal(payload[1], payload[4], payload[5])
+            self.channel.put((kind, *payload))
+        return True
+
+    def _journal(self, job_key: str, level: str, message: str) -> None:
+        # what a local worker journals itself, so reconcile_running works for agents too
+        if level == "timing":
+            self.journal.record(job_key, EVENT_STEP, message.partition(" ")[0])
+        elif level == "success" and "Medium URL:" in message:
+            self.journal.record(job_key, EVENT_PUBLISHED, message.split("Medium URL:", 1)[-1].strip())
+
+    def abandon(self, lease_id: str) -> None:
+        """Put back a group whose grant never reached the agent."""
+        with self._cond:
+            grant = self._grants.pop(lease_id, None)
+            if grant is None:
+                return
+            self.ledger.release_lease(grant.group_id, lease_id)
+            self._queue.appendleft(grant)
+            self._cond.notify_all()
+        _log(f"WARN:LEASE_UNDELIVERED profile={grant.group_id} agent={grant.agent}")
+
+    def release(self, lease_id: str, error: str = "") -> bool:
+        with self._cond:
+            grant = self._grants.pop(lease_id, None)
+        if grant is None:
+            return False
+        self.ledger.release_lease(grant.group_id, lease_id)
+        _log(f"INFO:LEASE_RELEASE profile={grant.group_id} agent={grant.agent} err={error or '-'}")
+        if error:
+            grant.future.set_exception(RuntimeError(f"agent {grant.agent}: {error}"))
+        else:
+            grant.future.set_result(None)
+        return True
+
+    def _reap(self) -> None:
+        while not self._closing.wait(min(5.0, self.lease_s / 4)):
+            now = time.time()
+            with self._cond:
+                expired = [grant for grant in self._grants.values() if grant.expires <= now]
+                for grant in expired:
+                    self._grants.pop(grant.lease_id, None)
+            for grant in expired:
+                _log(f"WARN:LEASE_EXPIRED profile={grant.group_id} agent={grant.agent} lease={grant.lease_id}")
+                grant.future.set_exception(RuntimeError(f"lease on {grant.group_id} expired on {grant.agent}"))
+            silent_since = time.monotonic() - SCHEDULE_NODE_TIMEOUT_S
+            with self._cond:
+                holding = {grant.agent for grant in self._grants.values()}
+                for agent, seen in list(self._seen.items()):
+                    if seen < silent_since and agent not in holding:
+                        del self._seen[agent]
+                        self._rebalance(leave=agent)
+                        if self._slots.pop(agent, None) is not None:
+                            self._capacity_changed()
+
+    def status(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = [grant.group_id for grant in self._queue]
+            grants = [
+                {"profile": grant.group_id, "agent": grant.agent, "lease": lease_id, "expires": grant.expires}
+                for lease_id, grant in self._grants.items()
+            ]
+            nodes = self.ring.nodes
+        return {
+            "queued": queued,
+            "leases": grants,
+            "nodes": nodes,
+            "capacity": self.capacity,
+            "cold_moves": self.cold_moves,
+            "jobs": self.ledger.counts(),
+        }
+
+    def cancel(self) -> None:
+        """Drop queued groups and have agents cancel the ones they run.
+
+        Agents see the flag in the reply to their next /events or /renew
+        and stop the job cooperatively, then release the lease as usual.
+        """
+        with self._cond:
+            self.cancelled = True
+            queued = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        for grant in queued:
+            grant.future.set_exception(RuntimeError(CANCELLED_MESSAGE))
+        _log(f"WARN:HUB_CANCEL queued={len(queued)} running={len(self._grants)}")
+
+    def shutdown(self, wait: bool = True, timeout: float | None = None) -> None:
+        if self._closing.is_set():
+            return
+        self._closing.set()
+        with self._cond:
+            self._cond.notify_all()
+            # leases stay in the ledger until they expire: an agent may still have the profile open
+            pending = list(self._queue) + list(self._grants.values())
+            self._queue.clear()
+            self._grants.clear()
+        for grant in pending:
+            if not grant.future.done():
+                grant.future.set_exception(RuntimeError("coordinator stopped"))
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout=5.0 if timeout is None else min(5.0, timeout))
+        self.journal.close()
+        _log("INFO:HUB_STOP")
+
+
+class _HubHandler(BaseHTTPRequestHandler):
+    server_version = "social-poster-hub"
+
+    def _reply(self, code: int, body: Any = None) -> bool:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        try:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except OSError:
+            return False  # the agent hung up (e.g. gave up on a long-poll)
+        return True
+
+    def _authorized(self) -> bool:
+        if SCHEDULE_AGENT_TOKEN and not hmac.compare_digest(
+            self.headers.get(TOKEN_HEADER, "").encode("utf-8"), SCHEDULE_AGENT_TOKEN.encode("utf-8")
+        ):
+            self._reply(403, {"error": "bad agent token"})
+            return False
+        return True
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if not self._authorized():
+            return
+        if self.path == "/status":
+            self._reply(200, self.server.hub.status())  # type: ignore[attr-defined]
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if not self._authorized():
+            return
+        hub: AgentHub = self.server.hub  # type: ignore[attr-defined]
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, OSError):
+            self._reply(400, {"error": "invalid json"})
+            return
+        lease_id = str(body.get("lease") or "")
+        if self.path == "/lease":
+            grant = hub.lease(
+                str(body.get("agent") or self.client_address[0]),
+                float(body.get("wait") or 0),
+                int(body.get("slots") or 1),
+            )
+            if grant is None:
+                self._reply(204)
+            elif not self._reply(200, grant):
+                hub.abandon(grant["lease"])
+            return
+        if self.path == "/renew":
+            ok = hub.renew(lease_id)
+        elif self.path == "/events":
+            ok = hub.deliver(lease_id, body.get("messages") or [])
+        elif self.path == "/release":
+            ok = hub.release(lease_id, str(body.get("error") or ""))
+        else:
+            self._reply(404, {"error": "not found"})
+            return
+        # 410: the lease ran out or was never granted; the agent must let go of the profile
+        if ok:
+            self._reply(200, {"ttl": hub.lease_s, "cancel": hub.cancelled})
+        else:
+            self._reply(410)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        pass
+
+
+def _agent_worker(
+    payloads: List[Dict[str, Any]], channel: Any, label: str, show_console: bool, cancel: Any = None
+) -> None:
+    # no local journal: the coordinator journals the events it receives
+    run_worker(label, [job_from_payload(payload) for payload in payloads], show_console, channel, cancel, journal=False)
+
+
+class WorkerAgent:
+    """Pulls profile groups from a coordinator and runs them in local worker processes.
+
+    Each of ``slots`` threads leases one group at a time, renews the lease
+    while the group runs and forwards the worker's events. If the lease
+    cannot be renewed before it runs out, the worker is stopped so two
+    hosts never drive the same profile.
+    """
+
+    def __init__(
+        self,
+        url: str = SCHEDULE_COORDINATOR_URL,
+        name: str | None = None,
+        slots: int = SCHEDULE_AGENT_SLOTS,
+        show_console: bool = False,
+    ) -> None:
+        self.url = url.rstrip("/")
+        # stable across restarts: the ring assigns profiles by node name
+        self.name = name or socket.gethostname()
+        self.slots = max(1, slots)
+        self.show_console = show_console
+        self._stop = threading.Event()
+        self._unreachable = itertools.count()
+        # hung browsers are only visible on this host; stalls go to the coordinator with the events
+        self.watchdog = Watchdog(self._on_stall) if SCHEDULE_WATCHDOG else None
+        self._channels: Dict[str, Any] = {}  # job key -> channel of the grant running it
+        self._cancels: Dict[str, Any] = {}  # lease -> event that cancels its worker
+
+    def _call(self, path: str, body: Dict[str, Any], timeout: float = 10.0) -> tuple[int, Any]:
+        headers = {"Content-Type": "application/json"}
+        if SCHEDULE_AGENT_TOKEN:
+            headers[TOKEN_HEADER] = SCHEDULE_AGENT_TOKEN
+        request = Request(self.url + path, data=json.dumps(body).encode("utf-8"), headers=headers, method="POST")
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                data = response.read()
+                return response.status, json.loads(data) if data else None
+        except HTTPError as exc:
+            return exc.code, None
+        except (URLError, OSError, ValueError) as exc:
+            if next(self._unreachable) % 30 == 0:
+                _log(f"WARN:COORDINATOR_UNREACHABLE url={self.url} err={exc}")
+            return 0, None
+
+    def run(self) -> None:
+        _log(f"INFO:AGENT_START name={self.name} url={self.url} slots={self.slots}")
+        mp_context(warm=True)
+        threads = [
+            threading.Thread(target=self._slot_loop, name=f"agent-slot-{slot}", daemon=True)
+            for slot in range(1, self.slots + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            self.stop()
+        for thread in threads:
+            thread.join()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        _log(f"INFO:AGENT_STOP name={self.name}")
+
+    def stop(self) -> None:
+        """Stop leasing and cancel the running groups; their leases are released normally."""
+        self._stop.set()
+        for cancel in list(self._cancels.values()):
+            cancel.set()
+
+    def _on_stall(self, job_key: str, step: str, age: float) -> None:
+        channel = self._channels.get(job_key)
+        if channel is not None:
+            channel.put(("stall", job_key, step, age))
+
+    def _slot_loop(self) -> None:
+        while not self._stop.is_set():
+            code, grant = self._call(
+                "/lease", {"agent": self.name, "slots": self.slots, "wait": LEASE_WAIT_MAX_S}, LEASE_WAIT_MAX_S + 10
+            )
+            if code == 200 and grant:
+                self._run_grant(grant)
+            elif code != 204:
+                self._stop.wait(2.0)
+
+    def _run_grant(self, grant: Dict[str, Any]) -> None:
+        ctx = mp_context()
+        lease_id, ttl = grant["lease"], float(grant["ttl"])
+        label = Path(grant["profile"]).name or "default"
+        channel: Any = ctx.Queue()
+        cancel = self._cancels[lease_id] = ctx.Event()
+        if self._stop.is_set():
+            cancel.set()
+        proc = ctx.Process(
+            target=_agent_worker, args=(grant["jobs"], channel, label, self.show_console, cancel), daemon=True
+        )
+        proc.start()
+        _log(f"INFO:AGENT_RUN profile={label} lease={lease_id} pid={proc.pid} jobs={len(grant['jobs'])}")
+        renewed = time.monotonic()
+        next_renew = renewed + ttl / 3
+        lost = False
+        try:
+            while True:
+                drained = self._drain(channel, EVENT_FLUSH_S)
+                messages = self._beats(drained, channel)
+                if drained:
+                    # heartbeats alone still post, so a coordinator cancel arrives within one beat
+                    code, reply = self._call("/events", {"lease": lease_id, "messages": messages})
+                    lost = code == 410
+                    if reply and reply.get("cancel"):
+                        cancel.set()
+                now = time.monotonic()
+                if not lost and now >= next_renew:
+                    code, reply = self._call("/renew", {"lease": lease_id})
+                    if code == 200:
+                        # counted from before the request, so we give up no later than the coordinator
+                        renewed, next_renew = now, now + ttl / 3
+                        if reply and reply.get("cancel"):
+                            cancel.set()
+                    else:
+                        next_renew = now + 2.0
+                    lost = code == 410 or now - renewed >= ttl * 0.9
+                if lost:
+                    # someone else may get the profile now: stop driving it
+                    _log(f"WARN:LEASE_LOST profile={label} lease={lease_id} pid={proc.pid}")
+                    cancel.set()
+                    proc.join(timeout=1.0)  # lets the Runner close its browser
+                    if proc.is_alive():
+                        proc.terminate()
+                    proc.join()
+                    return
+                if not proc.is_alive():
+                    break
+            proc.join()
+            messages = self._beats(self._drain(channel, 0), channel)
+        finally:
+            self._forget(channel)
+            self._cancels.pop(lease_id, None)
+        if messages:
+            self._call("/events", {"lease": lease_id, "messages": messages})
+        error = f"agent worker exited with {proc.exitcode}" if proc.exitcode else ""
+        self._call("/release", {"lease": lease_id, "error": error})
+        _log(f"INFO:AGENT_DONE profile={label} lease={lease_id} exitcode={proc.exitcode}")
+
+    def _beats(self, messages: List[List[Any]], channel: Any) -> List[List[Any]]:
+        # heartbeats feed the local watchdog; the coordinator never sees them
+        forward = []
+        for message in messages:
+            if message[0] != "heartbeat":
+                forward.append(message)
+                continue
+            if message[2]:
+                self._channels[message[2]] = channel
+            if self.watchdog is not None:
+                self.watchdog.beat(*message[1:])
+        return forward
+
+    def _forget(self, channel: Any) -> None:
+        for key in [key for key, owner in list(self._channels.items()) if owner is channel]:
+            self._channels.pop(key, None)
+
+    @staticmethod
+    def _drain(channel: Any, wait: float) -> List[List[Any]]:
+        messages: List[List[Any]] = []
+        try:
+            messages.append(list(channel.get(timeout=wait) if wait else channel.get_nowait()))
+            while True:
+                messages.append(list(channel.get_nowait()))
+        except queue.Empty:
+            pass
+        return messages
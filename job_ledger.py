@@ -0,0 +1,631 @@
+from __future__ import annotations
+
+import inspect
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Sequence
+
+from config import (
+    MEDIUM_PUBLISH_QUOTA,
+    MEDIUM_PUBLISH_WINDOW_S,
+    MEDIUM_QUOTA_RECHECK_S,
+    MEDIUM_SELENIUM_RETRIES,
+    SCHEDULE_LEDGER_PATH,
+)
+from duration_model import PUBLISH_STEPS
+from retry_policy import FAILURE_QUOTA, FAILURE_RETRYABLE, classify_failure
+
+# Once one of these steps has finished, the publish button may have been clicked.
+_PUBLISH_RISK_STEPS = frozenset(PUBLISH_STEPS[PUBLISH_STEPS.index("wait_ready") :])
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+# Crashed mid-publish: the story may be live. Never rerun automatically.
+STATUS_UNCONFIRMED = "unconfirmed"
+# Same content as another job of the profile; takes that job's URL once it has one.
+STATUS_DUPLICATE = "duplicate"
+
+VERDICT_OWN = "own"
+VERDICT_PUBLISHED = "published"
+VERDICT_IN_FLIGHT = "in_flight"
+
+EVENT_DISPATCH = "dispatch"
+EVENT_START = "start"
+EVENT_STEP = "step"
+EVENT_PUBLISHED = "published"
+EVENT_FINISH = "finish"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key    TEXT PRIMARY KEY,
+    table_path TEXT NOT NULL,
+    row_index  INTEGER NOT NULL,
+    platform   TEXT NOT NULL DEFAULT '',
+    profile    TEXT NOT NULL DEFAULT '',
+    title      TEXT NOT NULL DEFAULT '',
+    target_ts  REAL,
+    status     TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    url        TEXT NOT NULL DEFAULT '',
+    error      TEXT NOT NULL DEFAULT '',
+    failure    TEXT NOT NULL DEFAULT '',
+    fingerprint TEXT NOT NULL DEFAULT '',
+    written    INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_due ON jobs(status, target_ts);
+CREATE INDEX IF NOT EXISTS idx_jobs_profile ON jobs(profile, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_writeback ON jobs(written, status);
+CREATE TABLE IF NOT EXISTS publishes (
+    profile    TEXT NOT NULL,
+    platform   TEXT NOT NULL DEFAULT '',
+    ts         REAL NOT NULL,
+    kind       TEXT NOT NULL DEFAULT 'publish',
+    job_key    TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_publishes_profile ON publishes(profile, platform, ts);
+CREATE TABLE IF NOT EXISTS step_durations (
+    profile    TEXT NOT NULL,
+    step       TEXT NOT NULL,
+    seconds    REAL NOT NULL,
+    ts         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_step_durations ON step_durations(profile, step, ts);
+CREATE TABLE IF NOT EXISTS journal (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key    TEXT NOT NULL,
+    event      TEXT NOT NULL,
+    detail     TEXT NOT NULL DEFAULT '',
+    pid        INTEGER NOT NULL DEFAULT 0,
+    ts         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_journal_job ON journal(job_key, seq);
+CREATE TABLE IF NOT EXISTS leases (
+    profile    TEXT PRIMARY KEY,
+    holder     TEXT NOT NULL,
+    expires    REAL NOT NULL
+);
+"""
+
+KIND_PUBLISH = "publish"
+KIND_BLOCKED = "blocked"
+
+
+def _log(message: str) -> None:
+    caller = inspect.currentframe().f_back  # type: ignore[assignment]
+    line = caller.f_lineno if caller else -1
+    pid = os.getpid()
+    formatted = f"[pid {pid:>6}] [line {line:04d}] {message}"
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    try:
+        sys.stdout.buffer.write((formatted + "\n").encode(encoding, errors="replace"))
+        sys.stdout.flush()
+    except Exception:
+        print(formatted)
+
+
+class LedgerRow(NamedTuple):
+    job_key: str
+    table_path: str
+    row_index: int
+    platform: str
+    profile: str
+    title: str
+    target_ts: float | None
+    link: str = ""
+    fingerprint: str = ""
+
+
+class JobLedger:
+    """SQLite record of every scheduled job and its outcome.
+
+    The ledger, not the spreadsheet's ``link`` column, decides whether a job
+    still has to run. Rows move ``pending -> running -> done|failed``; links of
+    finished jobs are flagged ``written`` once the table write-back succeeds,
+    so a crash between publishing and writing the link is repaired on the
+    next start instead of publishing again. ``clock`` stamps every change;
+    the simulator runs an in-memory ledger on its virtual clock.
+    """
+
+    def __init__(self, path: Path | str = SCHEDULE_LEDGER_PATH, clock: Callable[[], float] = time.time) -> None:
+        self.path = Path(path).expanduser()
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "failure" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN failure TEXT NOT NULL DEFAULT ''")
+        if "fingerprint" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN fingerprint TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs(fingerprint, status)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, sql: str, params: Sequence | Iterable[Sequence] = (), many: bool = False) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.executemany(sql, params) if many else self._conn.execute(sql, params)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return cursor.rowcount
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def import_rows(
+        self, rows: Iterable[LedgerRow], retry_failed: bool = True, retries: int = MEDIUM_SELENIUM_RETRIES
+    ) -> int:
+        """Upsert schedule rows.
+
+        Pending jobs take the table's current values, except that a retry
+        backoff is never moved earlier; done and running jobs only follow
+        their row if it moved. With ``retry_failed`` failed jobs whose failure
+        is retryable and that have not used up ``retries`` become pending
+        again; permanent failures (a publish without URL among them) stay
+        failed. A row that has a link in the table is done, whatever the
+        ledger thought of it.
+        """
+        now = self.clock()
+        payload = [
+            (
+                row.job_key,
+                row.table_path,
+                row.row_index,
+                row.platform,
+                row.profile,
+                row.title,
+                row.target_ts,
+                STATUS_DONE if row.link else STATUS_PENDING,
+                row.link,
+                1 if row.link else 0,
+                row.fingerprint,
+                now,
+            )
+            for row in rows
+        ]
+        self._write(
+            """
+            INSERT INTO jobs (job_key, table_path, row_index, platform, profile, title,
+                              target_ts, status, url, written, fingerprint, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_key) DO UPDATE SET
+                fingerprint = excluded.fingerprint,
+                table_path = excluded.table_path,
+                row_index = excluded.row_index,
+                platform = excluded.platform,
+                profile = excluded.profile,
+                title = excluded.title,
+                url = CASE WHEN jobs.url = '' THEN excluded.url ELSE jobs.url END,
+                written = CASE WHEN excluded.url != '' AND jobs.status IN ('pending', 'failed', 'duplicate', 'unconfirmed')
+                               THEN 1 ELSE jobs.written END,
+                target_ts = CASE
+                    WHEN jobs.status = 'pending' AND jobs.failure != '' AND jobs.target_ts IS NOT NULL
+                        THEN MAX(jobs.target_ts, COALESCE(excluded.target_ts, jobs.target_ts))
+                    WHEN jobs.status IN ('pending', 'failed') THEN excluded.target_ts
+                    ELSE jobs.target_ts END,
+                status = CASE
+                    WHEN excluded.url != '' AND jobs.status IN ('pending', 'failed', 'duplicate', 'unconfirmed')
+                        THEN 'done'
+                    WHEN jobs.status = 'failed' AND ? AND jobs.failure = ? AND jobs.attempts <= ?
+                        THEN 'pending'
+                    ELSE jobs.status END,
+                updated_at = excluded.updated_at
+            """,
+            [item + (retry_failed, FAILURE_RETRYABLE, retries) for item in payload],
+            many=True,
+        )
+        _log(f"INFO:LEDGER_IMPORT rows={len(payload)} db='{self.path}'")
+        return len(payload)
+
+    def reconcile_running(self) -> dict[str, int]:
+        """Settle jobs a dead scheduler left ``running`` by replaying their journal.
+
+        Events after the job's last dispatch decide its fate: a journaled URL
+        or finish is applied as if the result had arrived; a job that never
+        started, or stopped before the publish step, is pending again; one
+        that got as far as publishing without a URL is ``unconfirmed``. The
+        journal is emptied afterwards since nothing is in flight.
+        """
+        outcome = {"resumed": 0, "recovered": 0, "failed": 0, "unconfirmed": 0}
+        for (job_key,) in self._query("SELECT job_key FROM jobs WHERE status = ?", (STATUS_RUNNING,)):
+            events = self._attempt_events(job_key)
+            url = next((detail for event, detail in events if event == EVENT_PUBLISHED and detail), "")
+            finish = next((detail for event, detail in reversed(events) if event == EVENT_FINISH), None)
+            steps = {detail for event, detail in events if event == EVENT_STEP}
+            if url:
+                self.record_result(job_key, STATUS_DONE, url)
+                outcome["recovered"] += 1
+            elif finish is not None:
+                error = finish or "failed before restart"
+                self.record_failure(job_key, classify_failure(error), error)
+                outcome["failed"] += 1
+            elif steps & _PUBLISH_RISK_STEPS:
+                self.record_result(job_key, STATUS_UNCONFIRMED, "", "interrupted while publishing")
+                outcome["unconfirmed"] += 1
+                _log(f"WARN:LEDGER_UNCONFIRMED job={job_key} last_steps={sorted(steps)}")
+            else:
+                self.record_result(job_key, STATUS_PENDING)
+                outcome["resumed"] += 1
+        self._write("DELETE FROM journal")
+        # duplicates are re-checked against their content twin at admission
+        outcome["duplicates"] = self._write(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+            (STATUS_PENDING, self.clock(), STATUS_DUPLICATE),
+        )
+        if any(outcome.values()):
+            _log(f"WARN:LEDGER_RECONCILE {outcome}")
+        return outcome
+
+    def _attempt_events(self, job_key: str) -> List[tuple[str, str]]:
+        # journal entries of the job's latest dispatch
+        return self._query(
+            "SELECT event, detail FROM journal WHERE job_key = ? AND seq > "
+            "COALESCE((SELECT MAX(seq) FROM journal WHERE job_key = ? AND event = ?), 0) ORDER BY seq",
+            (job_key, job_key, EVENT_DISPATCH),
+        )
+
+    def started(self, job_keys: Sequence[str]) -> set:
+        """Keys of ``job_keys`` whose current attempt journaled anything after its dispatch."""
+        return {key for key in job_keys if self._attempt_events(key)}
+
+    def reached_publish(self, job_key: str, step: str = "") -> bool:
+        """True when the current attempt of ``job_key`` may already have clicked publish.
+
+        ``step`` is the step the worker was in when it was stopped, if known.
+        """
+        if step in _PUBLISH_RISK_STEPS:
+            return True
+        events = self._attempt_events(job_key)
+        return any(event == EVENT_STEP and detail in _PUBLISH_RISK_STEPS for event, detail in events)
+
+    def requeue_unconfirmed(self) -> int:
+        """Release ``unconfirmed`` jobs for another run once someone checked the site."""
+        return self._write(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+            (STATUS_PENDING, self.clock(), STATUS_UNCONFIRMED),
+        )
+
+    def targets(self, job_keys: Sequence[str]) -> dict[str, float | None]:
+        """Target time the ledger holds for each of ``job_keys``, retry backoffs and quota deferrals included."""
+        result: dict[str, float | None] = {}
+        for start in range(0, len(job_keys), 500):
+            chunk = list(job_keys[start : start + 500])
+            marks = ",".join("?" * len(chunk))
+            for key, target_ts in self._query(
+                f"SELECT job_key, target_ts FROM jobs WHERE job_key IN ({marks})", chunk
+            ):
+                result[key] = target_ts
+        return result
+
+    def statuses(self, job_keys: Sequence[str]) -> dict[str, str]:
+        result: dict[str, str] = {}
+        for start in range(0, len(job_keys), 500):
+            chunk = list(job_keys[start : start + 500])
+            marks = ",".join("?" * len(chunk))
+            for key, status in self._query(f"SELECT job_key, status FROM jobs WHERE job_key IN ({marks})", chunk):
+                result[key] = status
+        return result
+
+    def claim(self, job_keys: Sequence[str]) -> List[str]:
+        """Atomically move still-pending jobs to ``running`` and return them."""
+        claimed: List[str] = []
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in job_keys:
+                    cursor = self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? "
+                        "WHERE job_key = ? AND status = ?",
+                        (STATUS_RUNNING, now, key, STATUS_PENDING),
+                    )
+                    if cursor.rowcount:
+                        claimed.append(key)
+                        self._conn.execute(
+                            "INSERT INTO journal (job_key, event, pid, ts) VALUES (?, ?, ?, ?)",
+                            (key, EVENT_DISPATCH, os.getpid(), now),
+                        )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return claimed
+
+    def record_result(self, job_key: str, status: str, url: str = "", error: str = "") -> None:
+        now = self.clock()
+        self._write(
+            "UPDATE jobs SET status = ?, url = CASE WHEN ? != '' THEN ? ELSE url END, error = ?, "
+            "failure = CASE WHEN ? = ? THEN '' ELSE failure END, updated_at = ? WHERE job_key = ?",
+            (status, url, url, error, status, STATUS_DONE, now, job_key),
+        )
+        if status == STATUS_DONE and url:
+            self._record_publish(job_key, KIND_PUBLISH, now)
+
+    def record_cancelled(self, job_key: str) -> None:
+        """Put a cancelled ``running`` job back to ``pending``; the cancelled run is not an attempt."""
+        self._write(
+            "UPDATE jobs SET status = ?, attempts = MAX(0, attempts - 1), updated_at = ? "
+            "WHERE job_key = ? AND status = ?",
+            (STATUS_PENDING, self.clock(), job_key, STATUS_RUNNING),
+        )
+
+    def record_failure(
+        self, job_key: str, failure: str, error: str, retry_at: float | None = None
+    ) -> None:
+        """Mark a job failed, or back to ``pending`` at ``retry_at`` when it will be retried."""
+        self._write(
+            "UPDATE jobs SET status = ?, failure = ?, error = ?, target_ts = COALESCE(?, target_ts), "
+            "updated_at = ? WHERE job_key = ? AND status != ?",
+            (
+                STATUS_PENDING if retry_at is not None else STATUS_FAILED,
+                failure,
+                error,
+                retry_at,
+                self.clock(),
+                job_key,
+                STATUS_DONE,
+            ),
+        )
+
+    def attempts(self, job_key: str) -> int:
+        rows = self._query("SELECT attempts FROM jobs WHERE job_key = ?", (job_key,))
+        return rows[0][0] if rows else 0
+
+    def check_fingerprint(self, job_key: str, fingerprint: str) -> tuple[str, str, str]:
+        """Look for another job with the same content: ``(verdict, other_key, url)``.
+
+        ``VERDICT_PUBLISHED``: it is live, reuse its URL. ``VERDICT_IN_FLIGHT``:
+        it is running or was interrupted mid-publish. ``VERDICT_OWN``: nothing
+        published or running, ``job_key`` may go ahead.
+        """
+        if not fingerprint:
+            return VERDICT_OWN, "", ""
+        rows = self._query(
+            "SELECT job_key, status, url FROM jobs WHERE fingerprint = ? AND job_key != ? "
+            "AND status IN (?, ?, ?) ORDER BY status = ? DESC, updated_at LIMIT 1",
+            (fingerprint, job_key, STATUS_DONE, STATUS_RUNNING, STATUS_UNCONFIRMED, STATUS_DONE),
+        )
+        if not rows:
+            return VERDICT_OWN, "", ""
+        other, status, url = rows[0]
+        if status == STATUS_DONE and url:
+            return VERDICT_PUBLISHED, other, url
+        return VERDICT_IN_FLIGHT, other, ""
+
+    def mark_duplicate(self, job_key: str, other_key: str, url: str = "") -> None:
+        """Settle ``job_key`` as a copy of ``other_key``: done with its URL, or waiting for one."""
+        if url:
+            self._write(
+                "UPDATE jobs SET status = ?, url = ?, error = ?, written = 0, updated_at = ? WHERE job_key = ?",
+                (STATUS_DONE, url, f"duplicate of {other_key}", self.clock(), job_key),
+            )
+        else:
+            self._write(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_key = ?",
+                (STATUS_DUPLICATE, f"duplicate of {other_key}", self.clock(), job_key),
+            )
+
+    def settle_duplicates(self, job_key: str) -> List[tuple[str, str, int, str]]:
+        """After ``job_key`` finished, hand its URL to its waiting duplicates.
+
+        Without a URL the duplicates go back to ``pending`` so one of them can
+        publish instead. Returns ``(job_key, table_path, row_index, url)``.
+        """
+        rows = self._query("SELECT fingerprint, status, url FROM jobs WHERE job_key = ?", (job_key,))
+        if not rows or not rows[0][0]:
+            return []
+        fingerprint, status, url = rows[0]
+        waiting = self._query(
+            "SELECT job_key, table_path, row_index FROM jobs WHERE fingerprint = ? AND status = ?",
+            (fingerprint, STATUS_DUPLICATE),
+        )
+        if not waiting:
+            return []
+        linked = status == STATUS_DONE and bool(url)
+        now = self.clock()
+        self._write(
+            "UPDATE jobs SET status = ?, url = ?, written = 0, updated_at = ? WHERE job_key = ? AND status = ?",
+            [
+                (STATUS_DONE if linked else STATUS_PENDING, url if linked else "", now, key, STATUS_DUPLICATE)
+                for key, _table, _row in waiting
+            ],
+            many=True,
+        )
+        return [(key, table, row, url if linked else "") for key, table, row in waiting]
+
+    def _record_publish(self, job_key: str, kind: str, ts: float) -> None:
+        self._write(
+            "INSERT INTO publishes (profile, platform, ts, kind, job_key) "
+            "SELECT profile, LOWER(platform), ?, ?, job_key FROM jobs WHERE job_key = ?",
+            (ts, kind, job_key),
+        )
+
+    def record_quota_block(self, job_key: str, ts: float | None = None) -> None:
+        """Remember that the site refused a publish of ``job_key``'s profile for quota reasons."""
+        self._record_publish(job_key, KIND_BLOCKED, self.clock() if ts is None else ts)
+
+    def quota_state(
+        self,
+        profile: str,
+        platform: str = "medium",
+        limit: int = MEDIUM_PUBLISH_QUOTA,
+        window_s: float = MEDIUM_PUBLISH_WINDOW_S,
+        now_ts: float | None = None,
+        recheck_s: float = MEDIUM_QUOTA_RECHECK_S,
+    ) -> tuple[int, float | None]:
+        """Slots of ``profile`` used in the rolling window and when the next one frees up.
+
+        Running jobs count as used. A quota block reported by the site that is
+        newer than our last publish fills the window even if we saw fewer
+        publishes (posts made outside this tool count too). ``next_free`` is
+        ``None`` while the profile is below ``limit``. It only follows real
+        publish times: when running jobs fill the window, whether they use
+        their slot is not known yet, so the answer is to look again in
+        ``recheck_s``.
+        """
+        now_ts = self.clock() if now_ts is None else now_ts
+        since = now_ts - window_s
+        publishes = [
+            ts
+            for (ts,) in self._query(
+                "SELECT ts FROM publishes WHERE profile = ? AND platform = ? AND kind = ? AND ts > ? ORDER BY ts",
+                (profile, platform, KIND_PUBLISH, since),
+            )
+        ]
+        ((running,),) = self._query(
+            "SELECT COUNT(*) FROM jobs WHERE profile = ? AND LOWER(platform) = ? AND status = ?",
+            (profile, platform, STATUS_RUNNING),
+        )
+        ((blocked,),) = self._query(
+            "SELECT MAX(ts) FROM publishes WHERE profile = ? AND platform = ? AND kind = ? AND ts > ?",
+            (profile, platform, KIND_BLOCKED, since),
+        )
+        used = len(publishes) + running
+        if used < limit and not (blocked and (not publishes or blocked > publishes[-1])):
+            return used, None
+        candidates = []
+        if used >= limit:
+            excess = used - limit
+            candidates.append(publishes[excess] + window_s if excess < len(publishes) else now_ts + recheck_s)
+        if blocked and (not publishes or blocked > publishes[-1]):
+            candidates.append(blocked + window_s)
+        # the slot is free once every reason for the block has passed
+        return max(used, limit), max(candidates)
+
+    def defer(self, job_keys: Sequence[str], target_ts: float) -> int:
+        """Hold jobs ``pending`` until ``target_ts`` for quota reasons.
+
+        Marked like a retry backoff, so re-importing the table does not move
+        them back to the table's time.
+        """
+        now = self.clock()
+        return self._write(
+            "UPDATE jobs SET status = ?, failure = ?, target_ts = ?, updated_at = ? "
+            "WHERE job_key = ? AND status IN (?, ?)",
+            [(STATUS_PENDING, FAILURE_QUOTA, target_ts, now, key, STATUS_PENDING, STATUS_FAILED) for key in job_keys],
+            many=True,
+        )
+
+    def fail_running(self, job_keys: Sequence[str], error: str) -> int:
+        now = self.clock()
+        return self._write(
+            "UPDATE jobs SET status = ?, failure = ?, error = ?, updated_at = ? WHERE job_key = ? AND status = ?",
+            [(STATUS_FAILED, classify_failure(error), error, now, key, STATUS_RUNNING) for key in job_keys],
+            many=True,
+        )
+
+    def acquire_lease(self, profile: str, holder: str, ttl_s: float) -> bool:
+        """Give ``holder`` the profile for ``ttl_s`` unless someone else holds a live lease."""
+        now = self.clock()
+        return bool(
+            self._write(
+                "INSERT INTO leases (profile, holder, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(profile) DO UPDATE SET holder = excluded.holder, expires = excluded.expires "
+                "WHERE leases.expires <= ? OR leases.holder = excluded.holder",
+                (profile, holder, now + ttl_s, now),
+            )
+        )
+
+    def renew_lease(self, profile: str, holder: str, ttl_s: float) -> bool:
+        """Extend a still-live lease; an expired one may already belong to someone else."""
+        now = self.clock()
+        return bool(
+            self._write(
+                "UPDATE leases SET expires = ? WHERE profile = ? AND holder = ? AND expires > ?",
+                (now + ttl_s, profile, holder, now),
+            )
+        )
+
+    def release_lease(self, profile: str, holder: str) -> bool:
+        return bool(self._write("DELETE FROM leases WHERE profile = ? AND holder = ?", (profile, holder)))
+
+    def leases(self) -> List[tuple[str, str, float]]:
+        """``(profile, holder, expires)`` of every lease, expired ones included."""
+        return self._query("SELECT profile, holder, expires FROM leases ORDER BY expires")
+
+    def pending_writeback(self) -> List[tuple[str, int, str]]:
+        return [
+            (table, row, url)
+            for table, row, url in self._query(
+                "SELECT table_path, row_index, url FROM jobs WHERE written = 0 AND status = ? AND url != ''",
+                (STATUS_DONE,),
+            )
+        ]
+
+    def mark_written(self, table_path: str, row_indexes: Iterable[int]) -> int:
+        now = self.clock()
+        return self._write(
+            "UPDATE jobs SET written = 1, updated_at = ? WHERE table_path = ? AND row_index = ?",
+            [(now, table_path, row) for row in row_indexes],
+            many=True,
+        )
+
+    def record_duration(self, profile: str, step: str, seconds: float) -> None:
+        self._write(
+            "INSERT INTO step_durations (profile, step, seconds, ts) VALUES (?, ?, ?, ?)",
+            (profile, step, seconds, self.clock()),
+        )
+
+    def recent_durations(self, per_key: int = 200) -> List[tuple[str, str, float]]:
+        """Last ``per_key`` samples of every (profile, step), oldest first."""
+        return self._query(
+            """
+            SELECT profile, step, seconds FROM (
+                SELECT profile, step, seconds, ts,
+                       ROW_NUMBER() OVER (PARTITION BY profile, step ORDER BY ts DESC) AS rn
+                FROM step_durations
+            ) WHERE rn <= ? ORDER BY ts
+            """,
+            (per_key,),
+        )
+
+    def counts(self) -> dict[str, int]:
+        return dict(self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+
+class JobJournal:
+    """Append-only event log a worker process writes while it runs a job.
+
+    Each event is committed before the worker moves on, so a scheduler that
+    dies mid-run can tell from the ledger database how far its jobs got.
+    """
+
+    def __init__(self, path: Path | str = SCHEDULE_LEDGER_PATH) -> None:
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def record(self, job_key: str, event: str, detail: str = "") -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO journal (job_key, event, detail, pid, ts) VALUES (?, ?, ?, ?, ?)",
+                    (job_key, event, detail, os.getpid(), time.time()),
+                )
+        except sqlite3.Error as exc:
+            _log(f"WARN:JOURNAL_WRITE_FAILED job={job_key} event={event} err={exc}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -11,7 +11,7 @@ import time
 from html.parser import HTMLParser
 from html import entities as html_entities
 from pathlib import Path
-from typing import Iterable, Any, Optional
+from typing import Iterable, Any, Callable, Optional
 import xml.etree.ElementTree as ET
 from urllib.parse import urlsplit, urlunsplit
 
@@ -22,6 +22,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, WebDriverException
 
+import cancel_token
+from cancel_token import CancelToken
+
 try:
     import undetected_chromedriver as uc  # type: ignore
 except Exception:  # pragma: no cover
@@ -126,13 +129,31 @@ def start_profile(
     return driver
 
 
+class _CancellableWait(WebDriverWait):
+    """WebDriverWait that also gives up between polls once the job is cancelled."""
+
+    def until(self, method, message: str = ""):
+        def _poll(drv):
+            cancel_token.check()
+            return method(drv)
+
+        return super().until(_poll, message)
+
+    def until_not(self, method, message: str = ""):
+        def _poll(drv):
+            cancel_token.check()
+            return method(drv)
+
+        return super().until_not(_poll, message)
+
+
 def wait_vis(driver: webdriver.Chrome, by: By, sel: str, t: int = WAIT_MED):
-    return WebDriverWait(driver, t).until(EC.visibility_of_element_located((by, sel)))
+    return _CancellableWait(driver, t).until(EC.visibility_of_element_located((by, sel)))
 
 
 def get_fresh(driver: webdriver.Chrome, css: str, t: int = WAIT_MED):
     """Wait for presence/visibility then always refetch element fresh from DOM."""
-    WebDriverWait(driver, t).until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
+    _CancellableWait(driver, t).until(EC.presence_of_element_located((By.CSS_SELECTOR, css)))
     try:
         return driver.find_element(By.CSS_SELECTOR, css)
     except Exception:
@@ -142,7 +163,7 @@ def get_fresh(driver: webdriver.Chrome, css: str, t: int = WAIT_MED):
 
 
 def _sleep(min_s: float, max_s: float):
-    time.sleep(random.uniform(min_s, max_s))
+    cancel_token.sleep(random.uniform(min_s, max_s))
 
 
 def perform_smooth_scroll(driver: webdriver.Chrome, px: int = 350, steps: int = 2):
@@ -241,10 +262,10 @@ def open_medium_editor(driver: webdriver.Chrome):
         target_url = "https://medium.com/new-story"
         _load_medium_page(driver, target_url)
     
-    WebDriverWait(driver, WAIT_MED).until(
+    _CancellableWait(driver, WAIT_MED).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, ".postArticle-content"))
     )
-    WebDriverWait(driver, WAIT_MED).until(
+    _CancellableWait(driver, WAIT_MED).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, SEL_MEDIUM["publish_btn"]))
     )
     _log("STEP:EDITOR_READY container and publish button located")
@@ -349,7 +370,27 @@ def _element_plain_text(driver: webdriver.Chrome, element) -> str:
             return ""
 
 
-def fill_title_and_body(driver: webdriver.Chrome, title: str, body: str):
+class _StepClock:
+    """Times consecutive publish phases and hands each duration to ``on_step``."""
+
+    def __init__(self, on_step: Optional[Callable[[str, float], Any]] = None) -> None:
+        self.on_step = on_step
+        self._mark = time.perf_counter()
+
+    def lap(self, step: str) -> float:
+        cancel_token.check()
+        now = time.perf_counter()
+        elapsed, self._mark = now - self._mark, now
+        _log(f"INFO:STEP_TIME step={step} seconds={elapsed:.2f}")
+        if self.on_step is not None:
+            try:
+                self.on_step(step, elapsed)
+            except Exception as exc:
+                _log(f"WARN:STEP_TIME_HOOK_FAILED step={step} err={exc}")
+        return elapsed
+
+
+def fill_title_and_body(driver: webdriver.Chrome, title: str, body: str, clock: Optional[_StepClock] = None):
     _log("STEP:RESOLVE_CONTAINER locate section-inner")
     # input("PAUSE after locating section-inner, press any keys to continue...")
     container = _get_container(driver)
@@ -418,6 +459,8 @@ def fill_title_and_body(driver: webdriver.Chrome, title: str, body: str):
         title_id = None
 
     _log("STEP:title_id is " + (title_id or "<unknown>"))
+    if clock is not None:
+        clock.lap("fill_title")
 
     body_value = body or DEFAULT_MEDIUM_BODY_HTML
     is_html, prepared_body, _ = _prepare_medium_body_content(body_value, title_input)
@@ -466,7 +509,7 @@ def _click_optional_ok_button(driver: webdriver.Chrome, timeout: float = 5.0) ->
         return None
 
     try:
-        button = WebDriverWait(driver, timeout).until(lambda d: _find_button(d))
+        button = _CancellableWait(driver, timeout).until(lambda d: _find_button(d))
     except Exception:
         _log("INFO:BODY_OPTIONAL_OK not found or timeout")
         return
@@ -1641,7 +1684,7 @@ def _locate_by_selectors(driver: webdriver.Chrome, selectors, exclude_ids=(), sc
         if not sel:
             continue
         try:
-            WebDriverWait(driver, WAIT_MED).until(
+            _CancellableWait(driver, WAIT_MED).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, sel))
             )
         except TimeoutException:
@@ -2110,7 +2153,7 @@ def _add_medium_tag(driver: webdriver.Chrome, tag_text: str, existing: list[str]
         return tag_lower in tags_now
 
     try:
-        WebDriverWait(driver, WAIT_SHORT).until(_chip_added)
+        _CancellableWait(driver, WAIT_SHORT).until(_chip_added)
     except TimeoutException:
         _log(f"WARN:TAG_ADD_TIMEOUT tag={tag}")
 
@@ -2166,7 +2209,7 @@ def _await_publish_url(driver: webdriver.Chrome, timeout: int = 10):
         return False
 
     try:
-        return WebDriverWait(driver, timeout).until(_condition)
+        return _CancellableWait(driver, timeout).until(_condition)
     except TimeoutException:
         return _extract_publish_link(driver)
 
@@ -2265,7 +2308,7 @@ def _wait_publish_ready(driver: webdriver.Chrome, timeout: int = 20, require_bod
             return False
 
     try:
-        WebDriverWait(driver, timeout).until(_condition)
+        _CancellableWait(driver, timeout).until(_condition)
         _log("INFO:PUBLISH_READY button enabled and draft saved")
         return True
     except TimeoutException:
@@ -2280,7 +2323,7 @@ def click_publish_confirm_button(driver: webdriver.Chrome) -> bool:
         "and (normalize-space()='Publish now' or normalize-space()='Publish')]]"
     )
     try:
-        button = WebDriverWait(driver, WAIT_MED).until(
+        button = _CancellableWait(driver, WAIT_MED).until(
             lambda d: d.find_element(By.XPATH, publish_xpath)
         )
     except Exception:
@@ -2396,27 +2439,41 @@ def medium_publish_article_selenium(
     tags: Iterable[str] | None = None,
     publish_now: bool = True,
     retries: int = MEDIUM_SELENIUM_RETRIES,
+    on_step: Optional[Callable[[str, float], Any]] = None,
+    cancel: CancelToken | None = None,
 ):
     # input("STEP:COMPLETE publishing flow finished Press Enter to continue...")
+    if cancel is not None:
+        with cancel_token.bind(cancel):
+            return medium_publish_article_selenium(driver, title, content, tags, publish_now, retries, on_step)
     last_exc = None
+    clock = _StepClock(on_step)
     try:
         _log("STEP:PUBLISH_START opening Medium editor")
         open_medium_editor(driver)
+        clock.lap("open_editor")
         _log("STEP:PUBLISH_EDITOR_OPEN filling title and body")
-        fill_title_and_body(driver, title, content)
+        fill_title_and_body(driver, title, content, clock=clock)
+        clock.lap("paste_body")
         _log("STEP:PUBLISH_BODY_FILLED waiting for publish button to be ready")
         _wait_publish_ready(driver)
+        clock.lap("wait_ready")
         _log("STEP:PUBLISH_READY opening publish dialog and filling details")
         open_publish_and_fill(driver, tags, publish_now)
         _log("STEP:PUBLISH_DIALOG_FILLED clicking publish confirm button")
         click_publish_confirm_button(driver)
-        _log("STEP:PUBLISH_CLICKED checking for publish quota block")
-        if _detect_publish_quota_block(driver):
-            _log("ERROR:PUBLISH_QUOTA Medium publish quota exceeded (3 posts per 24 hours)")
-            raise RuntimeError("Medium publish quota exceeded (3 posts per 24 hours).")
-        _log("STEP:PUBLISH_QUOTA_OK waiting for publish URL")
-        publish_url = None
-        publish_url = _await_publish_url(driver, timeout=10)
+        # The story is live now: a cancel here would only lose its URL, and the
+        # remaining waits are bounded (quota check 5s, URL 10s).
+        with cancel_token.bind(None):
+            _log("STEP:PUBLISH_CLICKED checking for publish quota block")
+            if _detect_publish_quota_block(driver):
+                _log("ERROR:PUBLISH_QUOTA Medium publish quota exceeded (3 posts per 24 hours)")
+                raise RuntimeError("Medium publish quota exceeded (3 posts per 24 hours).")
+            clock.lap("publish")
+            _log("STEP:PUBLISH_QUOTA_OK waiting for publish URL")
+            publish_url = None
+            publish_url = _await_publish_url(driver, timeout=10)
+            clock.lap("await_url")
         _log(f"STEP:COMPLETE publishing flow finished url={publish_url}")
         return publish_url
     except Exception as e:
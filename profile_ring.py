@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, NamedTuple
+
+from config import SCHEDULE_RING_VNODES
+
+
+def _point(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode("utf-8", errors="replace")).digest()[:8], "big")
+
+
+class Rebalance(NamedTuple):
+    """What a membership change did to a set of profiles."""
+
+    moved: Dict[str, tuple[str | None, str | None]]  # profile -> (old owner, new owner)
+    cold: List[str]  # moved profiles whose warm data is on another node now
+
+    def summary(self) -> str:
+        return f"moved={len(self.moved)} cold_moves={len(self.cold)}"
+
+
+class HashRing:
+    """Consistent-hash ring mapping profiles to nodes.
+
+    Every node owns ``vnodes`` points on the ring and a profile belongs to
+    the first point clockwise of its own hash, so a node joining or leaving
+    only moves the profiles on the arcs it gains or gives up (about 1/n).
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = SCHEDULE_RING_VNODES) -> None:
+        self.vnodes = max(1, vnodes)
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def add(self, node: str) -> bool:
+        if node in self._nodes:
+            return False
+        self._nodes.add(node)
+        for idx in range(self.vnodes):
+            point = _point(f"{node}#{idx}")
+            pos = bisect.bisect(self._points, point)
+            self._points.insert(pos, point)
+            self._owners.insert(pos, node)
+        return True
+
+    def remove(self, node: str) -> bool:
+        if node not in self._nodes:
+            return False
+        self._nodes.discard(node)
+        keep = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _owner in keep]
+        self._owners = [owner for _point, owner in keep]
+        return True
+
+    def owner(self, profile: str) -> str | None:
+        if not self._points:
+            return None
+        pos = bisect.bisect(self._points, _point(profile)) % len(self._points)
+        return self._owners[pos]
+
+    def assignment(self, profiles: Iterable[str]) -> Dict[str, str | None]:
+        return {profile: self.owner(profile) for profile in profiles}
+
+
+def rebalance(
+    ring: HashRing,
+    profiles: Iterable[str],
+    homes: Dict[str, str],
+    join: str | None = None,
+    leave: str | None = None,
+) -> Rebalance:
+    """Apply a join and/or leave to ``ring`` and report which profiles changed owner.
+
+    ``homes`` maps a profile to the node that last ran it (where its warm
+    Chrome data is); a move away from that node is a cold move.
+    """
+    profiles = list(profiles)
+    before = ring.assignment(profiles)
+    if leave is not None:
+        ring.remove(leave)
+    if join is not None:
+        ring.add(join)
+    after = ring.assignment(profiles)
+    moved = {profile: (before[profile], after[profile]) for profile in profiles if before[profile] != after[profile]}
+    cold = [profile for profile, (_old, new) in moved.items() if homes.get(profile) not in (None, new)]
+    return Rebalance(moved, cold)
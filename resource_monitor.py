@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from config import (
+    SCHEDULE_ADAPT_INTERVAL_S,
+    SCHEDULE_CONCURRENCY_MAX,
+    SCHEDULE_CONCURRENCY_MIN,
+    SCHEDULE_CPU_HIGH_PCT,
+    SCHEDULE_CPU_LOW_PCT,
+    SCHEDULE_HEARTBEAT_S,
+    SCHEDULE_HEARTBEAT_SILENCE_S,
+    SCHEDULE_MEM_FLOOR_PCT,
+    SCHEDULE_STEP_BUDGET_S,
+    SCHEDULE_WATCHDOG_GRACE_S,
+    SCHEDULE_WORKER_RSS_MB,
+)
+
+CHROME_PROCESS_NAMES = ("chrome", "chromedriver", "msedgedriver")
+_MB = 1024 * 1024
+
+
+def _log(message: str) -> None:
+    caller = inspect.currentframe().f_back  # type: ignore[assignment]
+    line = caller.f_lineno if caller else -1
+    pid = os.getpid()
+    formatted = f"[pid {pid:>6}] [line {line:04d}] {message}"
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    try:
+        sys.stdout.buffer.write((formatted + "\n").encode(encoding, errors="replace"))
+        sys.stdout.flush()
+    except Exception:
+        print(formatted)
+
+
+def _load_psutil() -> Any | None:
+    try:
+        return importlib.import_module("psutil")
+    except Exception:
+        return None
+
+
+class ResourceSample(NamedTuple):
+    mem_total_mb: float
+    mem_available_mb: float
+    cpu_pct: float
+    chrome_rss_mb: float
+    chrome_procs: int
+
+    @property
+    def mem_available_pct(self) -> float:
+        return 100.0 * self.mem_available_mb / self.mem_total_mb if self.mem_total_mb else 100.0
+
+
+class ResourceSampler:
+    """Reads system memory, CPU and the RSS of running Chrome/driver processes."""
+
+    def __init__(self, psutil_module: Any | None = None) -> None:
+        self.psutil = psutil_module if psutil_module is not None else _load_psutil()
+        if self.psutil is not None:
+            self.psutil.cpu_percent(interval=None)  # prime the delta counter
+
+    @property
+    def available(self) -> bool:
+        return self.psutil is not None
+
+    def sample(self) -> ResourceSample:
+        memory = self.psutil.virtual_memory()
+        chrome_rss = 0
+        chrome_procs = 0
+        for proc in self.psutil.process_iter(["name", "memory_info"]):
+            name = (proc.info.get("name") or "").lower()
+            if not name.startswith(CHROME_PROCESS_NAMES):
+                continue
+            info = proc.info.get("memory_info")
+            if info is not None:
+                chrome_rss += info.rss
+                chrome_procs += 1
+        return ResourceSample(
+            mem_total_mb=memory.total / _MB,
+            mem_available_mb=memory.available / _MB,
+            cpu_pct=float(self.psutil.cpu_percent(interval=None)),
+            chrome_rss_mb=chrome_rss / _MB,
+            chrome_procs=chrome_procs,
+        )
+
+
+class ConcurrencyController:
+    """Decides the live profile-worker budget from resource samples.
+
+    Shrinks right away when free memory falls under the floor or the
+    smoothed CPU load is high; grows one worker at a time, and only while
+    workers are queued, the CPU has room and another Chrome (sized from the
+    measured RSS per live worker) still fits above the memory floor.
+    """
+
+    def __init__(
+        self,
+        lower: int = SCHEDULE_CONCURRENCY_MIN,
+        upper: int = SCHEDULE_CONCURRENCY_MAX,
+        mem_floor_pct: float = SCHEDULE_MEM_FLOOR_PCT,
+        cpu_high_pct: float = SCHEDULE_CPU_HIGH_PCT,
+        cpu_low_pct: float = SCHEDULE_CPU_LOW_PCT,
+        worker_rss_mb: float = SCHEDULE_WORKER_RSS_MB,
+        cpu_alpha: float = 0.5,
+    ) -> None:
+        self.lower = max(1, lower)
+        self.upper = max(self.lower, upper)
+        self.mem_floor_pct = mem_floor_pct
+        self.cpu_high_pct = cpu_high_pct
+        self.cpu_low_pct = cpu_low_pct
+        self.worker_rss_mb = worker_rss_mb
+        self.cpu_alpha = cpu_alpha
+        self.cpu_smoothed: float | None = None
+
+    def clamp(self, value: int) -> int:
+        return min(self.upper, max(self.lower, value))
+
+    def decide(self, sample: ResourceSample, current: int, active: int, waiting: int) -> Tuple[int, str]:
+        previous = self.cpu_smoothed
+        self.cpu_smoothed = (
+            sample.cpu_pct if previous is None else previous + self.cpu_alpha * (sample.cpu_pct - previous)
+        )
+        if active and sample.chrome_rss_mb:
+            self.worker_rss_mb = sample.chrome_rss_mb / active
+        if sample.mem_available_pct < self.mem_floor_pct:
+            # memory pressure: back off hard, Chrome swapping stalls every worker
+            return self.clamp(min(current, max(1, active)) // 2 or 1), "memory_low"
+        if self.cpu_smoothed > self.cpu_high_pct:
+            return self.clamp(current - 1), "cpu_high"
+        if waiting and active >= current and self.cpu_smoothed < self.cpu_low_pct:
+            floor_mb = sample.mem_total_mb * self.mem_floor_pct / 100.0
+            if sample.mem_available_mb - self.worker_rss_mb > floor_mb:
+                return self.clamp(current + 1), "headroom"
+        return self.clamp(current), ""
+
+
+class ConcurrencyGovernor:
+    """Samples resources on a timer and pushes the controller's budget to ``apply``."""
+
+    def __init__(
+        self,
+        apply: Callable[[int], Any],
+        load: Callable[[], Tuple[int, int, int]],
+        controller: ConcurrencyController | None = None,
+        sampler: ResourceSampler | None = None,
+        interval: float = SCHEDULE_ADAPT_INTERVAL_S,
+    ) -> None:
+        self.apply = apply
+        self.load = load
+        self.controller = controller or ConcurrencyController()
+        self.sampler = sampler or ResourceSampler()
+        self.interval = max(0.5, interval)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "ConcurrencyGovernor":
+        if not self.sampler.available:
+            _log("WARN:ADAPTIVE_CONCURRENCY_OFF psutil is not installed, keeping a fixed limit")
+            return self
+        current, _active, _waiting = self.load()
+        if self.controller.clamp(current) != current:
+            self.apply(self.controller.clamp(current))
+        self._thread = threading.Thread(target=self._loop, name="concurrency-governor", daemon=True)
+        self._thread.start()
+        _log(
+            f"INFO:ADAPTIVE_CONCURRENCY bounds={self.controller.lower}..{self.controller.upper} "
+            f"interval={self.interval}s"
+        )
+        return self
+
+    def step(self) -> int:
+        current, active, waiting = self.load()
+        sample = self.sampler.sample()
+        target, reason = self.controller.decide(sample, current, active, waiting)
+        if target != current:
+            _log(
+                f"INFO:CONCURRENCY_RESIZE {current}->{target} reason={reason} active={active} waiting={waiting} "
+                f"mem_free={sample.mem_available_pct:.0f}% cpu={self.controller.cpu_smoothed:.0f}% "
+                f"chrome_rss={sample.chrome_rss_mb:.0f}MB procs={sample.chrome_procs}"
+            )
+            self.apply(target)
+        return target
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.step()
+            except Exception as exc:  # pylint: disable=broad-except
+                _log(f"WARN:CONCURRENCY_SAMPLE_FAILED err={exc}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def browser_tree(psutil: Any, worker_pid: int, debugger_address: str = "", driver_pid: int = 0) -> List[Any]:
+    """Chrome and chromedriver processes that belong to one worker, children first.
+
+    GPM starts Chrome outside the worker's process tree, so Chrome is found
+    by the remote-debugging port the worker attached to.
+    """
+    found: Dict[int, Any] = {}
+
+    def add(proc: Any) -> None:
+        try:
+            for child in proc.children(recursive=True):
+                found.setdefault(child.pid, child)
+        except psutil.Error:
+            pass
+        found.setdefault(proc.pid, proc)
+
+    try:
+        for child in psutil.Process(worker_pid).children(recursive=True):
+            add(child)
+    except psutil.Error:
+        pass
+    if driver_pid:
+        try:
+            add(psutil.Process(driver_pid))
+        except psutil.Error:
+            pass
+    port = debugger_address.rpartition(":")[2]
+    if port.isdigit():
+        flag = f"--remote-debugging-port={port}"
+        for proc in psutil.process_iter(["cmdline"]):
+            if flag in (proc.info.get("cmdline") or ()):
+                add(proc)
+    found.pop(worker_pid, None)
+    return list(found.values())
+
+
+def kill_processes(psutil: Any, procs: List[Any], timeout: float = 5.0) -> int:
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    _gone, alive = psutil.wait_procs(procs, timeout=timeout)
+    return len(procs) - len(alive)
+
+
+class _WorkerBeat:
+    def __init__(self, job_key: str, step: str, since: float, browser: str, driver_pid: int) -> None:
+        self.job_key = job_key
+        self.step = step
+        self.since = since
+        self.browser = browser
+        self.driver_pid = driver_pid
+        self.last = time.time()
+        self.killed_at: float | None = None
+
+
+class Watchdog:
+    """Kills the browser of a worker whose heartbeats show it stuck in one step.
+
+    Workers report ``(pid, job, step, step start, debugger address, driver
+    pid)`` every few seconds. A worker that stays in a step longer than the
+    step's budget, or stops beating, has its Chrome/chromedriver tree
+    killed so the blocked WebDriver call fails; ``on_stall`` hears about it
+    first. If the worker is still stuck ``grace_s`` later it is killed too,
+    which frees its slot either way.
+    """
+
+    def __init__(
+        self,
+        on_stall: Callable[[str, str, float], Any] | None = None,
+        budgets: Dict[str, float] | None = None,
+        silence_s: float = SCHEDULE_HEARTBEAT_SILENCE_S,
+        grace_s: float = SCHEDULE_WATCHDOG_GRACE_S,
+        interval: float = SCHEDULE_HEARTBEAT_S,
+        psutil_module: Any | None = None,
+    ) -> None:
+        self.on_stall = on_stall
+        self.budgets = dict(SCHEDULE_STEP_BUDGET_S if budgets is None else budgets)
+        self.silence_s = silence_s
+        self.grace_s = grace_s
+        self.interval = max(0.5, interval)
+        self.psutil = psutil_module if psutil_module is not None else _load_psutil()
+        self._workers: Dict[int, _WorkerBeat] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def beat(self, pid: int, job_key: str, step: str, since: float, browser: str = "", driver_pid: int = 0) -> None:
+        if self.psutil is None:
+            return
+        with self._lock:
+            if not job_key:
+                self._workers.pop(pid, None)
+                return
+            current = self._workers.get(pid)
+            if current is None or (current.job_key, current.step) != (job_key, step):
+                current = self._workers[pid] = _WorkerBeat(job_key, step, since, browser, driver_pid)
+            current.browser = browser or current.browser
+            current.driver_pid = driver_pid or current.driver_pid
+            current.last = time.time()
+
+    def budget(self, step: str) -> float:
+        return float(self.budgets.get(step, self.budgets.get("*", 300.0)))
+
+    def check(self, now: float | None = None) -> List[tuple[int, str]]:
+        """Act on stalled workers; returns ``(pid, action)`` for each one acted on."""
+        now = time.time() if now is None else now
+        actions: List[tuple[int, str]] = []
+        with self._lock:
+            workers = list(self._workers.items())
+        for pid, beat in workers:
+            if not self.psutil.pid_exists(pid):
+                with self._lock:
+                    self._workers.pop(pid, None)  # the dispatcher handles dead workers
+                continue
+            age, silent = now - beat.since, now - beat.last
+            if beat.killed_at is None:
+                if age <= self.budget(beat.step) and silent <= self.silence_s:
+                    continue
+                beat.killed_at = now
+                if self.on_stall is not None:
+                    self.on_stall(beat.job_key, beat.step, age)
+                procs = browser_tree(self.psutil, pid, beat.browser, beat.driver_pid)
+                killed = kill_processes(self.psutil, procs)
+                _log(
+                    f"WARN:WATCHDOG_STALL pid={pid} job={beat.job_key} step={beat.step} age={age:.0f}s "
+                    f"budget={self.budget(beat.step):.0f}s silent={silent:.0f}s browser_killed={killed}"
+                )
+                actions.append((pid, "browser"))
+            elif now - beat.killed_at > self.grace_s:
+                try:
+                    worker = self.psutil.Process(pid)
+                    procs = browser_tree(self.psutil, pid, beat.browser, beat.driver_pid)
+                    killed = kill_processes(self.psutil, procs + [worker])
+                except self.psutil.Error:
+                    killed = 0
+                with self._lock:
+                    self._workers.pop(pid, None)
+                _log(f"WARN:WATCHDOG_KILL_WORKER pid={pid} job={beat.job_key} step={beat.step} killed={killed}")
+                actions.append((pid, "worker"))
+        return actions
+
+    def start(self) -> "Watchdog":
+        if self.psutil is None:
+            _log("WARN:WATCHDOG_OFF psutil is not installed, hung browsers are not detected")
+            return self
+        self._thread = threading.Thread(target=self._loop, name="watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as exc:  # pylint: disable=broad-except
+                _log(f"WARN:WATCHDOG_CHECK_FAILED err={exc}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
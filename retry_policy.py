@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+
+from cancel_token import CANCELLED_MESSAGE
+from config import MEDIUM_RETRY_DELAY_S, MEDIUM_SELENIUM_RETRIES, SCHEDULE_RETRY_MAX_DELAY_S
+
+FAILURE_RETRYABLE = "retryable"
+FAILURE_QUOTA = "quota"
+FAILURE_LOGIN = "login_required"
+FAILURE_PERMANENT = "permanent"
+FAILURE_CANCELLED = "cancelled"
+
+# Lower-cased fragments of the errors Runner / medium_selenium report.
+_QUOTA_MARKERS = ("publish quota exceeded", "maximum of three stories")
+_LOGIN_MARKERS = ("login required", "not logged in", "sign in to", "/m/signin", "session expired")
+_PERMANENT_MARKERS = (
+    "not found. create it first",  # GPM profile missing
+    "missing medium configuration",
+    "unsupported platform",
+    "is not supported",
+    "cannot import",
+    "content file not found",
+    # the story may already be live; retrying could publish it twice
+    "no publish url",
+)
+
+
+def classify_failure(error: str) -> str:
+    """Map a job's error text to one of the ``FAILURE_*`` classes.
+
+    Anything not recognised (GPM/Chrome launch problems, timeouts, network
+    and WebDriver errors, crashed workers) counts as retryable.
+    """
+    text = (error or "").lower()
+    if CANCELLED_MESSAGE in text:
+        return FAILURE_CANCELLED
+    if any(marker in text for marker in _QUOTA_MARKERS):
+        return FAILURE_QUOTA
+    if any(marker in text for marker in _LOGIN_MARKERS):
+        return FAILURE_LOGIN
+    if any(marker in text for marker in _PERMANENT_MARKERS):
+        return FAILURE_PERMANENT
+    return FAILURE_RETRYABLE
+
+
+def should_retry(failure: str, attempts: int, retries: int = MEDIUM_SELENIUM_RETRIES) -> bool:
+    """``attempts`` counts runs so far, the first one included."""
+    return failure == FAILURE_RETRYABLE and attempts <= retries
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = MEDIUM_RETRY_DELAY_S,
+    cap: float = SCHEDULE_RETRY_MAX_DELAY_S,
+) -> float:
+    """Exponential backoff with equal jitter for retry number ``attempt`` (1-based)."""
+    delay = min(cap, base * (2 ** max(0, attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
@@ -17,11 +17,6 @@ from typing import Any, Dict, Iterable, List
 
 from config import Config
 
-try:  # optional Excel dependency
-    import pandas as pd  # type: ignore
-except Exception:  # pragma: no cover
-    pd = None
-
 CFG = Config()
 DEFAULT_TABLE = Path("schedule_template.csv")
 DEFAULT_CONCURRENCY = 2
@@ -90,8 +85,10 @@ def load_jobs(table_path: Path) -> List[Dict[str, Any]]:
     if not path.exists():
         raise FileNotFoundError(path)
     if is_xlsx(path):
-        if pd is None:
-            raise RuntimeError("pandas is required to read Excel files")
+        try:  # optional Excel dependency, only paid for on Excel runs
+            import pandas as pd  # type: ignore
+        except Exception as exc:  # pragma: no cover
+            raise RuntimeError("pandas is required to read Excel files") from exc
         df = pd.read_excel(path)  # type: ignore[arg-type]
         rows = df.fillna(" ").to_dict(orient="records")
     else:
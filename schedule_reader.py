@@ -1,28 +1,73 @@
 from __future__ import annotations
 
+import argparse
+import codecs
 import csv
-import io
+import glob
+import hashlib
 import inspect
+import heapq
+import itertools
 import queue
-import sched
+import re
 import threading
 import time
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
-from multiprocessing import Process
+from functools import cached_property
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Sequence
 
 from console_utils import ensure_own_console
 from console_utils import ensure_own_console
 from config import (
     SCHEDULE_TABLE_PATH,
+    SCHEDULE_ADAPTIVE_CONCURRENCY,
     SCHEDULE_CONCURRENCY,
+    SCHEDULE_CONCURRENCY_MAX,
     CHROME_USER_DATA_DIR,
     SCHEDULE_SHOW_CONSOLE,
+    SCHEDULE_DAEMON,
+    SCHEDULE_JOB_ESTIMATE_S,
+    SCHEDULE_OVERLAP_SLOTS,
+    SCHEDULE_SHUTDOWN_TIMEOUT_S,
+    SCHEDULE_LINK_FLUSH_S,
+    SCHEDULE_LEDGER_PATH,
+    SCHEDULE_WATCH,
+    SCHEDULE_WATCH_INTERVAL_S,
+    SCHEDULE_SIM_DURATION,
+    SCHEDULE_SIM_SEED,
+    SCHEDULE_PROFILES_ROOT,
+    SCHEDULE_SERVE,
+    SCHEDULE_COORDINATOR_URL,
+    SCHEDULE_AGENT_SLOTS,
+    SCHEDULE_HEARTBEAT_S,
+    SCHEDULE_WATCHDOG,
+)
+from content_refs import cell_digest, load_cell
+from duration_model import PUBLISH_STEPS, STEP_LAUNCH, STEP_TOTAL, DurationModel
+from resource_monitor import ConcurrencyController, ConcurrencyGovernor, Watchdog
+from worker_context import mp_context
+from cancel_token import CANCELLED_MESSAGE
+from retry_policy import FAILURE_CANCELLED, FAILURE_QUOTA, backoff_delay, classify_failure, should_retry
+from job_ledger import (
+    EVENT_FINISH,
+    EVENT_PUBLISHED,
+    EVENT_START,
+    EVENT_STEP,
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    STATUS_UNCONFIRMED,
+    VERDICT_OWN,
+    JobJournal,
+    JobLedger,
+    LedgerRow,
 )
 
 if TYPE_CHECKING:
@@ -38,20 +83,44 @@ ENCODING_CANDIDATES: tuple[str, ...] = (
 )
 DEFAULT_LIMIT = SCHEDULE_CONCURRENCY
 DEFAULT_SHOW_CONSOLE = bool(SCHEDULE_SHOW_CONSOLE)
+DEFAULT_DAEMON = bool(SCHEDULE_DAEMON)
+DEFAULT_OVERLAP = bool(SCHEDULE_OVERLAP_SLOTS)
+DEFAULT_WATCH = bool(SCHEDULE_WATCH)
+DEFAULT_ADAPTIVE = bool(SCHEDULE_ADAPTIVE_CONCURRENCY)
+POOL_POLL_S = 1.0
+KILL_GRACE_S = 5.0  # how long a terminated worker gets before it is killed
+ENCODING_SNIFF_BYTES = 64 * 1024
+TIMER_METRIC_SAMPLES = 1024
 SCHEDULE_TIME_FORMATS: tuple[str, ...] = (
     "%H:%M",
     "%H:%M:%S",
     "%Y-%m-%d %H:%M",
     "%Y-%m-%d %H:%M:%S",
 )
-try:  # optional Excel support
-    import pandas as pd  # type: ignore
-except Exception:  # pragma: no cover
-    pd = None
-try:
-    from openpyxl import load_workbook  # type: ignore
-except Exception:  # pragma: no cover
-    load_workbook = None
+SCHEDULE_DATE_FORMATS: tuple[str, ...] = (
+    "%d/%m",
+    "%d-%m",
+    "%d.%m",
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+)
+TIMESTAMP_SAMPLE_ROWS = 200
+TABLE_SUFFIXES = (".csv", ".xlsx", ".xls")
+TABLE_READ_WORKERS = 8
+
+
+def _optional_import(module: str) -> Any:
+    """Import an optional Excel dependency on first use; None when unavailable."""
+    try:
+        return __import__(module)
+    except Exception:  # pragma: no cover
+        return None
+
+
+def _load_workbook_fn() -> Any:
+    openpyxl = _optional_import("openpyxl")
+    return openpyxl.load_workbook if openpyxl is not None else None
 
 
 def _log(message: str) -> None:
@@ -100,35 +169,136 @@ def _normalize_field(value: Any) -> str:
 _MOJIBAKE_MARKERS = ("Ã", "Â", "Ð", "Ê", "¤", "�")
 
 
-def _parse_schedule_timestamp(value: str, date_hint: str | None = None) -> datetime | None:
-    text = (value or "").strip()
-    if not text:
+_DIRECTIVE_PATTERNS = {
+    "%Y": r"(?P<year>\d{4})",
+    "%m": r"(?P<month>\d{1,2})",
+    "%d": r"(?P<day>\d{1,2})",
+    "%H": r"(?P<hour>\d{1,2})",
+    "%M": r"(?P<minute>\d{1,2})",
+    "%S": r"(?P<second>\d{1,2})",
+}
+
+
+def _compile_format(fmt: str) -> "re.Pattern[str]":
+    parts = re.split(r"(%[A-Za-z])", fmt)
+    return re.compile("".join(_DIRECTIVE_PATTERNS.get(part) or re.escape(part) for part in parts))
+
+
+class ScheduleTimeParser:
+    """Parses the ``schedule_time``/``date`` columns with formats detected once.
+
+    ``infer`` picks the format that matches most of a sample of each column.
+    Every row is then matched against that pre-compiled pattern (other known
+    formats are only tried for rows that miss it) relative to one captured
+    ``now``. Rows that match nothing are returned as errors by ``parse_jobs``
+    instead of being treated as immediate.
+    """
+
+    def __init__(self, time_format: str | None, date_format: str | None, now: datetime | None = None) -> None:
+        self.now = now or datetime.now()
+        self.time_format = time_format
+        self.date_format = date_format
+        self._time_patterns = self._ordered(time_format, SCHEDULE_TIME_FORMATS)
+        self._date_patterns = self._ordered(date_format, SCHEDULE_DATE_FORMATS)
+        self.fallback_rows: List[int] = []
+
+    @staticmethod
+    def _ordered(primary: str | None, formats: Sequence[str]) -> List[tuple[str, "re.Pattern[str]"]]:
+        ordered = ([primary] if primary else []) + [fmt for fmt in formats if fmt != primary]
+        return [(fmt, _compile_format(fmt)) for fmt in ordered]
+
+    @staticmethod
+    def _dominant(values: Iterable[str], formats: Sequence[str]) -> str | None:
+        patterns = [(fmt, _compile_format(fmt)) for fmt in formats]
+        hits: Dict[str, int] = defaultdict(int)
+        for value in values:
+            for fmt, pattern in patterns:
+                if pattern.fullmatch(value):
+                    hits[fmt] += 1
+                    break
+        return max(formats, key=lambda fmt: hits[fmt]) if hits else None
+
+    @classmethod
+    def infer(
+        cls, jobs: Sequence[ScheduleJob], sample: int = TIMESTAMP_SAMPLE_ROWS, now: datetime | None = None
+    ) -> "ScheduleTimeParser":
+        times = [job.schedule_time for job in jobs if job.schedule_time][:sample]
+        dates = [job.schedule_date for job in jobs if job.schedule_date][:sample]
+        parser = cls(
+            cls._dominant(times, SCHEDULE_TIME_FORMATS),
+            cls._dominant(dates, SCHEDULE_DATE_FORMATS),
+            now,
+        )
+        _log(
+            f"INFO:TIMESTAMP_FORMAT time={parser.time_format!r} date={parser.date_format!r} "
+            f"sample_times={len(times)} sample_dates={len(dates)}"
+        )
+        return parser
+
+    def _match(self, value: str, patterns: List[tuple[str, "re.Pattern[str]"]]) -> tuple[str, Dict[str, str]] | None:
+        for fmt, pattern in patterns:
+            match = pattern.fullmatch(value)
+            if match:
+                return fmt, match.groupdict()
         return None
-    now = datetime.now()
-    date_obj: datetime | None = None
-    if date_hint:
-        for fmt in ("%d/%m", "%d-%m", "%d.%m"):
-            try:
-                parsed_date = datetime.strptime(date_hint.strip(), fmt)
-                date_obj = parsed_date.replace(year=now.year)
-                break
-            except ValueError:
-                continue
-    for fmt in SCHEDULE_TIME_FORMATS:
+
+    def parse(self, value: str, date_hint: str | None = None, row_index: int = 0) -> datetime | None:
+        """Return the target time, ``None`` for "run now", or raise ``ValueError``."""
+        text = (value or "").strip()
+        if not text:
+            return None
+        matched = self._match(text, self._time_patterns)
+        if matched is None:
+            raise ValueError(f"time {text!r} matches no known format")
+        fmt, parts = matched
+        fallback = fmt != self.time_format
+        now = self.now
+        year, month, day = now.year, now.month, now.day
+        if "year" in parts:
+            year, month, day = int(parts["year"]), int(parts["month"]), int(parts["day"])
+        hint = (date_hint or "").strip()
+        if hint:
+            date_matched = self._match(hint, self._date_patterns)
+            if date_matched is None:
+                raise ValueError(f"date {hint!r} matches no known format")
+            date_fmt, date_parts = date_matched
+            fallback = fallback or date_fmt != self.date_format
+            year = int(date_parts.get("year") or now.year)
+            month, day = int(date_parts["month"]), int(date_parts["day"])
         try:
-            parsed = datetime.strptime(text, fmt)
-        except ValueError:
-            continue
-        if date_obj:
-            parsed = parsed.replace(
-                year=date_obj.year,
-                month=date_obj.month,
-                day=date_obj.day,
+            target = datetime(
+                year,
+                month,
+                day,
+                int(parts["hour"]),
+                int(parts["minute"]),
+                int(parts.get("second") or 0),
             )
-        elif "%Y" not in fmt and "%y" not in fmt and "%m" not in fmt and "%d" not in fmt:
-            parsed = parsed.replace(year=now.year, month=now.month, day=now.day)
-        return parsed
-    return None
+        except ValueError as exc:
+            raise ValueError(f"time {text!r} date {hint!r}: {exc}") from exc
+        if fallback and row_index:
+            self.fallback_rows.append(row_index)
+        return target
+
+    def parse_jobs(
+        self, jobs: Iterable[ScheduleJob]
+    ) -> tuple[Dict[str, datetime | None], List[tuple[ScheduleJob, str]]]:
+        targets: Dict[str, datetime | None] = {}
+        errors: List[tuple[ScheduleJob, str]] = []
+        for job in jobs:
+            try:
+                targets[job.key] = self.parse(job.schedule_time, job.schedule_date, job.row_index)
+            except ValueError as exc:
+                errors.append((job, str(exc)))
+        if self.fallback_rows:
+            _log(f"WARN:TIMESTAMP_MIXED_FORMAT rows={self.fallback_rows}")
+        if errors:
+            _log(
+                f"WARN:TIMESTAMP_INVALID count={len(errors)} rows=["
+                + "; ".join(f"{job.row_index}: {reason}" for job, reason in errors)
+                + "]"
+            )
+        return targets, errors
 
 
 def _is_xlsx(path: Path) -> bool:
@@ -142,109 +312,134 @@ def _is_xlsx(path: Path) -> bool:
         return False
 
 
-def _read_csv_records(path: Path) -> List[Dict[str, Any]]:
-    data = path.read_bytes()
-    text: str | None = None
+def _sniff_csv_encoding(path: Path) -> str:
+    """First of ``ENCODING_CANDIDATES`` that decodes the whole file.
+
+    The file is decoded chunk by chunk, so memory stays flat; a byte that
+    only breaks an encoding late in the file still moves on to the next
+    candidate. UTF-16 is only tried for files that start with its BOM: the
+    decoder cannot tell byte order otherwise and would accept most 8-bit
+    files as garbage.
+    """
+    with path.open("rb") as fh:
+        head = fh.read(2)
     for encoding in ENCODING_CANDIDATES:
+        if encoding == "utf-16" and head not in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            continue
+        decoder = codecs.getincrementaldecoder(encoding)()
         try:
-            text = data.decode(encoding)
-            break
-        except UnicodeDecodeError:
+            with path.open("rb") as fh:
+                for chunk in iter(lambda: fh.read(ENCODING_SNIFF_BYTES), b""):
+                    decoder.decode(chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeError:
             continue
-    if text is None:
-        text = data.decode("latin-1", errors="replace")
-    reader = csv.DictReader(io.StringIO(text))
-    return list(reader)
-
-
-def _read_excel_records(path: Path) -> List[Dict[str, Any]]:
-    if pd is not None:
-        df = pd.read_excel(path)  # type: ignore[arg-type]
-        return df.fillna("").to_dict(orient="records")
-    if load_workbook is None:
-        raise RuntimeError("openpyxl is required for Excel schedules")
-    wb = load_workbook(path, data_only=True)
-    ws = wb.active
-    rows = list(ws.iter_rows(values_only=True))
-    if not rows:
-        return []
-    headers = [str(value or "").strip() for value in rows[0]]
-    records: List[Dict[str, Any]] = []
-    for row in rows[1:]:
-        record: Dict[str, Any] = {}
-        for idx, header in enumerate(headers):
-            if not header:
-                continue
-            record[header] = row[idx] if idx < len(row) else ""
-        records.append(record)
-    return records
+        return encoding
+    return "latin-1"
+
+
+def _iter_csv_records(path: Path) -> Iterator[Dict[str, Any]]:
+    encoding = _sniff_csv_encoding(path)
+    # the sniff checked every byte; "replace" only covers a file rewritten since
+    with path.open("r", encoding=encoding, errors="replace", newline="") as fh:
+        yield from csv.DictReader(fh)
 
 
-def read_schedule(path: Path = CSV_PATH) -> Dict[str, List[str]]:
+def _iter_excel_records(path: Path) -> Iterator[Dict[str, Any]]:
+    load_workbook = _load_workbook_fn()
+    if load_workbook is None or path.suffix.lower() == ".xls":
+        pd = _optional_import("pandas")
+        if pd is None:
+            raise RuntimeError("openpyxl (or pandas for .xls) is required for Excel schedules")
+        yield from pd.read_excel(path).fillna("").to_dict(orient="records")  # type: ignore[arg-type]
+        return
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        headers = [str(value or "").strip() for value in header_row]
+        for row in rows:
+            yield {
+                header: (row[idx] if idx < len(row) else "")
+                for idx, header in enumerate(headers)
+                if header
+            }
+    finally:
+        wb.close()
+
+
+def iter_schedule_records(path: Path) -> Iterator[tuple[int, Dict[str, Any]]]:
+    """Yield ``(sheet_row, record)`` pairs; ``sheet_row`` counts the header as row 1."""
     path = path.expanduser()
     if path.suffix.lower() in (".xlsx", ".xls") or _is_xlsx(path):
-        raw_rows = _read_excel_records(path)
-        _log(f"INFO:READ_SCHEDULE excel rows={len(raw_rows)} file={path}")
+        records = _iter_excel_records(path)
     else:
-        raw_rows = _read_csv_records(path)
-        _log(f"INFO:READ_SCHEDULE csv rows={len(raw_rows)} file={path}")
-
-    fields: Dict[str, List[str]] = {
-        "platform": [],
-        "profile": [],
-        "type": [],
-        "title": [],
-        "content": [],
-        "images": [],
-        "schedule_time": [],
-        "schedule_date": [],
-        "link": [],
-        "__row_index": [],
-    }
-
-    for idx, row in enumerate(raw_rows, start=1):
-        for key in fields:
-            if key == "profile":
-                value = (
-                    row.get("profile")
-                    or row.get("profile_path")
-                    or row.get("email")
-                    or ""
-                )
-            elif key == "schedule_date":
-                value = row.get("schedule_date") or row.get("date") or ""
-            elif key == "__row_index":
-                value = str(idx + 1)  # include header row
-            else:
-                value = row.get(key, "")
-            fields[key].append(_normalize_field(value))
+        records = _iter_csv_records(path)
+    for idx, record in enumerate(records, start=2):
+        yield idx, record
+
+
+_FIELD_SOURCES: Dict[str, tuple[str, ...]] = {
+    "platform": ("platform",),
+    "profile": ("profile", "profile_path", "email"),
+    "type": ("type",),
+    "title": ("title",),
+    "content": ("content",),
+    "images": ("images",),
+    "schedule_time": ("schedule_time",),
+    "schedule_date": ("schedule_date", "date"),
+    "link": ("link",),
+}
 
-    times_preview = ", ".join(_preview(t, 8) or "-" for t in fields["schedule_time"])
-    dates_preview = ", ".join(_preview(d, 5) or "-" for d in fields["schedule_date"])
-    _log(f"INFO:SCHEDULE_TIMES {times_preview or '<none>'} | DATES {dates_preview or '<none>'}")
+
+def _row_fields(record: Dict[str, Any]) -> Dict[str, str]:
+    fields: Dict[str, str] = {}
+    for key, sources in _FIELD_SOURCES.items():
+        raw: Any = ""
+        for source in sources:
+            raw = record.get(source)
+            if raw not in (None, ""):
+                break
+        fields[key] = _normalize_field(raw)
     return fields
 
 
-def build_jobs(columns: Dict[str, List[str]]) -> List["ScheduleJob"]:
-    _log("INFO:BUILD_JOBS_START")
-    count = max((len(values) for values in columns.values()), default=0)
-    jobs: List[ScheduleJob] = []
-    for idx in range(count):
-        data = {key: columns[key][idx] if idx < len(columns[key]) else "" for key in columns}
-        if not any(data.values()):
+def _identity_digest(platform: str, profile: str, title: str, content: str) -> str:
+    payload = "\x1f".join((platform.lower(), profile.lower(), title, content))
+    return hashlib.sha1(payload.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+
+def iter_schedule_jobs(path: Path = CSV_PATH, include_done: bool = False) -> Iterator["ScheduleJob"]:
+    """Stream ``ScheduleJob`` objects straight from the table, one row at a time.
+
+    Each cell is normalized once and no column lists are built, so memory
+    stays at one row plus the jobs the caller keeps. Identical rows are told
+    apart by their occurrence order, counted over done rows too so that a
+    link being written back does not renumber the rows after it.
+    """
+    path = path.expanduser()
+    total = skipped = 0
+    occurrences: Dict[str, int] = defaultdict(int)
+    for row_index, record in iter_schedule_records(path):
+        fields = _row_fields(record)
+        if not any(fields.values()):
             continue
-        if _normalize_field(data.get("link", "")):
-            _log(
-                f"INFO:SKIP_JOB row={data.get('__row_index','?')} profile={data.get('profile','')} reason=link_present"
-            )
+        job = ScheduleJob.from_fields(fields, row_index, path)
+        digest = _identity_digest(job.platform, job.profile, job.title, job.content)
+        job.occurrence = occurrences[digest]
+        occurrences[digest] += 1
+        if fields["link"] and not include_done:
+            skipped += 1
+            _log(f"INFO:SKIP_JOB row={row_index} profile={fields['profile']} reason=link_present")
             continue
-        jobs.append(ScheduleJob.from_dict(data))
-    _log(f"INFO:BUILD_JOBS total={len(jobs)}")
-    for idx, job in enumerate(jobs, start=1):
+        total += 1
         _log(
-            f"INFO:JOB_SUMMARY #{idx} platform={job.platform} date={(job.schedule_date or 'today')!r} time={(job.schedule_time or 'imm')!r} title='{_preview(job.title)}' content='{_preview(job.content)}'"
+            f"INFO:JOB_SUMMARY #{total} platform={job.platform} date={(job.schedule_date or 'today')!r} time={(job.schedule_time or 'imm')!r} title='{_preview(job.title)}' content='{_preview(job.content)}'"
         )
-    return jobs
+        yield job
+    _log(f"INFO:STREAM_JOBS total={total} skipped={skipped} file={path}")
 
 
 @dataclass
@@ -260,22 +455,66 @@ class ScheduleJob:
     link: str
     row_index: int
     table_path: Path | None = None
+    occurrence: int = 0
+
+    @cached_property
+    def identity(self) -> str:
+        """Row identity that survives rows being inserted, moved or re-timed."""
+        digest = _identity_digest(self.platform, self.profile, self.title, self.content)
+        return f"{digest}.{self.occurrence}"
+
+    @cached_property
+    def key(self) -> str:
+        # resolved, so a table opened by a relative and an absolute path is one set of jobs
+        return f"{self.table_path.resolve() if self.table_path is not None else ''}#{self.identity}"
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """What gets published where: normalized title and body plus the profile.
+
+        Unlike ``identity`` it ignores the table and occurrence, so copies of a
+        story across rows, tables and reruns share it. ``@file`` cells count
+        by the file's digest, so their text is not loaded here.
+        """
+        title = " ".join(cell_digest(self.title, self.base_dir).split()).casefold()
+        body = " ".join(cell_digest(self.content, self.base_dir).split())
+        payload = "\x1f".join((self.platform.lower(), self.profile_key, title, body))
+        return hashlib.sha256(payload.encode("utf-8", errors="replace")).hexdigest()
 
     @classmethod
     def from_dict(cls, row: Dict[str, str]) -> "ScheduleJob":
+        fields = {key: _normalize_field(row.get(key, "")) for key in _FIELD_SOURCES}
+        return cls.from_fields(fields, int(_normalize_field(row.get("__row_index", "0")) or "0"))
+
+    @classmethod
+    def from_fields(
+        cls,
+        fields: Dict[str, str],
+        row_index: int,
+        table_path: Path | None = None,
+        occurrence: int = 0,
+    ) -> "ScheduleJob":
+        """Build a job from already-normalized fields (see ``_row_fields``)."""
         return cls(
-            platform=_normalize_field(row.get("platform", "")) or "Medium",
-            profile=_normalize_field(row.get("profile", "")),
-            type=_normalize_field(row.get("type", "")) or "medium",
-            title=_normalize_field(row.get("title", "")) or "Untitled",
-            content=_normalize_field(row.get("content", "")),
-            images=_normalize_field(row.get("images", "")),
-            schedule_time=_normalize_field(row.get("schedule_time", "")),
-            schedule_date=_normalize_field(row.get("schedule_date", "")),
-            link=_normalize_field(row.get("link", "")),
-            row_index=int(_normalize_field(row.get("__row_index", "0")) or "0"),
+            platform=fields.get("platform") or "Medium",
+            profile=fields.get("profile", ""),
+            type=fields.get("type") or "medium",
+            title=fields.get("title") or "Untitled",
+            content=fields.get("content", ""),
+            images=fields.get("images", ""),
+            schedule_time=fields.get("schedule_time", ""),
+            schedule_date=fields.get("schedule_date", ""),
+            link=fields.get("link", ""),
+            row_index=row_index,
+            table_path=table_path,
+            occurrence=occurrence,
         )
 
+    @property
+    def base_dir(self) -> Path | None:
+        """Directory ``@file`` references in this job's cells are relative to."""
+        return self.table_path.parent if self.table_path is not None else None
+
     def to_runner_config(self) -> "RunnerConfig":
         from social_poster import MediumJobConfig, RunnerConfig
 
@@ -286,16 +525,18 @@ class ScheduleJob:
         medium_cfg = MediumJobConfig(
             profile_path=self.resolve_profile_path(),
             profile_name=profile_name,
-            title=self.title or "Untitled",
-            content=self.content or "",
+            # @file cells are read here, in the worker, right before the run
+            title=load_cell(self.title, self.base_dir) or "Untitled",
+            content=load_cell(self.content, self.base_dir),
             schedule_table=str(self.table_path) if self.table_path else None,
             schedule_row=self.row_index,
+            persist_link=False,
         )
         return RunnerConfig(platform="Medium", medium=medium_cfg)
 
     def resolve_profile_path(self) -> str:
         base = Path(CHROME_USER_DATA_DIR).expanduser()
-        profiles_root = Path(r"D:\TOOL\social-poster\profiles")
+        profiles_root = Path(SCHEDULE_PROFILES_ROOT)
         value = (self.profile or "").strip()
         if not value:
             return str(base)
@@ -306,51 +547,239 @@ class ScheduleJob:
             path = profiles_root / path.name
         return str(path)
 
+    @property
+    def profile_key(self) -> str:
+        """Key that identifies the browser profile across groups, ledger and quota."""
+        return self.resolve_profile_path().strip().lower() or "default"
+
 
 def _run_single_job(job: ScheduleJob, show_console: bool = False) -> None:
     from social_poster import run_job_inline
 
-    cfg = job.to_runner_config()
+    try:
+        cfg = job.to_runner_config()
+    except OSError as exc:
+        _log(f"WARN:CONTENT_LOAD_FAILED row={job.row_index} err={exc}")
+        _report_result(job, "", str(exc))
+        return
     console_label = job.profile or job.platform or "job"
-    events = run_job_inline(
-        cfg,
-        open_console=show_console,
-        console_title=f"{console_label.strip() or 'default'}",
-    )
+    journal = _worker_journal()
+    outcome: Dict[str, Any] = {"url": None, "errors": []}
+
+    def _on_event(level: str, message: str) -> None:
+        # handled as the Runner puts it, not after the job returns
+        _log(f"LOG:{level.upper()} {message}")
+        _emit("event", time.time(), job.key, job.profile_key, job.row_index, level, message)
+        if level == "success" and "Medium URL:" in message:
+            outcome["url"] = message.split("Medium URL:", 1)[-1].strip()
+            if journal is not None:
+                # committed as it happens, so a restart knows how far the job got
+                journal.record(job.key, EVENT_PUBLISHED, outcome["url"])
+        elif level == "error":
+            outcome["errors"].append(message)
+        elif level == "timing":
+            step, _, seconds = message.partition(" ")
+            _emit("timing", job.profile_key, step, float(seconds or 0))
+            heartbeat.advance(step)
+            if journal is not None:
+                journal.record(job.key, EVENT_STEP, step)
+        elif level == "browser":
+            address, _, driver_pid = message.partition(" ")
+            heartbeat.attach(address if address != "-" else "", int(driver_pid or 0))
 
     _log(
         f"INFO:LAUNCH_JOB platform={job.platform} time='{job.schedule_time}' title='{_preview(job.title)}'"
     )
-    publish_url: str | None = None
-    for level, message in events:
-        _log(f"LOG:{level.upper()} {message}")
-        if level == "success" and "Medium URL:" in message:
-            publish_url = message.split("Medium URL:", 1)[-1].strip()
-    if publish_url and job.table_path and job.row_index:
+    if journal is not None:
+        journal.record(job.key, EVENT_START)
+    heartbeat = _worker_heartbeat()
+    heartbeat.begin(job.key)
+    started = time.perf_counter()
+    try:
+        run_job_inline(
+            cfg,
+            open_console=show_console,
+            console_title=f"{console_label.strip() or 'default'}",
+            on_event=_on_event,
+            stop_evt=_worker_cancel,
+        )
+    finally:
+        heartbeat.end()
+    elapsed = time.perf_counter() - started
+
+    publish_url: str | None = outcome["url"]
+    if publish_url:
+        # only complete runs say how long a job takes
+        _emit("timing", job.profile_key, STEP_TOTAL, elapsed)
+    error = "; ".join(outcome["errors"]) or ("" if publish_url else "no publish URL")
+    if journal is not None:
+        journal.record(job.key, EVENT_FINISH, publish_url or error)
+    _report_result(job, publish_url or "", error)
+
+
+_journal: tuple[int, JobJournal] | None = None
+_journal_enabled = True
+
+
+def _worker_journal() -> JobJournal | None:
+    """Per-process journal connection (SQLite handles must not cross a fork)."""
+    global _journal
+    if not (SCHEDULE_LEDGER_PATH and _journal_enabled):
+        return None
+    if _journal is None or _journal[0] != os.getpid():
         try:
-            write_link_to_schedule(Path(job.table_path), job.row_index, publish_url)
-            _log(
-                f"INFO:LINK_UPDATE row={job.row_index} url='{publish_url}' table='{job.table_path}'"
-            )
-        except Exception as exc:
-            _log(
-                f"WARN:LINK_UPDATE_FAILED row={job.row_index} table='{job.table_path}' err={exc}"
-            )
+            _journal = (os.getpid(), JobJournal(SCHEDULE_LEDGER_PATH))
+        except Exception as exc:  # pylint: disable=broad-except
+            _log(f"WARN:JOURNAL_OPEN_FAILED err={exc}")
+            return None
+    return _journal[1]
+
+
+_STEP_ORDER = (STEP_LAUNCH, *PUBLISH_STEPS)
+
+
+class _Heartbeat:
+    """Tells the parent every few seconds which job and step this worker is in.
+
+    Beats come from a thread of their own, so a worker whose main thread is
+    blocked in WebDriver keeps beating with a growing step age, and a
+    worker that stops beating altogether is frozen or gone.
+    """
+
+    def __init__(self, interval: float = SCHEDULE_HEARTBEAT_S) -> None:
+        self.interval = max(0.5, interval)
+        self._lock = threading.Lock()
+        self.job_key = ""
+        self.step = "idle"
+        self.since = time.time()
+        self.browser = ""
+        self.driver_pid = 0
+        threading.Thread(target=self._loop, name="heartbeat", daemon=True).start()
+
+    def _set(self, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+        self.beat()
+
+    def begin(self, job_key: str) -> None:
+        self._set(job_key=job_key, step=STEP_LAUNCH, since=time.time(), browser="", driver_pid=0)
+
+    def advance(self, finished_step: str) -> None:
+        # a step is reported when it ends; the worker is now in the one after it
+        idx = _STEP_ORDER.index(finished_step) if finished_step in _STEP_ORDER else -1
+        if 0 <= idx < len(_STEP_ORDER) - 1:
+            self._set(step=_STEP_ORDER[idx + 1], since=time.time())
+        elif idx == len(_STEP_ORDER) - 1:
+            self._set(step="finish", since=time.time())
+
+    def attach(self, browser: str, driver_pid: int) -> None:
+        self._set(browser=browser, driver_pid=driver_pid)
+
+    def end(self) -> None:
+        self._set(job_key="", step="idle", since=time.time(), browser="", driver_pid=0)
+
+    def beat(self) -> None:
+        with self._lock:
+            payload = (os.getpid(), self.job_key, self.step, self.since, self.browser, self.driver_pid)
+        _emit("heartbeat", *payload)
+
+    def _loop(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            if self.job_key:
+                self.beat()
+
+
+_heartbeat: tuple[int, _Heartbeat] | None = None
+
+
+def _worker_heartbeat() -> _Heartbeat:
+    global _heartbeat
+    if _heartbeat is None or _heartbeat[0] != os.getpid():
+        _heartbeat = (os.getpid(), _Heartbeat())
+    return _heartbeat[1]
+
+
+_worker_channel: Any = None
+_worker_cancel: Any = None  # multiprocessing.Event the parent sets to cancel running jobs
+
+
+def _bind_worker_channel(channel: Any, journal: bool = True, cancel: Any = None) -> None:
+    global _worker_channel, _journal_enabled, _worker_cancel
+    _worker_channel = channel
+    _journal_enabled = journal
+    _worker_cancel = cancel
 
 
+def _cancelled() -> bool:
+    return _worker_cancel is not None and _worker_cancel.is_set()
+
+
+def _emit(kind: str, *payload: Any) -> bool:
+    if _worker_channel is None:
+        return False
+    try:
+        _worker_channel.put((kind, *payload))
+    except Exception as exc:  # pragma: no cover - parent went away
+        _log(f"WARN:CHANNEL_PUT_FAILED kind={kind} err={exc}")
+        return False
+    return True
+
+
+def _report_result(job: ScheduleJob, url: str, error: str = "") -> None:
+    status = STATUS_DONE if url else STATUS_FAILED
+    table = str(job.table_path or "")
+    if _emit("result", job.key, table, job.row_index, status, url, error):
+        _log(f"INFO:JOB_RESULT_QUEUED row={job.row_index} status={status} url='{url}' table='{table}'")
+        return
+    if not (url and job.table_path and job.row_index):
+        return
+    try:
+        write_link_to_schedule(Path(table), job.row_index, url)
+        _log(f"INFO:LINK_UPDATE row={job.row_index} url='{url}' table='{table}'")
+    except Exception as exc:
+        _log(f"WARN:LINK_UPDATE_FAILED row={job.row_index} table='{table}' err={exc}")
+
 
 def _group_jobs_by_profile(jobs: List[ScheduleJob]) -> Dict[str, List[ScheduleJob]]:
     grouped: Dict[str, List[ScheduleJob]] = defaultdict(list)
     for job in jobs:
-        resolved = job.resolve_profile_path()
-        key = resolved.strip().lower() or "default"
-        grouped[key].append(job)
+        grouped[job.profile_key].append(job)
     return grouped
 
 
-def _profile_worker(group_id: str, jobs: List[ScheduleJob], show_console: bool) -> None:
+def run_worker(
+    group_id: str,
+    jobs: List[ScheduleJob],
+    show_console: bool,
+    channel: Any = None,
+    cancel: Any = None,
+    journal: bool = True,
+) -> None:
+    """Run one profile group in this (worker) process, one job after another.
+
+    Results and events go to ``channel``; ``cancel`` stops the group before
+    its next job. Without ``journal`` the worker leaves journaling to
+    whoever reads the channel, as the agent coordinator does.
+    """
+    _bind_worker_channel(channel, journal=journal, cancel=cancel)
+    _run_profile_group(group_id, jobs, show_console)
+
+
+def _profile_worker(
+    group_id: str, jobs: List[ScheduleJob], show_console: bool, channel: Any = None, cancel: Any = None
+) -> None:
     _ensure_process_console(group_id, show_console)
-    for job in jobs:
+    run_worker(group_id, jobs, show_console, channel, cancel)
+
+
+def _run_profile_group(group_id: str, jobs: List[ScheduleJob], show_console: bool) -> None:
+    for done, job in enumerate(jobs):
+        if _cancelled():
+            # the rest stay "running"; the dispatcher fails them as cancelled
+            _log(f"WARN:PROFILE_WORKER cancelled profile={group_id} skipped={len(jobs) - done}")
+            return
         _log(
             "INFO:RUN_JOB "
             + f"profile={job.profile or 'N/A'} "
@@ -365,37 +794,827 @@ def _profile_worker(group_id: str, jobs: List[ScheduleJob], show_console: bool)
         _run_single_job(job, show_console=show_console)
     _log(f"INFO:PROFILE_WORKER finished profile={group_id}")
 
-def _dispatch_time_slot(
-    slot_label: str, jobs: List[ScheduleJob], limit: int, show_console: bool
+def _pool_worker_main(
+    worker_id: int, tasks: Any, results: Any, show_console: bool, channel: Any = None, cancel: Any = None
 ) -> None:
-    _log(f"INFO:TIME_SLOT_DISPATCH label={slot_label} jobs={len(jobs)}")
-    grouped = _group_jobs_by_profile(jobs)
-    processes: List[Process] = []
-    for group_id, group_jobs in grouped.items():
+    _ensure_process_console(f"worker-{worker_id}", show_console)
+    _bind_worker_channel(channel, cancel=cancel)
+    started = time.perf_counter()
+    try:
+        import social_poster  # noqa: F401  # warm Selenium/GPM stack once per worker
+    except Exception as exc:
+        _log(f"WARN:POOL_WORKER_PRELOAD_FAILED worker={worker_id} err={exc}")
+    _log(f"INFO:POOL_WORKER_READY worker={worker_id} preload={time.perf_counter() - started:.2f}s")
+    results.put(("ready", worker_id, None, None))
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, group_id, jobs = task
+        results.put(("start", worker_id, task_id, None))
+        try:
+            _run_profile_group(group_id, jobs, show_console)
+        except Exception as exc:  # pylint: disable=broad-except
+            results.put(("error", worker_id, task_id, f"{exc.__class__.__name__}: {exc}"))
+        else:
+            results.put(("done", worker_id, task_id, None))
+    _log(f"INFO:POOL_WORKER_EXIT worker={worker_id}")
+
+
+class WorkerPool:
+    """Fixed set of pre-imported worker processes fed profile groups over a queue.
+
+    Each worker imports ``social_poster`` once at startup, so a slot only pays
+    for the browser work itself. A worker that dies mid-group fails that
+    group's future and is replaced with a fresh one.
+    """
+
+    def __init__(self, size: int, show_console: bool = False, channel: Any = None) -> None:
+        self.size = max(1, size)
+        self.show_console = show_console
+        self.channel = channel
+        self._tasks: Any = None
+        self._results: Any = None
+        self._workers: Dict[int, Any] = {}
+        self._futures: Dict[int, Future] = {}
+        self._running: Dict[int, int] = {}  # worker_id -> task_id
+        self._task_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._collector: threading.Thread | None = None
+        self._closing = False
+        self._cancel: Any = None
+
+    def start(self) -> "WorkerPool":
+        ctx = mp_context()
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._cancel = ctx.Event()
+        for worker_id in range(1, self.size + 1):
+            self._spawn(worker_id)
+        self._collector = threading.Thread(target=self._collect, name="pool-collector", daemon=True)
+        self._collector.start()
+        _log(f"INFO:POOL_START workers={self.size}")
+        return self
+
+    def _spawn(self, worker_id: int) -> None:
+        proc = mp_context().Process(
+            target=_pool_worker_main,
+            args=(worker_id, self._tasks, self._results, self.show_console, self.channel, self._cancel),
+            daemon=True,
+        )
+        proc.start()
+        self._workers[worker_id] = proc
+        _log(f"INFO:POOL_WORKER_SPAWN worker={worker_id} pid={proc.pid}")
+
+    def submit(self, group_id: str, jobs: List[ScheduleJob]) -> Future:
+        if self._tasks is None or self._closing:
+            raise RuntimeError("WorkerPool is not running")
+        future: Future = Future()
+        task_id = next(self._task_ids)
+        with self._lock:
+            self._futures[task_id] = future
+        self._tasks.put((task_id, group_id, jobs))
+        _log(f"INFO:POOL_SUBMIT task={task_id} profile={group_id} jobs={len(jobs)}")
+        return future
+
+    def _collect(self) -> None:
         while True:
-            alive = [p for p in processes if p.is_alive()]
-            if len(alive) < limit:
-                processes = alive
-                break
-            _log(f"INFO:PROFILE_MANAGER waiting for slot alive={len(alive)}/{limit}")
-            time.sleep(5)
-            processes = alive
-        proc = Process(target=_profile_worker, args=(group_id, group_jobs, show_console))
+            try:
+                kind, worker_id, task_id, detail = self._results.get(timeout=POOL_POLL_S)
+            except queue.Empty:
+                if self._closing and not self._futures:
+                    return
+                self._reap_dead_workers()
+                continue
+            except (EOFError, OSError):
+                return
+            if kind == "start":
+                with self._lock:
+                    self._running[worker_id] = task_id
+            elif kind in ("done", "error"):
+                with self._lock:
+                    self._running.pop(worker_id, None)
+                    future = self._futures.pop(task_id, None)
+                if future is None:
+                    continue
+                if kind == "done":
+                    future.set_result(None)
+                else:
+                    _log(f"WARN:POOL_TASK_FAILED task={task_id} worker={worker_id} err={detail}")
+                    future.set_exception(RuntimeError(detail))
+
+    def _reap_dead_workers(self) -> None:
+        for worker_id, proc in list(self._workers.items()):
+            if proc.is_alive() or self._closing:
+                continue
+            with self._lock:
+                task_id = self._running.pop(worker_id, None)
+                future = self._futures.pop(task_id, None) if task_id is not None else None
+            _log(f"WARN:POOL_WORKER_DIED worker={worker_id} pid={proc.pid} exitcode={proc.exitcode} task={task_id}")
+            if future is not None:
+                future.set_exception(RuntimeError(f"worker {worker_id} exited with {proc.exitcode}"))
+            self._spawn(worker_id)
+
+    def cancel(self) -> None:
+        """Have every worker abandon its current job at the next wait and skip queued ones."""
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def shutdown(self, wait: bool = True, timeout: float | None = None) -> None:
+        """Stop the workers once they finish; with ``timeout`` a worker still busy then is killed."""
+        if self._tasks is None:
+            return
+        self._closing = True
+        for _ in self._workers:
+            self._tasks.put(None)
+        if wait:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for worker_id, proc in self._workers.items():
+                proc.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+                if proc.is_alive():
+                    _log(f"WARN:POOL_WORKER_KILL worker={worker_id} pid={proc.pid}")
+                    _stop_process(proc)
+        with self._lock:
+            futures, self._futures = list(self._futures.values()), {}
+            self._running.clear()
+        for future in futures:
+            # the group thread waiting on it must not outlive the pool
+            future.set_exception(RuntimeError("worker pool stopped"))
+        if self._collector is not None:
+            self._collector.join(timeout=POOL_POLL_S * 2)
+        self._tasks = None
+        _log(f"INFO:POOL_STOP workers={len(self._workers)}")
+
+    def __enter__(self) -> "WorkerPool":
+        return self.start()
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.shutdown()
+
+
+def _stop_process(proc: Any, grace: float = KILL_GRACE_S) -> None:
+    proc.terminate()
+    proc.join(grace)
+    if proc.is_alive():
+        proc.kill()
+        proc.join(grace)
+
+
+class SlotQueue:
+    """A budget of slots and its waiters, lowest ``(priority, arrival)`` first.
+
+    Not thread-safe: :class:`PriorityGate` guards it with a condition, the
+    simulator drives it directly on its virtual clock.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self._waiters: list = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._waiters)
+
+    def try_take(self) -> bool:
+        """Take a slot right away if one is free and nobody is waiting for it."""
+        if self.in_use < self.capacity and not self._waiters:
+            self.in_use += 1
+            return True
+        return False
+
+    def push(self, priority: Any = (), item: Any = None) -> tuple:
+        entry = (priority, next(self._seq), item)
+        heapq.heappush(self._waiters, entry)
+        return entry
+
+    def ready(self, entry: tuple | None = None) -> bool:
+        """Whether a slot is free for the head waiter (for ``entry``, if given)."""
+        return (
+            self.in_use < self.capacity
+            and bool(self._waiters)
+            and (entry is None or self._waiters[0] is entry)
+        )
+
+    def take(self) -> Any:
+        """Hand a free slot to the head waiter and return its item."""
+        entry = heapq.heappop(self._waiters)
+        self.in_use += 1
+        return entry[2]
+
+    def release(self) -> None:
+        self.in_use -= 1
+
+
+class PriorityGate:
+    """Counting semaphore that hands a freed slot to the lowest ``(priority, arrival)`` waiter."""
+
+    def __init__(self, value: int) -> None:
+        self._queue = SlotQueue(value)
+        self._cond = threading.Condition()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._queue)
+
+    def acquire(self, priority: Any = (), blocking: bool = True) -> bool:
+        with self._cond:
+            if self._queue.try_take():
+                return True
+            if not blocking:
+                return False
+            entry = self._queue.push(priority)
+            while not self._queue.ready(entry):
+                self._cond.wait()
+            self._queue.take()
+            self._cond.notify_all()
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self._queue.release()
+            self._cond.notify_all()
+
+    def resize(self, capacity: int) -> None:
+        """Change the budget; holders above a lowered budget finish normally."""
+        with self._cond:
+            self._queue.capacity = max(1, capacity)
+            self._cond.notify_all()
+
+
+def _default_job_estimate(job: ScheduleJob) -> float:
+    return SCHEDULE_JOB_ESTIMATE_S
+
+
+def plan_slot(
+    grouped: Dict[str, List[ScheduleJob]],
+    workers: int,
+    estimate: Callable[[ScheduleJob], float] = _default_job_estimate,
+) -> tuple[List[tuple[str, float]], float]:
+    """Order profile groups longest-first and predict the slot's makespan.
+
+    Jobs of a group run back to back, so a group costs the sum of its job
+    estimates. Handing the longest groups to the ``workers`` slots first
+    (LPT) keeps one long profile from starting last and stretching the slot.
+    """
+    costs = sorted(
+        ((group_id, sum(estimate(job) for job in jobs)) for group_id, jobs in grouped.items()),
+        key=lambda item: -item[1],
+    )
+    finish = [0.0] * min(max(1, workers), len(costs))
+    for _group_id, cost in costs:
+        heapq.heappush(finish, heapq.heappop(finish) + cost)
+    return costs, max(finish, default=0.0)
+
+
+class Admission(NamedTuple):
+    admitted: List[ScheduleJob]
+    deferred: Dict[float, List[ScheduleJob]]  # next free time -> jobs held until then
+    duplicates: List[tuple[ScheduleJob, str, str]]  # (job, other job key, its url)
+
+
+def admit_jobs(ledger: JobLedger, jobs: List[ScheduleJob]) -> Admission:
+    """Claim ``jobs`` in the ledger, deferring those over the publish quota.
+
+    Claimed jobs count against the quota right away, so concurrent slots
+    cannot overbook a profile. Jobs whose content is already published or
+    being published for the same profile are settled as duplicates instead.
+    Callers serialise admissions; the simulator uses this with a ledger on
+    its virtual clock.
+    """
+    admitted: List[ScheduleJob] = []
+    deferred: Dict[float, List[ScheduleJob]] = defaultdict(list)
+    duplicates: List[tuple[ScheduleJob, str, str]] = []
+    for job in jobs:
+        verdict, other, url = ledger.check_fingerprint(job.key, job.fingerprint)
+        if verdict != VERDICT_OWN:
+            if ledger.statuses([job.key]).get(job.key) == STATUS_PENDING:
+                ledger.mark_duplicate(job.key, other, url)
+                duplicates.append((job, other, url))
+            continue
+        if job.platform.lower() == "medium":
+            _used, next_free = ledger.quota_state(job.profile_key)
+            if next_free is not None:
+                deferred[next_free].append(job)
+                continue
+        if ledger.claim([job.key]):
+            admitted.append(job)
+    for next_free, held in deferred.items():
+        ledger.defer([job.key for job in held], next_free)
+    return Admission(admitted, dict(deferred), duplicates)
+
+
+class SlotDispatcher:
+    """Runs time slots against one shared concurrency budget.
+
+    ``run_slot`` blocks until every profile group of the slot is finished;
+    ``fire`` runs the slot on its own thread so the next slot can start on
+    time while earlier browsers are still open. Either way a profile never
+    runs in two groups at once and at most ``limit`` groups are live.
+    Waiting groups get the next free slot by slot order, then longest first.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        show_console: bool,
+        pool: WorkerPool | None = None,
+        channel: Any = None,
+        ledger: JobLedger | None = None,
+        on_defer: Callable[[ScheduleJob, datetime], Any] | None = None,
+        estimate: Callable[[ScheduleJob], float] = _default_job_estimate,
+        on_failure: Callable[[str, str], Any] | None = None,
+        on_duplicate: Callable[[ScheduleJob, str], Any] | None = None,
+        sync: Callable[[], Any] | None = None,
+    ) -> None:
+        self.limit = max(1, limit)
+        self.show_console = show_console
+        self.pool = pool
+        self.channel = channel
+        self.ledger = ledger
+        self.on_defer = on_defer
+        self.estimate = estimate
+        self.on_failure = on_failure
+        self.on_duplicate = on_duplicate
+        self.sync = sync
+        self._admission = threading.Lock()
+        self._gate = PriorityGate(self.limit)
+        self._profile_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+        self._active = 0
+        self._active_guard = threading.Lock()
+        # slots fired and groups started that have not finished; join() waits on this,
+        # not on Thread.join, which an interrupt can leave reporting a live thread as done
+        self._outstanding = 0
+        self._idle = threading.Condition(self._active_guard)
+        self._procs: set = set()  # per-group worker processes that are running
+        self._cancel = mp_context().Event()
+
+    def cancel(self) -> None:
+        """Cancel running groups within about a second and start no new ones."""
+        self._cancel.set()
+        if self.pool is not None:
+            self.pool.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._gate.resize(self.limit)
+
+    def load(self) -> tuple[int, int, int]:
+        """``(limit, live groups, groups waiting for a slot)``."""
+        return self.limit, self._active, self._gate.waiting
+
+    def fire(self, label: str, jobs: List[ScheduleJob], target: datetime | None = None) -> threading.Thread:
+        thread = threading.Thread(
+            target=self._run_fired,
+            args=(label, jobs, target),
+            name=f"slot-{label}",
+            daemon=True,
+        )
+        self._started(1)
+        thread.start()
+        return thread
+
+    def _run_fired(self, label: str, jobs: List[ScheduleJob], target: datetime | None) -> None:
+        try:
+            self.run_slot(label, jobs, target)
+        finally:
+            self._finished()
+
+    def _started(self, count: int) -> None:
+        with self._idle:
+            self._outstanding += count
+
+    def _finished(self) -> None:
+        with self._idle:
+            self._outstanding -= 1
+            if not self._outstanding:
+                self._idle.notify_all()
+
+    def terminate(self) -> None:
+        """Kill the per-group worker processes that ignored a cancel."""
+        with self._active_guard:
+            procs = list(self._procs)
+        for proc in procs:
+            _log(f"WARN:PROFILE_PROCESS_KILL pid={proc.pid}")
+            _stop_process(proc)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until every fired slot and started group is finished; False on timeout.
+
+        Also covers groups of a blocking ``run_slot`` that was interrupted
+        while they still run.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._outstanding, timeout)
+
+    def run_slot(self, label: str, jobs: List[ScheduleJob], target: datetime | None = None) -> None:
+        fired = datetime.now()
+        lateness = (fired - target).total_seconds() if target else 0.0
+        _log(f"INFO:TIME_SLOT_DISPATCH label={label} jobs={len(jobs)} lateness={lateness:+.2f}s")
+        if self.ledger is not None:
+            jobs = self._admit(label, jobs)
+        grouped = _group_jobs_by_profile(jobs)
+        order, makespan = plan_slot(grouped, self.limit, self.estimate)
+        if order:
+            eta = datetime.fromtimestamp(fired.timestamp() + makespan)
+            _log(
+                f"INFO:SLOT_PLAN label={label} groups={len(order)} workers={self.limit} busy={self._active} "
+                f"predicted={makespan:.0f}s eta={eta:%H:%M:%S} "
+                f"order=[{', '.join(f'{Path(gid).name}:{cost:.0f}s' for gid, cost in order)}]"
+            )
+        start_lateness: Dict[str, float] = {}
+        threads = [
+            threading.Thread(
+                target=self._run_group,
+                args=(label, target or fired, group_id, grouped[group_id], start_lateness, (fired, -cost)),
+                name=f"group-{label}-{idx}",
+                daemon=True,
+            )
+            for idx, (group_id, cost) in enumerate(order, start=1)
+        ]
+        self._started(len(threads))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        worst = max(start_lateness.values(), default=0.0)
+        elapsed = (datetime.now() - fired).total_seconds()
+        _log(
+            f"INFO:TIME_SLOT_DONE label={label} groups={len(grouped)} elapsed={elapsed:.1f}s "
+            f"predicted={makespan:.0f}s fire_lateness={lateness:+.2f}s max_start_lateness={worst:+.2f}s"
+        )
+
+    def _admit(self, label: str, jobs: List[ScheduleJob]) -> List[ScheduleJob]:
+        """Admit the slot's jobs before any browser starts (see :func:`admit_jobs`)."""
+        with self._admission:
+            admitted, deferred, duplicates = admit_jobs(self.ledger, jobs)
+        for job, other, url in duplicates:
+            _log(
+                f"INFO:DUPLICATE_CONTENT label={label} row={job.row_index} profile={job.profile or 'N/A'} "
+                f"title='{_preview(job.title)}' of={other} url='{url or 'pending'}'"
+            )
+            if url and self.on_duplicate is not None:
+                self.on_duplicate(job, url)
+        held_count = sum(len(held) for held in deferred.values()) + len(duplicates)
+        if len(admitted) + held_count < len(jobs):
+            _log(
+                f"INFO:LEDGER_SKIP label={label} skipped={len(jobs) - len(admitted) - held_count} reason=not_pending"
+            )
+        for next_free, held in deferred.items():
+            _defer_jobs(held, datetime.fromtimestamp(next_free), self.on_defer, label)
+        return admitted
+
+    def _profile_lock(self, group_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._profile_locks[group_id]
+
+    def _run_group(
+        self,
+        label: str,
+        target: datetime,
+        group_id: str,
+        group_jobs: List[ScheduleJob],
+        start_lateness: Dict[str, float],
+        priority: Any = (),
+    ) -> None:
+        try:
+            with self._profile_lock(group_id):
+                if not self._gate.acquire(priority, blocking=False):
+                    _log(f"INFO:PROFILE_MANAGER waiting for slot alive={self._active}/{self.limit} label={label}")
+                    self._gate.acquire(priority)
+                with self._active_guard:
+                    self._active += 1
+                try:
+                    start_lateness[group_id] = (datetime.now() - target).total_seconds()
+                    self._execute(label, group_id, group_jobs, start_lateness[group_id])
+                finally:
+                    with self._active_guard:
+                        self._active -= 1
+                    self._gate.release()
+        finally:
+            self._finished()
+
+    def _execute(self, label: str, group_id: str, group_jobs: List[ScheduleJob], lateness: float) -> None:
+        try:
+            reason = "" if self.cancelled else self._run_group_jobs(label, group_id, group_jobs, lateness)
+        except Exception as exc:  # pylint: disable=broad-except
+            reason = str(exc)
+            _log(f"WARN:PROFILE_GROUP_FAILED label={label} profile={group_id} err={exc}")
+        if self.ledger is None:
+            return
+        # Jobs the worker never reported on (crash, kill, cancel) must not stay "running".
+        reason = reason or (CANCELLED_MESSAGE if self.cancelled else "worker finished without result")
+        if self.sync is not None:
+            # its result may still sit behind streamed events in the channel
+            self.sync()
+        if self.on_failure is None:
+            self.ledger.fail_running([job.key for job in group_jobs], reason)
+            return
+        statuses = self.ledger.statuses([job.key for job in group_jobs])
+        running = [job for job in group_jobs if statuses.get(job.key) == STATUS_RUNNING]
+        started = self.ledger.started([job.key for job in running])
+        if started and not self.cancelled:
+            # the group died in a job it had started; the ones queued behind it
+            # never ran, so they go back without spending a retry
+            for job in running:
+                if job.key in started:
+                    continue
+                self.ledger.record_cancelled(job.key)
+                _log(f"INFO:JOB_REQUEUED key={job.key} row={job.row_index} reason=not_started")
+                if self.on_defer is not None:
+                    self.on_defer(job, datetime.now())
+            running = [job for job in running if job.key in started]
+        for job in running:
+            self.on_failure(job.key, reason)
+
+    def _run_group_jobs(self, label: str, group_id: str, group_jobs: List[ScheduleJob], lateness: float) -> str:
+        if self.pool is not None:
+            self.pool.submit(group_id, group_jobs).result()
+            return ""
+        proc = mp_context().Process(
+            target=_profile_worker,
+            args=(group_id, group_jobs, self.show_console, self.channel, self._cancel),
+            daemon=True,
+        )
         proc.start()
-        _log(f"INFO:PROFILE_PROCESS start profile={group_id} pid={proc.pid} jobs={len(group_jobs)}")
-        processes.append(proc)
+        with self._active_guard:
+            self._procs.add(proc)
+        _log(
+            f"INFO:PROFILE_PROCESS start profile={group_id} pid={proc.pid} jobs={len(group_jobs)} "
+            f"label={label} lateness={lateness:+.2f}s"
+        )
+        try:
+            proc.join()
+        finally:
+            with self._active_guard:
+                self._procs.discard(proc)
+        _log(f"INFO:PROFILE_PROCESS finished pid={proc.pid} exitcode={proc.exitcode}")
+        return f"worker exited with {proc.exitcode}" if proc.exitcode else ""
+
+
+def _defer_jobs(
+    jobs: List[ScheduleJob],
+    until: datetime,
+    on_defer: Callable[[ScheduleJob, datetime], Any] | None,
+    label: str = "",
+) -> None:
+    for job in jobs:
+        _log(
+            f"INFO:QUOTA_DEFER label={label} profile={job.profile or 'N/A'} row={job.row_index} "
+            f"title='{_preview(job.title)}' until={until:%Y-%m-%d %H:%M:%S}"
+        )
+        if on_defer is not None:
+            on_defer(job, until)
+
+
+def _dispatch_time_slot(
+    slot_label: str,
+    jobs: List[ScheduleJob],
+    limit: int,
+    show_console: bool,
+    pool: WorkerPool | None = None,
+) -> None:
+    SlotDispatcher(limit, show_console, pool).run_slot(slot_label, jobs)
+
+
+class WakeupStats:
+    """Lateness of timer wakeups (actual fire time minus deadline)."""
+
+    def __init__(self, samples: int = TIMER_METRIC_SAMPLES) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self._recent: List[float] = []
+        self._samples = samples
+
+    def record(self, lateness: float) -> None:
+        self.count += 1
+        self.total += lateness
+        self.worst = max(self.worst, lateness)
+        if len(self._recent) >= self._samples:
+            self._recent[self.count % self._samples] = lateness
+        else:
+            self._recent.append(lateness)
+
+    def percentile(self, pct: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[idx]
+
+    def summary(self) -> str:
+        mean = self.total / self.count if self.count else 0.0
+        return (
+            f"wakeups={self.count} mean={mean * 1000:.1f}ms p50={self.percentile(50) * 1000:.1f}ms "
+            f"p95={self.percentile(95) * 1000:.1f}ms p99={self.percentile(99) * 1000:.1f}ms "
+            f"max={self.worst * 1000:.1f}ms"
+        )
+
+
+class TimerEngine:
+    """Single-threaded timer loop over a binary heap keyed by monotonic deadlines.
+
+    ``schedule_at`` and ``reschedule`` are O(log n), ``cancel`` is O(1) with lazy
+    removal from the heap. Timers can be added from any thread while ``run`` is
+    blocked; the loop sleeps on a condition until the earliest deadline instead
+    of polling, so tens of thousands of pending timers cost one thread.
+    """
+
+    _DEADLINE, _SEQ, _ID, _CALLBACK, _ARGS = range(5)
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.stats = WakeupStats()
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._cancelled = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def deadline_for(self, target: datetime) -> float:
+        return self.clock() + (target - datetime.now()).total_seconds()
+
+    def schedule_at(
+        self,
+        deadline: float,
+        callback: Callable[..., Any],
+        *args: Any,
+        timer_id: Hashable | None = None,
+    ) -> Hashable:
+        with self._cond:
+            seq = next(self._seq)
+            timer_id = seq if timer_id is None else timer_id
+            if timer_id in self._entries:
+                self._drop(timer_id)
+            self._push([deadline, seq, timer_id, callback, args])
+        return timer_id
+
+    def _push(self, entry: list) -> None:
+        # caller holds self._cond
+        self._entries[entry[self._ID]] = entry
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._cond.notify()
+
+    def schedule_in(self, delay: float, callback: Callable[..., Any], *args: Any, timer_id: Hashable | None = None) -> Hashable:
+        return self.schedule_at(self.clock() + max(0.0, delay), callback, *args, timer_id=timer_id)
+
+    def cancel(self, timer_id: Hashable) -> bool:
+        with self._cond:
+            return self._drop(timer_id)
+
+    def reschedule(self, timer_id: Hashable, deadline: float) -> bool:
+        """Move a pending timer; False, and nothing re-armed, once it has fired."""
+        with self._cond:
+            entry = self._entries.get(timer_id)
+            if entry is None:
+                return False
+            callback, args = entry[self._CALLBACK], entry[self._ARGS]
+            self._drop(timer_id)
+            self._push([deadline, next(self._seq), timer_id, callback, args])
+        return True
+
+    def _drop(self, timer_id: Hashable) -> bool:
+        entry = self._entries.pop(timer_id, None)
+        if entry is None:
+            return False
+        entry[self._CALLBACK] = None
+        self._cancelled += 1
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [item for item in self._heap if item[self._CALLBACK] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+        return True
+
+    def _pop_due(self, until_idle: bool) -> list | None:
+        with self._cond:
+            while not self._stopped:
+                while self._heap and self._heap[0][self._CALLBACK] is None:
+                    heapq.heappop(self._heap)
+                    self._cancelled -= 1
+                if not self._heap:
+                    if until_idle:
+                        return None
+                    self._cond.wait()
+                    continue
+                entry = self._heap[0]
+                remaining = entry[self._DEADLINE] - self.clock()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                self._entries.pop(entry[self._ID], None)
+                return entry
+            return None
+
+    def run(self, until_idle: bool = True) -> None:
+        while True:
+            entry = self._pop_due(until_idle)
+            if entry is None:
+                return
+            self.stats.record(max(0.0, self.clock() - entry[self._DEADLINE]))
+            try:
+                entry[self._CALLBACK](*entry[self._ARGS])
+            except Exception as exc:  # pylint: disable=broad-except
+                _log(f"WARN:TIMER_CALLBACK_FAILED timer={entry[self._ID]} err={exc}")
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
 
-    for proc in processes:
-        proc.join()
-        _log(f"INFO:PROFILE_PROCESS finished pid={proc.pid}")
+class ScheduleTimeline:
+    """Maps jobs onto one engine timer per target time (a slot).
 
+    Jobs can be added, cancelled or moved while the engine is running; a
+    slot's timer is cancelled once its last job is removed.
+    """
 
-def _group_jobs_by_time(jobs: List[ScheduleJob]) -> tuple[List[ScheduleJob], Dict[datetime, List[ScheduleJob]]]:
+    def __init__(self, engine: TimerEngine, on_fire: Callable[[str, List[ScheduleJob], datetime], Any]) -> None:
+        self.engine = engine
+        self.on_fire = on_fire
+        self._slots: Dict[datetime, Dict[str, ScheduleJob]] = {}
+        self._job_slot: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._job_slot)
+
+    def __contains__(self, job_key: str) -> bool:
+        return job_key in self._job_slot
+
+    def add(self, job: ScheduleJob, target: datetime) -> None:
+        with self._lock:
+            self._add(job, target)
+
+    def _add(self, job: ScheduleJob, target: datetime) -> None:
+        # caller holds self._lock
+        self._remove(job.key)
+        slot = self._slots.get(target)
+        if slot is None:
+            slot = self._slots[target] = {}
+            self.engine.schedule_at(self.engine.deadline_for(target), self._fire, target, timer_id=("slot", target))
+        slot[job.key] = job
+        self._job_slot[job.key] = target
+
+    def cancel(self, job_key: str) -> bool:
+        with self._lock:
+            return self._remove(job_key) is not None
+
+    def reschedule(self, job_key: str, target: datetime) -> bool:
+        """Move a waiting job; False, and nothing re-armed, once its slot has fired."""
+        with self._lock:
+            current = self._job_slot.get(job_key)
+            if current is None:
+                return False
+            self._add(self._slots[current][job_key], target)
+        return True
+
+    def _remove(self, job_key: str) -> ScheduleJob | None:
+        target = self._job_slot.pop(job_key, None)
+        if target is None:
+            return None
+        slot = self._slots[target]
+        job = slot.pop(job_key)
+        if not slot:
+            del self._slots[target]
+            self.engine.cancel(("slot", target))
+        return job
+
+    def _fire(self, target: datetime) -> None:
+        with self._lock:
+            slot = self._slots.pop(target, {})
+            for job_key in slot:
+                self._job_slot.pop(job_key, None)
+        if slot:
+            self.on_fire(target.strftime("%Y-%m-%d %H:%M:%S"), list(slot.values()), target)
+
+
+def _group_jobs_by_time(
+    jobs: List[ScheduleJob],
+    targets: Dict[str, datetime | None],
+    now: datetime | None = None,
+) -> tuple[List[ScheduleJob], Dict[datetime, List[ScheduleJob]]]:
     immediate: List[ScheduleJob] = []
     scheduled: Dict[datetime, List[ScheduleJob]] = defaultdict(list)
-    now = datetime.now()
+    now = now or datetime.now()
     for job in jobs:
-        target = _parse_schedule_timestamp(job.schedule_time, job.schedule_date)
+        target = targets.get(job.key)
         if target is None or target <= now:
             immediate.append(job)
         else:
@@ -434,10 +1653,27 @@ def _ensure_process_console(group_id: str, enabled: bool) -> None:
 
 
 def write_link_to_schedule(table: Path, row_index: int, url: str) -> None:
+    write_links_to_schedule(table, {row_index: url})
+
+
+def _atomic_replace(table: Path, write: Callable[[Path], None]) -> None:
+    tmp = table.with_name(f".{table.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, table)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def write_links_to_schedule(table: Path, updates: Dict[int, str]) -> None:
+    """Write many ``row -> url`` links into ``table`` with one atomic rewrite."""
     table = table.expanduser()
-    if row_index <= 1:
+    updates = {row: url for row, url in updates.items() if row > 1}
+    if not updates:
         return
     if table.suffix.lower() in (".xlsx", ".xls"):
+        load_workbook = _load_workbook_fn()
         if load_workbook is None:
             raise RuntimeError("openpyxl is required to update Excel schedules")
         wb = load_workbook(table)
@@ -451,8 +1687,9 @@ def write_link_to_schedule(table: Path, row_index: int, url: str) -> None:
         if link_col is None:
             link_col = len(headers) + 1
             ws.cell(row=1, column=link_col, value="link")
-        ws.cell(row=row_index, column=link_col, value=url)
-        wb.save(table)
+        for row_index, url in updates.items():
+            ws.cell(row=row_index, column=link_col, value=url)
+        _atomic_replace(table, lambda tmp: wb.save(tmp))
         return
 
     if not table.exists():
@@ -470,54 +1707,914 @@ def write_link_to_schedule(table: Path, row_index: int, url: str) -> None:
         link_idx = len(header) - 1
         for row in rows[1:]:
             row.extend([""] * (len(header) - len(row)))
-    while len(rows) < row_index:
+    while len(rows) < max(updates):
         rows.append([""] * len(header))
-    row = rows[row_index - 1]
-    if len(row) < len(header):
-        row.extend([""] * (len(header) - len(row)))
-    row[link_idx] = url
-    with table.open("w", newline="", encoding="utf-8-sig") as fh:
-        writer = csv.writer(fh)
-        writer.writerows(rows)
+    for row_index, url in updates.items():
+        row = rows[row_index - 1]
+        if len(row) < len(header):
+            row.extend([""] * (len(header) - len(row)))
+        row[link_idx] = url
+
+    def _write_csv(tmp: Path) -> None:
+        with tmp.open("w", newline="", encoding="utf-8-sig") as fh:
+            csv.writer(fh).writerows(rows)
+
+    _atomic_replace(table, _write_csv)
+
+
+class LinkWriteBack:
+    """Single writer that coalesces published links into batched table rewrites.
+
+    Workers hand links over through :class:`EventRelay`; every
+    ``flush_interval`` seconds the pending rows of each table are applied in
+    one atomic rewrite. A row is written at most once per run: repeats of the
+    same row are dropped, failed flushes stay pending for the next tick.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = SCHEDULE_LINK_FLUSH_S,
+        on_written: Callable[[Path, List[int]], Any] | None = None,
+    ) -> None:
+        self.flush_interval = max(0.05, flush_interval)
+        self.on_written = on_written
+        self._pending: Dict[Path, Dict[int, str]] = defaultdict(dict)
+        self._written: Dict[tuple[Path, int], str] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "LinkWriteBack":
+        self._thread = threading.Thread(target=self._loop, name="link-writeback", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, table: Path | str, row_index: int, url: str) -> bool:
+        table = Path(table).expanduser()
+        key = (table, row_index)
+        with self._lock:
+            if key in self._written or row_index in self._pending.get(table, {}):
+                previous = self._written.get(key) or self._pending[table][row_index]
+                if previous != url:
+                    _log(f"WARN:LINK_DUPLICATE row={row_index} table='{table}' kept='{previous}' dropped='{url}'")
+                return False
+            self._pending[table][row_index] = url
+        return True
+
+    def forget(self, table: Path | str) -> None:
+        """Drop the written-row memory of ``table`` after it was reloaded and renumbered."""
+        table = Path(table).expanduser()
+        with self._lock:
+            for key in [key for key in self._written if key[0] == table]:
+                del self._written[key]
+
+    def _loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            batches = {table: dict(rows) for table, rows in self._pending.items() if rows}
+        written = 0
+        for table, updates in batches.items():
+            try:
+                write_links_to_schedule(table, updates)
+            except Exception as exc:
+                _log(f"WARN:LINK_UPDATE_FAILED table='{table}' rows={sorted(updates)} err={exc}")
+                continue
+            with self._lock:
+                for row_index, url in updates.items():
+                    self._pending[table].pop(row_index, None)
+                    self._written[(table, row_index)] = url
+            written += len(updates)
+            if self.on_written is not None:
+                try:
+                    self.on_written(table, sorted(updates))
+                except Exception as exc:  # pylint: disable=broad-except
+                    _log(f"WARN:LINK_WRITTEN_HOOK_FAILED table='{table}' err={exc}")
+            for row_index, url in sorted(updates.items()):
+                _log(f"INFO:LINK_UPDATE row={row_index} url='{url}' table='{table}'")
+            _log(f"INFO:LINK_FLUSH table='{table}' rows={len(updates)}")
+        return written
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+class JobEvent(NamedTuple):
+    """One ``Runner`` event, streamed from the worker while the job runs."""
+
+    ts: float
+    job_key: str
+    profile: str
+    row_index: int
+    level: str
+    message: str
+
+
+class EventRelay:
+    """Parent end of the worker -> scheduler channel.
+
+    Workers call :func:`_emit` with ``(kind, *payload)`` tuples; a drain
+    thread hands each message to the handler registered for its kind.
+    """
+
+    def __init__(self) -> None:
+        self.queue: Any = mp_context().Queue()
+        self._handlers: Dict[str, Callable[..., Any]] = {"sync": self._release}
+        self._thread: threading.Thread | None = None
+        self._barriers: Dict[int, threading.Event] = {}
+        self._tokens = itertools.count()
+
+    def on(self, kind: str, handler: Callable[..., Any]) -> "EventRelay":
+        self._handlers[kind] = handler
+        return self
+
+    def start(self) -> "EventRelay":
+        self._thread = threading.Thread(target=self._drain, name="event-relay", daemon=True)
+        self._thread.start()
+        return self
+
+    def sync(self, timeout: float = 5.0) -> bool:
+        """Wait until every message already in the queue has been handled."""
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        token = next(self._tokens)
+        barrier = self._barriers[token] = threading.Event()
+        self.queue.put(("sync", token))
+        try:
+            return barrier.wait(timeout)
+        finally:
+            self._barriers.pop(token, None)
+
+    def _release(self, token: int) -> None:
+        barrier = self._barriers.get(token)
+        if barrier is not None:
+            barrier.set()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                message = self.queue.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            kind, *payload = message
+            handler = self._handlers.get(kind)
+            if handler is None:
+                continue
+            try:
+                handler(*payload)
+            except Exception as exc:  # pylint: disable=broad-except
+                _log(f"WARN:EVENT_HANDLER_FAILED kind={kind} err={exc}")
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+
+
+class ScheduleWatcher:
+    """Notices edits to schedule tables by mtime/size, confirmed by a content hash.
+
+    ``source`` is asked for the current file list on every poll, so tables
+    added to or removed from a watched directory count as changes too.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], List[Path]],
+        on_change: Callable[[], Any],
+        interval: float = SCHEDULE_WATCH_INTERVAL_S,
+    ) -> None:
+        self.source = source
+        self.on_change = on_change
+        self.interval = max(0.2, interval)
+        self._signature: tuple | None = None
+        self._digest: str | None = None
+        self._settling: tuple | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.check(notify=False)
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        digest = hashlib.sha256()
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _stat_all(self) -> tuple:
+        entries = []
+        for path in self.source():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    def check(self, notify: bool = True) -> bool:
+        signature = self._stat_all()
+        if signature == self._signature:
+            return False
+        if notify and signature != self._settling:
+            # wait one more poll so a save still in progress is not read half-written
+            self._settling = signature
+            return False
+        self._signature = signature
+        digest = hashlib.sha256()
+        for name, _mtime, _size in signature:
+            try:
+                digest.update(f"{name}\0{self._file_digest(Path(name))}\0".encode("utf-8"))
+            except OSError:
+                continue
+        if digest.hexdigest() == self._digest:
+            return False
+        self._digest = digest.hexdigest()
+        if notify:
+            _log(f"INFO:SCHEDULE_CHANGED tables={len(signature)} sha256={self._digest[:12]}")
+            try:
+                self.on_change()
+            except Exception as exc:  # pylint: disable=broad-except
+                _log(f"WARN:SCHEDULE_RELOAD_FAILED err={exc}")
+        return True
+
+    def start(self) -> "ScheduleWatcher":
+        self._thread = threading.Thread(target=self._loop, name="schedule-watch", daemon=True)
+        self._thread.start()
+        _log(f"INFO:SCHEDULE_WATCH tables={len(self._signature or ())} interval={self.interval}s")
+        return self
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def resolve_tables(source: Path | str) -> List[Path]:
+    """Expand a table path, a directory of tables or a glob into schedule files.
+
+    Office lock files (``~$...``) and hidden files are left out; a plain
+    file path is returned as is even if it does not exist yet.
+    """
+    text = os.path.expanduser(str(source))
+    if any(ch in text for ch in "*?["):
+        candidates = [Path(name) for name in glob.glob(text, recursive=True)]
+    elif Path(text).is_dir():
+        candidates = list(Path(text).iterdir())
+    else:
+        return [Path(text)]
+    return sorted(
+        path
+        for path in candidates
+        if path.is_file() and path.suffix.lower() in TABLE_SUFFIXES and not path.name.startswith(("~$", "."))
+    )
+
+
+def _read_table(
+    path: Path, now: datetime, include_done: bool = False
+) -> tuple[List[ScheduleJob], Dict[str, datetime | None]]:
+    """Stream one table and parse its timestamps with formats inferred for that table."""
+    jobs = list(iter_schedule_jobs(path, include_done=include_done))
+    time_parser = ScheduleTimeParser.infer(jobs, now=now)
+    targets, invalid = time_parser.parse_jobs(jobs)
+    if invalid:
+        skipped = {job.key for job, _reason in invalid}
+        jobs = [job for job in jobs if job.key not in skipped]
+    return jobs, targets
+
+
+class ScheduleSession:
+    """One scheduler run: ingestion, ledger, timeline, dispatch, write-back.
+
+    ``source`` is a table, a directory of tables or a glob; all tables share
+    one timeline and one worker budget, and links go back to each job's own
+    file. ``plan`` loads them once; in watch mode ``reload`` re-reads them
+    after every edit and only adds, cancels or re-times the jobs whose rows
+    changed.
+    """
+
+    def __init__(
+        self,
+        source: Path | str,
+        limit: int,
+        show_console: bool,
+        daemon: bool,
+        overlap: bool,
+        adaptive: bool = False,
+        on_event: Callable[[JobEvent], Any] | None = None,
+        serve: str = "",
+    ) -> None:
+        self.source = source
+        self.overlap = overlap
+        self.ledger = JobLedger(SCHEDULE_LEDGER_PATH) if SCHEDULE_LEDGER_PATH else None
+        self.writer = LinkWriteBack(on_written=self._on_written)
+        self.durations = DurationModel(self.ledger)
+        self.relay = (
+            EventRelay()
+            .on("result", self._on_result)
+            .on("timing", self.durations.record)
+            .on("event", self._on_event)
+        )
+        self._listeners: List[Callable[[JobEvent], Any]] = [on_event] if on_event else []
+        self.pool = WorkerPool(limit, show_console, self.relay.queue) if daemon else None
+        if serve:
+            if self.ledger is None:
+                raise ValueError("serving remote agents needs the ledger (SCHEDULE_LEDGER_PATH)")
+            from job_coordinator import AgentHub
+
+            # remote agents take the place of local workers; the budget follows the slots they advertise
+            self.pool = AgentHub(serve, self.relay.queue, self.ledger)
+            limit = 1
+        self.dispatcher = SlotDispatcher(
+            limit,
+            show_console,
+            self.pool,
+            self.relay.queue,
+            self.ledger,
+            on_defer=self.defer,
+            estimate=self.durations.estimate_job,
+            on_failure=self._handle_failure,
+            on_duplicate=self._link_duplicate,
+            sync=self.relay.sync,
+        )
+        # the user's limit stays the ceiling; adapting only backs off below it under load.
+        # This host's load says nothing about remote agents.
+        self.governor = (
+            ConcurrencyGovernor(
+                self.dispatcher.set_limit,
+                self.dispatcher.load,
+                ConcurrencyController(upper=min(limit, SCHEDULE_CONCURRENCY_MAX)),
+            )
+            if adaptive and not serve
+            else None
+        )
+        if serve:
+            self.pool.on_capacity = self.dispatcher.set_limit
+        # job key -> step it hung in; the job's failure result arrives once the watchdog killed its browser
+        self._stalled: Dict[str, str] = {}
+        self.watchdog = Watchdog(self._on_stall) if SCHEDULE_WATCHDOG else None
+        if self.watchdog is not None:
+            self.relay.on("heartbeat", self.watchdog.beat)
+        # remote agents run their own watchdog and report stalls
+        self.relay.on("stall", self._on_stall)
+        self.engine = TimerEngine()
+        self.timeline = ScheduleTimeline(self.engine, self._run_slot)
+        self.known: Dict[str, tuple[ScheduleJob, datetime | None]] = {}
+        self._rows: Dict[str, int] = {}
+        self._reload_lock = threading.Lock()
+
+    def start(self) -> "ScheduleSession":
+        # an opted-in forkserver imports the browser stack while the tables load
+        mp_context(warm=True)
+        self.writer.start()
+        self.relay.start()
+        if self.pool is not None:
+            self.pool.start()
+        if self.governor is not None:
+            self.governor.start()
+        if self.watchdog is not None:
+            self.watchdog.start()
+        return self
+
+    def close(self) -> None:
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.governor is not None:
+            self.governor.stop()
+        if self.pool is not None:
+            self.pool.shutdown(timeout=SCHEDULE_SHUTDOWN_TIMEOUT_S)
+        self.relay.close()
+        self.writer.close()
+        if self.ledger is not None:
+            _log(f"INFO:LEDGER_STATUS {self.ledger.counts()}")
+            self.ledger.close()
+
+    def _run_slot(self, label: str, jobs: List[ScheduleJob], target: datetime | None = None) -> Any:
+        if self.overlap:
+            return self.dispatcher.fire(label, jobs, target)
+        return self.dispatcher.run_slot(label, jobs, target)
+
+    def _on_written(self, path: Path, rows: List[int]) -> None:
+        if self.ledger is not None:
+            self.ledger.mark_written(str(path), rows)
+
+    def cancel(self) -> None:
+        """Stop firing slots and cancel the running jobs; they go back to pending."""
+        self.engine.stop()
+        self.dispatcher.cancel()
+
+    def defer(self, job: ScheduleJob, until: datetime) -> None:
+        """Move ``job`` to a later time on the live timeline."""
+        self.known[job.key] = (job, until)
+        self.timeline.add(job, until)
+
+    def subscribe(self, listener: Callable[[JobEvent], Any]) -> None:
+        """Have ``listener`` called with every :class:`JobEvent` as workers stream it."""
+        self._listeners.append(listener)
+
+    def _on_event(self, *payload: Any) -> None:
+        event = JobEvent(*payload)
+        if event.level == "success" and "Medium URL:" in event.message:
+            _log(f"INFO:JOB_PUBLISHED row={event.row_index} key={event.job_key} {event.message}")
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as exc:  # pylint: disable=broad-except
+                _log(f"WARN:EVENT_LISTENER_FAILED err={exc}")
+
+    def _on_result(self, job_key: str, table_path: str, row_index: int, status: str, url: str, error: str) -> None:
+        if self.ledger is not None:
+            if url:
+                self._stalled.pop(job_key, None)
+                self.ledger.record_result(job_key, status, url, error)
+                self._settle_duplicates(job_key)
+            else:
+                self._handle_failure(job_key, error)
+        if url:
+            # the row may have moved since the job was dispatched
+            self.writer.submit(table_path, self._rows.get(job_key, row_index), url)
+
+    def _link_duplicate(self, job: ScheduleJob, url: str) -> None:
+        if job.table_path is not None:
+            self.writer.submit(job.table_path, self._rows.get(job.key, job.row_index), url)
+
+    def _settle_duplicates(self, job_key: str) -> None:
+        for key, table_path, row_index, url in self.ledger.settle_duplicates(job_key):
+            if url:
+                _log(f"INFO:DUPLICATE_LINKED row={row_index} url='{url}' table='{table_path}'")
+                self.writer.submit(table_path, self._rows.get(key, row_index), url)
+                continue
+            entry = self.known.get(key)
+            if entry is not None:
+                # the copy it waited for failed; let this one publish
+                self.defer(entry[0], datetime.now())
+
+    def _on_stall(self, job_key: str, step: str, age: float) -> None:
+        self._stalled[job_key] = step
+
+    def _handle_failure(self, job_key: str, error: str) -> None:
+        """Classify a failed job and retry, defer or fail it in the ledger."""
+        stalled = self._stalled.pop(job_key, None)
+        if stalled is not None:
+            if self.ledger.reached_publish(job_key, stalled):
+                # the click may have gone through; a requeue could publish twice
+                self.ledger.record_result(job_key, STATUS_UNCONFIRMED, "", f"watchdog: stalled in {stalled}")
+                _log(f"WARN:JOB_UNCONFIRMED key={job_key} step={stalled} err={error}")
+                return
+            error = f"watchdog: stalled in {stalled}; {error}"
+        failure = classify_failure(error)
+        if failure == FAILURE_CANCELLED:
+            if self.ledger.reached_publish(job_key):
+                self.ledger.record_result(job_key, STATUS_UNCONFIRMED, "", "cancelled while publishing")
+                _log(f"WARN:JOB_UNCONFIRMED key={job_key} err={error}")
+            else:
+                # not the job's fault: it runs again on the next start without using up a retry
+                self.ledger.record_cancelled(job_key)
+                _log(f"INFO:JOB_CANCELLED key={job_key}")
+            return
+        if failure == FAILURE_QUOTA:
+            self.ledger.record_failure(job_key, failure, error)
+            self._defer_quota_blocked(job_key)
+            return
+        entry = self.known.get(job_key)
+        attempts = self.ledger.attempts(job_key)
+        if entry is not None and should_retry(failure, attempts):
+            retry_at = time.time() + backoff_delay(attempts)
+            self.ledger.record_failure(job_key, failure, error, retry_at)
+            until = datetime.fromtimestamp(retry_at)
+            _log(
+                f"WARN:JOB_RETRY row={entry[0].row_index} profile={entry[0].profile or 'N/A'} attempt={attempts} "
+                f"at={until:%H:%M:%S} err={error}"
+            )
+            self.defer(entry[0], until)
+            return
+        self.ledger.record_failure(job_key, failure, error)
+        row = entry[0].row_index if entry is not None else "?"
+        _log(f"WARN:JOB_FAILED row={row} class={failure} attempts={attempts} err={error}")
+        self._settle_duplicates(job_key)
+
+    def _defer_quota_blocked(self, job_key: str) -> None:
+        # The site refused the publish: the profile's window is full no matter
+        # what our own publish history says.
+        self.ledger.record_quota_block(job_key)
+        entry = self.known.get(job_key)
+        if entry is None:
+            return
+        job = entry[0]
+        _used, next_free = self.ledger.quota_state(job.profile_key)
+        if next_free is None:
+            return
+        self.ledger.defer([job_key], next_free)
+        _defer_jobs([job], datetime.fromtimestamp(next_free), self.defer, "quota_block")
+
+    def tables(self) -> List[Path]:
+        return resolve_tables(self.source)
+
+    def _load(
+        self, initial: bool
+    ) -> tuple[List[ScheduleJob], Dict[str, datetime | None], datetime, set, set]:
+        """Read every table: ``(pending jobs, targets, now, unreadable tables, keys of all rows)``."""
+        tables = self.tables()
+        if not tables:
+            _log(f"WARN:NO_TABLES source='{self.source}'")
+        now = datetime.now()
+        jobs: List[ScheduleJob] = []
+        targets: Dict[str, datetime | None] = {}
+        failed: set = set()
+        with ThreadPoolExecutor(max_workers=max(1, min(TABLE_READ_WORKERS, len(tables)))) as executor:
+            # with a ledger, rows that already have a link are imported as done so the
+            # duplicate-content check knows what is live
+            include_done = self.ledger is not None
+            futures = [(path, executor.submit(_read_table, path, now, include_done)) for path in tables]
+            for path, future in futures:
+                try:
+                    table_jobs, table_targets = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    _log(f"WARN:TABLE_READ_FAILED file='{path}' err={exc}")
+                    failed.add(path)
+                    continue
+                jobs.extend(table_jobs)
+                targets.update(table_targets)
+        if len(tables) > 1:
+            _log(f"INFO:TABLES_MERGED tables={len(tables)} failed={len(failed)} jobs={len(jobs)}")
+        for job in jobs:
+            self._rows[job.key] = job.row_index
+        present = {job.key for job in jobs}
+        if self.ledger is not None:
+            jobs = _sync_ledger(self.ledger, jobs, self.writer, targets, initial=initial)
+        return jobs, targets, now, failed, present
+
+    def plan(self) -> int:
+        jobs, targets, now, _failed, _present = self._load(initial=True)
+        if not jobs:
+            return 0
+        self.known = {job.key: (job, targets.get(job.key)) for job in jobs}
+        immediate_jobs, scheduled_jobs = _group_jobs_by_time(jobs, targets, now)
+        # input("stop a second")
+        if immediate_jobs:
+            self._run_slot("immediate", immediate_jobs)
+        for target, slot_jobs in sorted(scheduled_jobs.items(), key=lambda item: item[0]):
+            delay = max(0.0, (target - datetime.now()).total_seconds())
+            label = target.strftime("%Y-%m-%d %H:%M:%S")
+            _log(
+                f"INFO:TIME_SLOT_REGISTER label={label} jobs={len(slot_jobs)} delay={int(delay)}s "
+                f"show_console={self.dispatcher.show_console} overlap={self.overlap}"
+            )
+            for job in slot_jobs:
+                self.timeline.add(job, target)
+        return len(jobs)
+
+    def reload(self) -> None:
+        with self._reload_lock:
+            jobs, targets, now, failed, present = self._load(initial=False)
+            for path in self.tables():
+                self.writer.forget(path)
+            fresh = {job.key: job for job in jobs}
+            added = cancelled = moved = 0
+            for key, (job, _target) in list(self.known.items()):
+                if key in fresh:
+                    continue
+                # a table that could not be read (mid-save, locked) keeps its jobs
+                if key not in present and job.table_path not in failed:
+                    del self.known[key]
+                    if self.timeline.cancel(key):
+                        cancelled += 1
+                elif key in present and self.timeline.cancel(key):
+                    # still in the table but no longer pending (a link was pasted in);
+                    # running and waiting jobs stay known for their retry or duplicate settling
+                    cancelled += 1
+            for key, job in fresh.items():
+                target = targets.get(key)
+                previous = self.known.get(key)
+                if previous is not None and previous == (job, target):
+                    continue
+                if previous is not None and key not in self.timeline:
+                    # already fired; the running job keeps its original timing
+                    self.known[key] = (job, previous[1])
+                    continue
+                self.known[key] = (job, target)
+                self.timeline.add(job, max(target, now) if target else now)
+                if previous is None:
+                    added += 1
+                else:
+                    moved += 1
+            _log(
+                f"INFO:SCHEDULE_RELOAD added={added} cancelled={cancelled} rescheduled={moved} "
+                f"pending_timers={len(self.timeline)}"
+            )
+
+    def run(self, watch: bool = False) -> None:
+        watcher = ScheduleWatcher(self.tables, self.reload).start() if watch else None
+        try:
+            while True:
+                if watch or len(self.timeline):
+                    self.engine.run(until_idle=not watch)
+                    _log(f"INFO:TIMER_METRICS {self.engine.stats.summary()}")
+                self.dispatcher.join()
+                # slots still running when the timeline drained may have deferred jobs
+                if watch or self.engine.stopped or not len(self.timeline):
+                    break
+        except KeyboardInterrupt:
+            _log("WARN:SCHEDULER_INTERRUPTED")
+            self.cancel()
+            self.drain()
+            return
+        finally:
+            if watcher is not None:
+                watcher.stop()
+        self.dispatcher.join()
+
+    def drain(self, timeout: float = SCHEDULE_SHUTDOWN_TIMEOUT_S) -> None:
+        """After ``cancel``, wait for running groups before the ledger may be closed.
+
+        Workers still busy after ``timeout`` (or a second Ctrl+C) are killed;
+        if their groups still do not finish, their jobs are settled from the
+        journal so none stays ``running``.
+        """
+        try:
+            finished = self.dispatcher.join(timeout)
+        except KeyboardInterrupt:
+            finished = False
+        if finished:
+            return
+        _log(f"WARN:SCHEDULER_DRAIN_TIMEOUT timeout={timeout:.0f}s")
+        self.dispatcher.terminate()
+        if self.pool is not None:
+            self.pool.shutdown(timeout=0)
+        if not self.dispatcher.join(KILL_GRACE_S) and self.ledger is not None:
+            self.ledger.reconcile_running()
 
 
 def main(
-    table: Path | None = None,
+    table: Path | str | None = None,
     limit: int | None = None,
     show_console: bool | None = None,
+    daemon: bool | None = None,
+    overlap: bool | None = None,
+    watch: bool | None = None,
+    adaptive: bool | None = None,
+    on_event: Callable[[JobEvent], Any] | None = None,
+    simulate: bool = False,
+    sim_runner: Callable[[ScheduleJob], float] | None = None,
+    sim_start: datetime | None = None,
+    serve: str | None = None,
 ) -> None:
-    table = (table or CSV_PATH).expanduser()
-    limit = max(1, limit or DEFAULT_LIMIT)
+    """Run the schedule in ``table``.
+
+    With ``simulate`` nothing is launched: the table is replayed on a
+    virtual clock with ``sim_runner`` (default: :class:`schedule_sim.FakeRunner`)
+    standing in for the browser, and dispatch metrics are logged. With
+    ``serve`` ("host:port") jobs go to remote worker agents (see
+    :mod:`job_coordinator`) instead of local worker processes.
+
+    ``limit`` sizes the worker pool and is the ceiling the ``adaptive``
+    budget moves under; adaptive runs without a ``limit`` get
+    ``SCHEDULE_CONCURRENCY_MAX`` workers.
+    """
+    table = table or CSV_PATH
     show_console = DEFAULT_SHOW_CONSOLE if show_console is None else show_console
-    columns = read_schedule(table)
-    jobs = build_jobs(columns)
-    for job in jobs:
-        job.table_path = table
-    if not jobs:
-        _log("WARN: No jobs found in schedule.")
+    daemon = DEFAULT_DAEMON if daemon is None else daemon
+    overlap = DEFAULT_OVERLAP if overlap is None else overlap
+    watch = DEFAULT_WATCH if watch is None else watch
+    adaptive = DEFAULT_ADAPTIVE if adaptive is None else adaptive
+    limit = max(1, limit or (SCHEDULE_CONCURRENCY_MAX if adaptive else DEFAULT_LIMIT))
+    if simulate:
+        from schedule_sim import simulate as run_simulation
+
+        run_simulation(table, limit, overlap, sim_runner, sim_start)
         return
-    immediate_jobs, scheduled_jobs = _group_jobs_by_time(jobs)
-    # input("stop a second")
-    if immediate_jobs:
-        _dispatch_time_slot("immediate", immediate_jobs, limit, show_console)
-
-    scheduler = sched.scheduler(time.time, time.sleep)
-    for target, slot_jobs in sorted(scheduled_jobs.items(), key=lambda item: item[0]):
-        delay = max(0.0, (target - datetime.now()).total_seconds())
-        label = target.strftime("%Y-%m-%d %H:%M:%S")
-        _log(
-            f"INFO:TIME_SLOT_REGISTER label={label} jobs={len(slot_jobs)} delay={int(delay)}s show_console={show_console}"
-        )
-        scheduler.enter(
-            delay,
-            1,
-            _dispatch_time_slot,
-            argument=(label, slot_jobs, limit, show_console),
+    serve = SCHEDULE_SERVE if serve is None else serve
+    session = ScheduleSession(table, limit, show_console, daemon, overlap, adaptive, on_event, serve).start()
+    try:
+        if not session.plan() and not watch:
+            _log("WARN: No jobs found in schedule.")
+            return
+        session.run(watch=watch)
+    except KeyboardInterrupt:
+        # without overlap the immediate slot runs inside plan()
+        _log("WARN:SCHEDULER_INTERRUPTED")
+        session.cancel()
+        session.drain()
+    finally:
+        session.close()
+
+
+def _sync_ledger(
+    ledger: JobLedger,
+    jobs: List[ScheduleJob],
+    writer: LinkWriteBack,
+    targets: Dict[str, datetime | None],
+    initial: bool = True,
+) -> List[ScheduleJob]:
+    """Import ``jobs`` into the ledger and return the ones still pending.
+
+    ``targets`` is updated in place where the ledger holds a pending job back
+    past its table time.
+    """
+    if initial:
+        ledger.reconcile_running()
+    rows = []
+    for job in jobs:
+        target = targets.get(job.key)
+        rows.append(
+            LedgerRow(
+                job_key=job.key,
+                table_path=str(job.table_path or ""),
+                row_index=job.row_index,
+                platform=job.platform,
+                profile=job.profile_key,
+                title=job.title,
+                target_ts=target.timestamp() if target else None,
+                link=job.link,
+                fingerprint=job.fingerprint,
+            )
         )
+    ledger.import_rows(rows, retry_failed=initial)
+    if initial:
+        for table_path, row_index, url in ledger.pending_writeback():
+            writer.submit(table_path, row_index, url)
+    statuses = ledger.statuses([job.key for job in jobs])
+    pending = [job for job in jobs if statuses.get(job.key) == STATUS_PENDING]
+    # a retry backoff or quota deferral outranks the table's own time
+    for key, target_ts in ledger.targets([job.key for job in pending]).items():
+        held = datetime.fromtimestamp(target_ts) if target_ts is not None else None
+        if held is not None and (targets.get(key) is None or held > targets[key]):
+            targets[key] = held
+    if len(pending) < len(jobs):
+        _log(f"INFO:LEDGER_SKIP skipped={len(jobs) - len(pending)} reason=not_pending")
+    _log(f"INFO:LEDGER_PENDING pending={len(pending)}")
+    return pending
 
-    if scheduled_jobs:
-        scheduler.run()
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run scheduled Medium jobs from a CSV/XLSX table")
+    parser.add_argument(
+        "--table",
+        default=CSV_PATH,
+        help="CSV/XLSX table, a directory of tables or a glob such as 'clients/*.xlsx'",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help=(
+            f"Concurrent profile workers (default {DEFAULT_LIMIT}; with --adaptive the ceiling, "
+            f"default {SCHEDULE_CONCURRENCY_MAX}; ignored with --serve, where agents advertise their slots)"
+        ),
+    )
+    parser.add_argument(
+        "--console",
+        action=argparse.BooleanOptionalAction,
+        default=DEFAULT_SHOW_CONSOLE,
+        help="Open a console window per worker",
+    )
+    parser.add_argument(
+        "--daemon",
+        action=argparse.BooleanOptionalAction,
+        default=DEFAULT_DAEMON,
+        help="Keep a warm worker pool alive instead of one process per slot",
+    )
+    parser.add_argument(
+        "--overlap",
+        action=argparse.BooleanOptionalAction,
+        default=DEFAULT_OVERLAP,
+        help="Fire slots on time even while earlier slots are still running",
+    )
+    parser.add_argument(
+        "--watch",
+        action=argparse.BooleanOptionalAction,
+        default=DEFAULT_WATCH,
+        help="Keep running and apply edits to the table as they are saved",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action=argparse.BooleanOptionalAction,
+        default=DEFAULT_ADAPTIVE,
+        help="Shrink the worker budget under memory/CPU load; --limit stays the ceiling",
+    )
+    parser.add_argument(
+        "--requeue-unconfirmed",
+        action="store_true",
+        help="Run again the jobs a crash interrupted mid-publish (check the site first)",
+    )
+    parser.add_argument(
+        "--durations",
+        action="store_true",
+        help="Print the recorded per-profile step durations and exit",
+    )
+    parser.add_argument(
+        "--serve",
+        default=SCHEDULE_SERVE,
+        metavar="HOST:PORT",
+        help="Coordinate remote worker agents on this address instead of running browsers locally",
+    )
+    parser.add_argument(
+        "--agent",
+        nargs="?",
+        const=SCHEDULE_COORDINATOR_URL,
+        default=None,
+        metavar="URL",
+        help="Run as a worker agent pulling jobs from the coordinator at URL",
+    )
+    parser.add_argument("--agent-slots", type=int, default=SCHEDULE_AGENT_SLOTS, help="Profiles an agent runs at once")
+    parser.add_argument(
+        "--bench-startup",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Time N worker starts with spawn and with the preloaded forkserver, then exit",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Replay the table on a virtual clock with fake job durations and report dispatch metrics",
+    )
+    parser.add_argument(
+        "--sim-duration",
+        default=SCHEDULE_SIM_DURATION,
+        help="Simulated job durations: fixed:S, uniform:LOW:HIGH, normal:MEAN:SD, lognormal:MEDIAN:SIGMA, model[:SIGMA]",
+    )
+    parser.add_argument("--sim-seed", type=int, default=SCHEDULE_SIM_SEED, help="Seed for simulated durations")
+    parser.add_argument(
+        "--sim-start",
+        type=lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M"),
+        default=None,
+        help="Virtual start time 'YYYY-MM-DD HH:MM' (default: earliest scheduled time)",
+    )
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def show_durations() -> None:
+    if not SCHEDULE_LEDGER_PATH:
+        _log("WARN: Step durations need the ledger (SCHEDULE_LEDGER_PATH is empty).")
+        return
+    ledger = JobLedger(SCHEDULE_LEDGER_PATH)
+    try:
+        model = DurationModel(ledger)
+        print(model.format_table() if model.rows() else "No step durations recorded yet.")
+    finally:
+        ledger.close()
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.durations:
+        show_durations()
+        sys.exit(0)
+    if args.bench_startup:
+        from worker_context import benchmark_startup
+
+        benchmark_startup(args.bench_startup)
+        sys.exit(0)
+    if args.agent:
+        from job_coordinator import WorkerAgent
+
+        WorkerAgent(args.agent, slots=args.agent_slots, show_console=args.console).run()
+        sys.exit(0)
+    if args.simulate:
+        from schedule_sim import FakeRunner, load_duration_model
+
+        try:
+            sim_runner = FakeRunner(args.sim_duration, args.sim_seed, load_duration_model())
+        except ValueError as exc:
+            _log(f"WARN:SIM_DURATION_INVALID {exc}")
+            sys.exit(2)
+        main(
+            table=args.table,
+            limit=args.limit,
+            overlap=args.overlap,
+            simulate=True,
+            sim_runner=sim_runner,
+            sim_start=args.sim_start,
+        )
+        sys.exit(0)
+    if args.requeue_unconfirmed and SCHEDULE_LEDGER_PATH:
+        requeue_ledger = JobLedger(SCHEDULE_LEDGER_PATH)
+        _log(f"INFO:LEDGER_REQUEUE_UNCONFIRMED rows={requeue_ledger.requeue_unconfirmed()}")
+        requeue_ledger.close()
+    main(
+        table=args.table,
+        limit=args.limit,
+        show_console=args.console,
+        daemon=args.daemon,
+        overlap=args.overlap,
+        watch=args.watch,
+        adaptive=args.adaptive,
+        serve=args.serve,
+    )
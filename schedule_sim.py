@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import heapq
+import inspect
+import os
+import random
+import sys
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List
+
+from config import SCHEDULE_LEDGER_PATH, SCHEDULE_SIM_DURATION, SCHEDULE_SIM_SEED
+from duration_model import DurationModel
+from job_ledger import STATUS_DONE, JobLedger, LedgerRow
+from schedule_reader import (
+    ScheduleJob,
+    ScheduleTimeline,
+    SlotQueue,
+    TimerEngine,
+    _group_jobs_by_profile,
+    _read_table,
+    admit_jobs,
+    plan_slot,
+    resolve_tables,
+)
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "model")
+
+
+def _log(message: str) -> None:
+    caller = inspect.currentframe().f_back  # type: ignore[assignment]
+    line = caller.f_lineno if caller else -1
+    pid = os.getpid()
+    formatted = f"[pid {pid:>6}] [line {line:04d}] {message}"
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    try:
+        sys.stdout.buffer.write((formatted + "\n").encode(encoding, errors="replace"))
+        sys.stdout.flush()
+    except Exception:
+        print(formatted)
+
+
+class VirtualClock:
+    """Simulated time: starts at ``start`` and only moves when advanced."""
+
+    def __init__(self, start: datetime) -> None:
+        self.epoch = start.timestamp()
+        self.offset = 0.0
+
+    def monotonic(self) -> float:
+        return self.offset
+
+    def time(self) -> float:
+        return self.epoch + self.offset
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def advance_to(self, offset: float) -> None:
+        self.offset = max(self.offset, offset)
+
+
+class VirtualTimerEngine(TimerEngine):
+    """:class:`TimerEngine` that jumps the clock to the next deadline instead of sleeping.
+
+    Only meant to be driven from one thread: callbacks schedule further
+    timers and ``run`` returns once the heap is empty.
+    """
+
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__(clock=clock.monotonic)
+        self.virtual = clock
+
+    def deadline_for(self, target: datetime) -> float:
+        return self.clock() + (target - self.virtual.now()).total_seconds()
+
+    def _pop_due(self, until_idle: bool) -> list | None:
+        with self._cond:
+            while self._heap and self._heap[0][self._CALLBACK] is None:
+                heapq.heappop(self._heap)
+                self._cancelled -= 1
+            if self._stopped or not self._heap:
+                return None
+            entry = heapq.heappop(self._heap)
+            self._entries.pop(entry[self._ID], None)
+            self.virtual.advance_to(entry[self._DEADLINE])
+            return entry
+
+
+class FakeRunner:
+    """Stands in for ``run_job_inline``: returns how long a job would have taken.
+
+    ``spec`` picks the distribution of job durations in seconds:
+
+    ``fixed:S``, ``uniform:LOW:HIGH``, ``normal:MEAN:SD``,
+    ``lognormal:MEDIAN:SIGMA`` or ``model[:SIGMA]`` (lognormal around the
+    recorded per-profile estimate).
+    """
+
+    def __init__(
+        self,
+        spec: str = SCHEDULE_SIM_DURATION,
+        seed: int | None = SCHEDULE_SIM_SEED,
+        model: DurationModel | None = None,
+    ) -> None:
+        kind, *params = spec.strip().lower().split(":")
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"unknown duration distribution '{kind}' (use one of {', '.join(DISTRIBUTIONS)})")
+        try:
+            self.params = [float(value) for value in params]
+        except ValueError:
+            raise ValueError(f"invalid duration spec '{spec}'") from None
+        needed = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "model": 0}[kind]
+        if len(self.params) < needed:
+            raise ValueError(f"duration spec '{spec}' needs {needed} parameter(s)")
+        self.spec = spec
+        self.kind = kind
+        self.model = model or DurationModel()
+        self.rng = random.Random(seed)
+
+    def __call__(self, job: ScheduleJob) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            seconds = p[0]
+        elif self.kind == "uniform":
+            seconds = self.rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            seconds = self.rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            seconds = self.rng.lognormvariate(0.0, p[1]) * p[0]
+        else:
+            sigma = p[0] if p else 0.25
+            seconds = self.rng.lognormvariate(0.0, sigma) * self.model.estimate_job(job)
+        return max(1.0, seconds)
+
+
+class _SlotStats:
+    def __init__(self, label: str, target: datetime, fired: datetime, jobs: int) -> None:
+        self.label = label
+        self.target = target
+        self.fired = fired
+        self.jobs = jobs
+        self.groups = 0
+        self.deferred = 0
+        self.duplicates = 0
+        self.predicted = 0.0
+        self.start_lateness: List[float] = []
+        self.open = 0
+        self.finished: datetime | None = None
+        self.overhead = 0.0
+
+    @property
+    def fire_lateness(self) -> float:
+        return (self.fired - self.target).total_seconds()
+
+
+class ScheduleSimulator:
+    """Replays jobs through the real timeline and slot planner on a virtual clock.
+
+    Slots go through the dispatcher's own pieces: :func:`admit_jobs` against
+    an in-memory ledger on the virtual clock (publish quota and duplicate
+    content included), :func:`plan_slot` for the group order and a
+    :class:`SlotQueue` with the dispatcher's priorities as the worker budget.
+    As in :class:`schedule_reader.SlotDispatcher` a group holds its profile
+    before it queues for a slot, and without ``overlap`` a slot waits for the
+    previous one to finish. The adaptive budget and retries are not simulated.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        overlap: bool,
+        runner: Callable[[ScheduleJob], float],
+        start: datetime,
+        estimate: Callable[[ScheduleJob], float] | None = None,
+    ) -> None:
+        self.limit = max(1, limit)
+        self.overlap = overlap
+        self.runner = runner
+        self.estimate = estimate or DurationModel().estimate_job
+        self.clock = VirtualClock(start)
+        self.engine = VirtualTimerEngine(self.clock)
+        self.timeline = ScheduleTimeline(self.engine, self._on_slot)
+        self.ledger = JobLedger(":memory:", clock=self.clock.time)
+        self.gate = SlotQueue(self.limit)
+        self.slots: List[_SlotStats] = []
+        self._profiles: Dict[str, Deque[tuple]] = defaultdict(deque)  # held profile -> groups waiting for it
+        self._peak = 0
+        self._area = 0.0
+        self._last = 0.0
+        self._slot_running = False
+        self._backlog: Deque[tuple[str, List[ScheduleJob], datetime]] = deque()
+        self.done = 0
+        self.wall = 0.0
+
+    def add(self, jobs: List[ScheduleJob], targets: Dict[str, datetime | None]) -> None:
+        """Put ``jobs`` on the timeline as pending rows; past or missing times run at the start."""
+        start = self.clock.now()
+        timed = {}
+        for job in jobs:
+            target = targets.get(job.key)
+            timed[job.key] = target if target is not None and target > start else start
+        self.ledger.import_rows(
+            LedgerRow(
+                job_key=job.key,
+                table_path=str(job.table_path or ""),
+                row_index=job.row_index,
+                platform=job.platform,
+                profile=job.profile_key,
+                title=job.title,
+                target_ts=timed[job.key].timestamp(),
+                fingerprint=job.fingerprint,
+            )
+            for job in jobs
+        )
+        for job in jobs:
+            self.timeline.add(job, timed[job.key])
+
+    def run(self) -> "ScheduleSimulator":
+        started = time.perf_counter()
+        self.engine.run(until_idle=True)
+        self.wall = time.perf_counter() - started
+        self.ledger.close()
+        return self
+
+    def _account(self) -> None:
+        now = self.clock.monotonic()
+        self._area += self.gate.in_use * (now - self._last)
+        self._last = now
+
+    def _on_slot(self, label: str, jobs: List[ScheduleJob], target: datetime) -> None:
+        if not self.overlap and self._slot_running:
+            self._backlog.append((label, jobs, target))
+            return
+        self._dispatch(label, jobs, target)
+
+    def _dispatch(self, label: str, jobs: List[ScheduleJob], target: datetime) -> None:
+        started = time.perf_counter()
+        slot = _SlotStats(label, target, self.clock.now(), len(jobs))
+        self.slots.append(slot)
+        admitted, deferred, duplicates = admit_jobs(self.ledger, jobs)
+        for next_free, held in deferred.items():
+            slot.deferred += len(held)
+            for job in held:
+                self.timeline.add(job, datetime.fromtimestamp(next_free))
+        slot.duplicates = len(duplicates)
+        grouped = _group_jobs_by_profile(admitted)
+        order, slot.predicted = plan_slot(grouped, self.limit, self.estimate)
+        slot.groups = slot.open = len(order)
+        for group_id, cost in order:
+            self._hold_profile(group_id, ((slot.fired, -cost), grouped[group_id], slot))
+        if order:
+            self._slot_running = True
+        else:
+            slot.finished = slot.fired
+        self._pump()
+        slot.overhead += time.perf_counter() - started
+
+    def _hold_profile(self, group_id: str, group: tuple) -> None:
+        waiting = self._profiles[group_id]
+        waiting.append(group)
+        if len(waiting) == 1:
+            priority, jobs, slot = group
+            self.gate.push(priority, (group_id, jobs, slot))
+
+    def _pump(self) -> None:
+        while self.gate.ready():
+            self._account()
+            group_id, jobs, slot = self.gate.take()
+            self._peak = max(self._peak, self.gate.in_use)
+            slot.start_lateness.append((self.clock.now() - slot.target).total_seconds())
+            self._run_job(group_id, jobs, 0, slot)
+
+    def _run_job(self, group_id: str, jobs: List[ScheduleJob], index: int, slot: _SlotStats) -> None:
+        self.engine.schedule_in(self.runner(jobs[index]), self._job_done, group_id, jobs, index, slot)
+
+    def _job_done(self, group_id: str, jobs: List[ScheduleJob], index: int, slot: _SlotStats) -> None:
+        started = time.perf_counter()
+        job = jobs[index]
+        self.ledger.record_result(job.key, STATUS_DONE, url=f"sim://{job.key}")
+        self.done += 1
+        if index + 1 < len(jobs):
+            self._run_job(group_id, jobs, index + 1, slot)
+        else:
+            self._finish(group_id, slot)
+        slot.overhead += time.perf_counter() - started
+
+    def _finish(self, group_id: str, slot: _SlotStats) -> None:
+        self._account()
+        self.gate.release()
+        waiting = self._profiles[group_id]
+        waiting.popleft()
+        if waiting:
+            priority, jobs, held_slot = waiting[0]
+            self.gate.push(priority, (group_id, jobs, held_slot))
+        else:
+            del self._profiles[group_id]
+        slot.open -= 1
+        if slot.open == 0:
+            slot.finished = self.clock.now()
+            self._slot_running = False
+            if self._backlog:
+                self._dispatch(*self._backlog.popleft())
+        self._pump()
+
+    def report(self) -> List[str]:
+        span = self.clock.monotonic()
+        hours = span / 3600 if span else 0.0
+        overhead = sum(slot.overhead for slot in self.slots)
+        lines = [
+            f"INFO:SIM_SUMMARY jobs={self.done} slots={len(self.slots)} workers={self.limit} "
+            f"quota_deferred={sum(slot.deferred for slot in self.slots)} "
+            f"duplicates={sum(slot.duplicates for slot in self.slots)} "
+            f"overlap={self.overlap} span={span / 60:.1f}min wall={self.wall:.3f}s "
+            f"speedup={span / self.wall if self.wall else 0:.0f}x "
+            f"throughput={self.done / hours if hours else 0:.1f}jobs/h",
+            f"INFO:SIM_UTILIZATION mean_live={self._area / span if span else 0:.2f}/{self.limit} "
+            f"utilization={100 * self._area / (span * self.limit) if span else 0:.1f}% peak={self._peak}",
+            f"INFO:SIM_DISPATCH_OVERHEAD total={overhead * 1000:.2f}ms "
+            f"per_slot={overhead * 1000 / max(1, len(self.slots)):.3f}ms "
+            f"per_job={overhead * 1e6 / max(1, self.done):.1f}us timer_wakeups={self.engine.stats.count}",
+        ]
+        for slot in self.slots:
+            elapsed = ((slot.finished or self.clock.now()) - slot.fired).total_seconds()
+            mean = sum(slot.start_lateness) / len(slot.start_lateness) if slot.start_lateness else 0.0
+            lines.append(
+                f"INFO:SIM_SLOT label={slot.label} jobs={slot.jobs} groups={slot.groups} deferred={slot.deferred} "
+                f"duplicates={slot.duplicates} "
+                f"fire_lateness={slot.fire_lateness:+.0f}s mean_start_lateness={mean:+.0f}s "
+                f"max_start_lateness={max(slot.start_lateness, default=0.0):+.0f}s "
+                f"predicted={slot.predicted:.0f}s elapsed={elapsed:.0f}s overhead={slot.overhead * 1000:.3f}ms"
+            )
+        return lines
+
+
+def load_duration_model() -> DurationModel:
+    # read-only: the simulation never writes to the ledger
+    if not SCHEDULE_LEDGER_PATH or not Path(SCHEDULE_LEDGER_PATH).exists():
+        return DurationModel()
+    ledger = JobLedger(SCHEDULE_LEDGER_PATH)
+    try:
+        model = DurationModel(ledger)
+    finally:
+        ledger.close()
+    model.ledger = None
+    return model
+
+
+def simulate(
+    source: Path | str,
+    limit: int,
+    overlap: bool,
+    runner: Callable[[ScheduleJob], float] | None = None,
+    start: datetime | None = None,
+) -> ScheduleSimulator:
+    """Replay every row of ``source`` (published ones included) and log the metrics.
+
+    The virtual day starts at ``start`` or at the earliest scheduled time.
+    """
+    model = load_duration_model()
+    runner = runner or FakeRunner(model=model)
+    now = datetime.now()
+    jobs: List[ScheduleJob] = []
+    targets: Dict[str, datetime | None] = {}
+    for path in resolve_tables(source):
+        table_jobs, table_targets = _read_table(path, now, include_done=True)
+        jobs.extend(table_jobs)
+        targets.update(table_targets)
+    timed = [target for target in targets.values() if target is not None]
+    start = start or min(timed, default=now)
+    sim = ScheduleSimulator(limit, overlap, runner, start, estimate=model.estimate_job)
+    sim.add(jobs, targets)
+    _log(f"INFO:SIM_START jobs={len(jobs)} start={start:%Y-%m-%d %H:%M:%S} runner={getattr(runner, 'spec', runner)}")
+    for line in sim.run().report():
+        _log(line)
+    return sim
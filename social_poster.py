@@ -39,6 +39,8 @@ from tkinter import filedialog, messagebox, simpledialog
 
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+import cancel_token
+from cancel_token import CancelToken, JobCancelled
 from console_utils import ensure_own_console
 from openWeb import launch_profile_browser, open_debug_then_restart_with_selenium
 from gpm_profile import find_or_create_profile, start_profile, create_profile, start_profile_api
@@ -163,6 +165,7 @@ class MediumJobConfig:
     manual_login_timeout: int = 180  # seconds
     schedule_table: str | None = None
     schedule_row: int = 0
+    persist_link: bool = True  # False when the scheduler owns the write-back
 
 
 @dataclass
@@ -171,6 +174,11 @@ class RunnerConfig:
     medium: Optional[MediumJobConfig] = None
 
 
+# Machine-readable Runner output for the scheduler (step timings, browser
+# process ids); not meant for the activity log.
+DIAGNOSTIC_LEVELS = frozenset({"timing", "browser"})
+
+
 class Runner(threading.Thread):
     """Background worker responsible for publishing posts."""
 
@@ -202,6 +210,15 @@ class Runner(threading.Thread):
     def error(self, message: str) -> None:
         self._put("error", message)
 
+    def _report_step(self, step: str, seconds: float) -> None:
+        self._put("timing", f"{step} {seconds:.3f}")
+
+    def _report_browser(self, driver) -> None:
+        # lets a scheduler watchdog find this browser's Chrome and chromedriver processes
+        options = (getattr(driver, "capabilities", None) or {}).get("goog:chromeOptions") or {}
+        service_proc = getattr(getattr(driver, "service", None), "process", None)
+        self._put("browser", f"{options.get('debuggerAddress') or '-'} {getattr(service_proc, 'pid', 0) or 0}")
+
     def _ensure_console(self) -> None:
         if not self.open_console or self._console_ready:
             return
@@ -218,6 +235,11 @@ class Runner(threading.Thread):
             self.open_console = False
 
     def run(self) -> None:  # pragma: no cover - integration path
+        # every wait and sleep below medium_selenium / gpm_profile watches stop_evt
+        with cancel_token.bind(CancelToken(self.stop_evt)):
+            self._run()
+
+    def _run(self) -> None:
         try:
             if self.config.platform == "Medium":
                 if not self.config.medium:
@@ -232,6 +254,9 @@ class Runner(threading.Thread):
             else:
                 self.warn(f"Unsupported platform: {self.config.platform}")
             self._put("finished", "Done")
+        except JobCancelled as exc:
+            self.error(f"Cancelled: {exc}")
+            self._put("finished", "Cancelled")
         except Exception as exc:  # pylint: disable=broad-except
             self.error(f"Failure: {exc}")
             print("eXCEPTION in runner:", exc)
@@ -267,6 +292,7 @@ class Runner(threading.Thread):
         
         # Start the profile and get WebDriver
         _log("Launching Chrome via GPM Login API...")
+        launch_started = time.perf_counter()
         driver = start_profile_api(
             profile_id=profile_id,
             win_width=1280,
@@ -279,24 +305,26 @@ class Runner(threading.Thread):
         if driver is None:
             self.error("Failed to launch Chrome via GPM Login API. Please check your GPM Login app.")
             return
+        self._report_step("launch_browser", time.perf_counter() - launch_started)
+        self._report_browser(driver)
         try:
             _log(f"Driver ready. keep_browser_open={fmt_bool(cfg.keep_browser_open)}")
             if self.stop_evt.is_set():
                 self.warn("Stop requested before navigation.")
-                return
+                raise JobCancelled()
 
             if cfg.manual_login:
                 self._handle_manual_login(driver, cfg)
-                if self.stop_evt.is_set():
-                    return
+                cancel_token.check()
             driver.get("chrome://version/")
-            time.sleep(1)
+            cancel_token.sleep(1)
             publish_url = medium_publish_article_selenium(
                 driver=driver,
                 title=cfg.title,
                 content=cfg.content,
                 # tags=tags,
                 publish_now=cfg.publish_now,
+                on_step=self._report_step,
             )
             print(f"Published URL: {publish_url}")
             if publish_url:
@@ -340,10 +368,10 @@ class Runner(threading.Thread):
                     f"Manual login timeout ({timeout}s) reached. Continuing with automation."
                 )
                 return
-            time.sleep(1.0)
+            self.stop_evt.wait(1.0)
 
     def _persist_publish_link(self, cfg: MediumJobConfig, url: str) -> None:
-        if not cfg.schedule_table or not cfg.schedule_row:
+        if not cfg.persist_link or not cfg.schedule_table or not cfg.schedule_row:
             return
         if schedule_reader is None or not hasattr(schedule_reader, "write_link_to_schedule"):
             return
@@ -354,16 +382,38 @@ class Runner(threading.Thread):
             self.warn(f"Failed to update schedule link row={cfg.schedule_row}: {exc}")
 
 
+class _CallbackQueue(queue.Queue):
+    """Queue that also hands every ``(level, message)`` to a callback as it is put."""
+
+    def __init__(self, callback: Callable[[str, str], Any]) -> None:
+        super().__init__()
+        self._callback = callback
+
+    def put(self, item, block: bool = True, timeout: float | None = None) -> None:
+        super().put(item, block, timeout)
+        try:
+            self._callback(*item)
+        except Exception as exc:  # pylint: disable=broad-except
+            _log(f"WARN:EVENT_CALLBACK_FAILED err={exc}")
+
+
 def run_job_inline(
     config: RunnerConfig,
     *,
     open_console: bool = False,
     console_title: str | None = None,
+    on_event: Callable[[str, str], Any] | None = None,
+    stop_evt: Any | None = None,
 ) -> list[tuple[str, str]]:
-    """Utility for external callers (e.g., batch scheduler) to run a job inline."""
+    """Utility for external callers (e.g., batch scheduler) to run a job inline.
+
+    ``on_event`` sees each ``(level, message)`` while the job runs; the full
+    list is still returned at the end. Setting ``stop_evt`` (a threading or
+    multiprocessing event) cancels the job at its next wait.
+    """
 
-    log_q: queue.Queue = queue.Queue()
-    stop_evt = threading.Event()
+    log_q: queue.Queue = _CallbackQueue(on_event) if on_event is not None else queue.Queue()
+    stop_evt = stop_evt if stop_evt is not None else threading.Event()
     runner = Runner(
         config,
         log_q,
@@ -379,11 +429,12 @@ def run_job_inline(
 
 
 class AutoPostPanel(ctk.CTkFrame):
-    def __init__(self, master, path_var, limit_var, console_var):
+    def __init__(self, master, path_var, limit_var, console_var, events: queue.Queue | None = None):
         super().__init__(master)
         self.table_var = path_var
         self.limit_var = limit_var
         self.console_var = console_var
+        self.events = events
         self._running = False
         self.status_var = tk.StringVar(value="Load a CSV/XLSX schedule and press Run.")
         self._build_ui()
@@ -460,12 +511,28 @@ class AutoPostPanel(ctk.CTkFrame):
 
     def _run_schedule(self, table_path: Path, limit: int, show_console: bool):
         try:
-            schedule_reader.main(table=table_path, limit=limit, show_console=show_console)
+            schedule_reader.main(
+                table=table_path,
+                limit=limit,
+                show_console=show_console,
+                on_event=self._on_job_event,
+            )
         except Exception as exc:  # pylint: disable=broad-except
             self.after(0, lambda: self._finish_schedule(False, str(exc)))
         else:
             self.after(0, lambda: self._finish_schedule(True, "Schedule run completed."))
 
+    def _on_job_event(self, event: Any) -> None:
+        # called on the scheduler's relay thread while the job is still running
+        if event.level in DIAGNOSTIC_LEVELS:
+            return
+        profile = Path(event.profile).name or "default"
+        stamp = time.strftime("%H:%M:%S", time.localtime(event.ts))
+        text = f"[{profile} row {event.row_index}] {event.message}"
+        if self.events is not None:
+            self.events.put((event.level, text))
+        self.after(0, self.status_var.set, f"{stamp} {text}")
+
     def _finish_schedule(self, success: bool, message: str) -> None:
         self._running = False
         self.run_btn.configure(state="normal", text="Run Schedule")
@@ -491,6 +558,8 @@ class App(ctk.CTk):
         self.is_running = False
         self.stop_evt = threading.Event()
         self.out_queue: queue.Queue = queue.Queue()
+        # scheduler events for the log; unlike out_queue it is never replaced by a manual run
+        self.schedule_events: queue.Queue = queue.Queue()
         self.runner: Optional[Runner] = None
 
         self.platform_var = tk.StringVar(value="Medium")
@@ -648,6 +717,7 @@ class App(ctk.CTk):
             path_var=self.schedule_path_var,
             limit_var=self.schedule_limit_var,
             console_var=self.schedule_console_var,
+            events=self.schedule_events,
         )
         self.autopost_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
 
@@ -733,11 +803,10 @@ class App(ctk.CTk):
         if schedule_reader is None:
             return [], [], "Batch scheduler module unavailable."
         try:
-            columns = schedule_reader.read_schedule(Path(SCHEDULE_TABLE_PATH))
+            jobs = list(schedule_reader.iter_schedule_jobs(Path(SCHEDULE_TABLE_PATH), include_done=True))
         except Exception as exc:
             return [], [], f"Failed to read schedule: {exc}"
-        values = columns.get("profile") or columns.get("profile_path") or []
-        profiles = sorted({(value or "").strip() for value in values if (value or "").strip()})
+        profiles = sorted({job.profile for job in jobs if job.profile})
         
         # Check profiles via GPM Login API instead of file system
         existing: list[tuple[str, Path]] = []
@@ -1103,6 +1172,8 @@ class App(ctk.CTk):
         try:
             while True:
                 level, message = self.out_queue.get_nowait()
+                if level in DIAGNOSTIC_LEVELS:
+                    continue
                 self.log_box_write(level, message)
                 if level == "finished":
                     self.is_running = False
@@ -1110,6 +1181,11 @@ class App(ctk.CTk):
                     self.cancel_button.configure(state="disabled")
         except queue.Empty:
             pass
+        try:
+            while True:
+                self.log_box_write(*self.schedule_events.get_nowait())
+        except queue.Empty:
+            pass
         self.after(150, self._poll_queue)
 
     def log_box_write(self, level: str, message: str) -> None:
@@ -0,0 +1,79 @@
+import queue
+
+import pytest
+
+from job_coordinator import AgentHub, job_from_payload, job_payload
+from job_ledger import JobLedger
+from schedule_reader import ScheduleJob
+
+
+def _job(title: str, profile: str = "alice") -> ScheduleJob:
+    return ScheduleJob("Medium", profile, "", title, "body", "", "09:00", "2099-01-01", "", 1)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = JobLedger(tmp_path / "ledger.sqlite3")
+    yield ledger
+    ledger.close()
+
+
+@pytest.fixture
+def hub(ledger):
+    hub = AgentHub("127.0.0.1:0", queue.Queue(), ledger)
+    yield hub
+    hub.shutdown()
+
+
+def test_payload_keeps_the_coordinators_key():
+    job = _job("First")
+    assert job_from_payload(job_payload(job)).key == job.key
+
+
+def test_lease_renew_release(hub, ledger):
+    job = _job("First")
+    future = hub.submit("alice", [job])
+    grant = hub.lease("agent-a")
+    assert grant["profile"] == "alice"
+    assert [holder for _profile, holder, _expires in ledger.leases()] == [grant["lease"]]
+    assert hub.renew(grant["lease"])
+
+    assert hub.deliver(grant["lease"], [["result", "someone-else#1", "done"], ["result", job.key, "done"]])
+    assert hub.channel.get_nowait() == ("result", job.key, "done")
+    assert hub.channel.empty()
+
+    assert hub.release(grant["lease"])
+    assert future.result(timeout=0) is None
+    assert ledger.leases() == []
+    # a released lease is gone: the agent has to let go of the profile
+    assert not hub.renew(grant["lease"])
+
+
+def test_restarted_coordinator_keeps_a_live_lease(hub, ledger):
+    hub.submit("alice", [_job("First")])
+    assert hub.lease("agent-a") is not None
+
+    restarted = AgentHub("127.0.0.1:0", queue.Queue(), ledger)
+    try:
+        restarted.submit("alice", [_job("Second")])
+        assert restarted.lease("agent-a") is None
+    finally:
+        restarted.shutdown()
+
+
+def test_release_with_error_fails_the_future(hub):
+    future = hub.submit("alice", [_job("First")])
+    grant = hub.lease("agent-a")
+    hub.release(grant["lease"], "browser crashed")
+    assert "browser crashed" in str(future.exception(timeout=0))
+
+
+def test_budget_follows_advertised_slots(hub):
+    budgets = []
+    hub.on_capacity = budgets.append
+    hub.lease("agent-a", slots=2)
+    hub.lease("agent-a", slots=2)
+    hub.lease("agent-b", slots=3)
+    assert hub.capacity == 5
+    assert budgets == [2, 5]
+    assert hub.status()["capacity"] == 5
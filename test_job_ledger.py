@@ -0,0 +1,211 @@
+import pytest
+
+from job_ledger import (
+    EVENT_PUBLISHED,
+    EVENT_START,
+    STATUS_DONE,
+    STATUS_DUPLICATE,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    VERDICT_IN_FLIGHT,
+    VERDICT_OWN,
+    VERDICT_PUBLISHED,
+    JobJournal,
+    JobLedger,
+    LedgerRow,
+)
+from retry_policy import FAILURE_RETRYABLE
+
+
+def _row(key="t.csv#a", target_ts=1000.0, row_index=2, title="First", link="", profile="alice", fingerprint=""):
+    return LedgerRow(
+        job_key=key,
+        table_path="t.csv",
+        row_index=row_index,
+        platform="Medium",
+        profile=profile,
+        title=title,
+        target_ts=target_ts,
+        link=link,
+        fingerprint=fingerprint,
+    )
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = JobLedger(tmp_path / "ledger.sqlite3")
+    yield ledger
+    ledger.close()
+
+
+def _status(ledger, key="t.csv#a"):
+    return ledger.statuses([key])[key]
+
+
+def test_pending_rows_follow_the_table(ledger):
+    ledger.import_rows([_row()])
+    ledger.import_rows([_row(target_ts=2000.0, row_index=5, title="Renamed")])
+    assert _status(ledger) == STATUS_PENDING
+    assert ledger.targets(["t.csv#a"]) == {"t.csv#a": 2000.0}
+
+
+def test_claim_moves_a_pending_job_once(ledger):
+    ledger.import_rows([_row()])
+    assert ledger.claim(["t.csv#a", "t.csv#missing"]) == ["t.csv#a"]
+    assert ledger.claim(["t.csv#a"]) == []
+    assert _status(ledger) == STATUS_RUNNING
+    assert ledger.attempts("t.csv#a") == 1
+
+
+def test_done_jobs_stay_done_and_keep_their_time(ledger):
+    ledger.import_rows([_row()])
+    ledger.claim(["t.csv#a"])
+    ledger.record_result("t.csv#a", STATUS_DONE, "https://medium.com/a")
+    ledger.import_rows([_row(target_ts=5000.0)])
+    assert _status(ledger) == STATUS_DONE
+    assert ledger.targets(["t.csv#a"]) == {"t.csv#a": 1000.0}
+    assert ledger.pending_writeback() == [("t.csv", 2, "https://medium.com/a")]
+
+
+def test_reconcile_settles_jobs_a_dead_scheduler_left_running(ledger):
+    ledger.import_rows([_row(), _row(key="t.csv#b", row_index=3)])
+    ledger.claim(["t.csv#a", "t.csv#b"])
+    journal = JobJournal(ledger.path)
+    journal.record("t.csv#a", EVENT_START)
+    journal.record("t.csv#a", EVENT_PUBLISHED, "https://medium.com/a")
+    journal.close()
+
+    outcome = ledger.reconcile_running()
+    assert (outcome["recovered"], outcome["resumed"]) == (1, 1)
+    assert ledger.statuses(["t.csv#a", "t.csv#b"]) == {"t.csv#a": STATUS_DONE, "t.csv#b": STATUS_PENDING}
+
+
+class _Clock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _publish(ledger, clock, key, at):
+    ledger.import_rows([_row(key=key)])
+    ledger.claim([key])
+    clock.now = at
+    ledger.record_result(key, STATUS_DONE, f"https://medium.com/{key}")
+
+
+@pytest.fixture
+def timed(tmp_path):
+    clock = _Clock()
+    ledger = JobLedger(tmp_path / "ledger.sqlite3", clock=clock)
+    yield ledger, clock
+    ledger.close()
+
+
+def test_quota_frees_when_the_oldest_publish_leaves_the_window(timed):
+    ledger, clock = timed
+    for at in (0.0, 10.0):
+        _publish(ledger, clock, f"t.csv#{at:.0f}", at)
+    assert ledger.quota_state("alice", limit=3, window_s=100.0, now_ts=30.0) == (2, None)
+    _publish(ledger, clock, "t.csv#20", 20.0)
+    assert ledger.quota_state("alice", limit=3, window_s=100.0, now_ts=30.0) == (3, 100.0)
+    # publishes that left the window do not count
+    assert ledger.quota_state("alice", limit=3, window_s=100.0, now_ts=105.0) == (2, None)
+
+
+def test_quota_filled_by_running_jobs_is_rechecked(timed):
+    ledger, _clock = timed
+    ledger.import_rows([_row(key=f"t.csv#{idx}") for idx in range(3)])
+    ledger.claim([f"t.csv#{idx}" for idx in range(3)])
+    assert ledger.quota_state("alice", limit=3, window_s=100.0, now_ts=30.0, recheck_s=5.0) == (3, 35.0)
+
+
+def test_quota_block_from_the_site_fills_the_window(timed):
+    ledger, clock = timed
+    _publish(ledger, clock, "t.csv#a", 0.0)
+    ledger.record_quota_block("t.csv#a", ts=50.0)
+    assert ledger.quota_state("alice", limit=3, window_s=100.0, now_ts=60.0) == (3, 150.0)
+
+
+def test_quota_deferral_survives_a_reimport(timed):
+    ledger, _clock = timed
+    ledger.import_rows([_row()])
+    ledger.defer(["t.csv#a"], 9000.0)
+    ledger.import_rows([_row(target_ts=1000.0)])
+    assert _status(ledger) == STATUS_PENDING
+    assert ledger.targets(["t.csv#a"]) == {"t.csv#a": 9000.0}
+
+
+def _fail(ledger, error, key="t.csv#a"):
+    ledger.claim([key])
+    ledger.fail_running([key], error)
+
+
+def test_restart_requeues_only_retryable_failures_within_the_budget(ledger):
+    keys = ["t.csv#flaky", "t.csv#gone", "t.csv#spent"]
+    ledger.import_rows([_row(key=key) for key in keys])
+    _fail(ledger, "TimeoutException: editor did not load", "t.csv#flaky")
+    _fail(ledger, "Profile 'alice' not found. Create it first", "t.csv#gone")
+    for _attempt in range(3):
+        _fail(ledger, "TimeoutException: editor did not load", "t.csv#spent")
+        ledger.import_rows([_row(key="t.csv#spent")], retries=2)
+
+    ledger.import_rows([_row(key=key) for key in keys], retries=2)
+    assert ledger.statuses(keys) == {
+        "t.csv#flaky": STATUS_PENDING,
+        "t.csv#gone": STATUS_FAILED,
+        "t.csv#spent": STATUS_FAILED,
+    }
+    ledger.import_rows([_row(key="t.csv#gone")], retry_failed=False)
+    assert _status(ledger, "t.csv#gone") == STATUS_FAILED
+
+
+def test_reimport_never_moves_a_retry_backoff_earlier(ledger):
+    ledger.import_rows([_row()])
+    ledger.claim(["t.csv#a"])
+    ledger.record_failure("t.csv#a", FAILURE_RETRYABLE, "timeout", retry_at=5000.0)
+    ledger.import_rows([_row(target_ts=1000.0)])
+    assert ledger.targets(["t.csv#a"]) == {"t.csv#a": 5000.0}
+    ledger.import_rows([_row(target_ts=8000.0)])
+    assert ledger.targets(["t.csv#a"]) == {"t.csv#a": 8000.0}
+
+
+def test_cancelled_run_is_not_an_attempt(ledger):
+    ledger.import_rows([_row()])
+    ledger.claim(["t.csv#a"])
+    ledger.record_cancelled("t.csv#a")
+    assert (_status(ledger), ledger.attempts("t.csv#a")) == (STATUS_PENDING, 0)
+
+
+def test_linked_rows_import_as_done_and_written(ledger):
+    ledger.import_rows([_row(link="https://medium.com/a"), _row(key="t.csv#b", row_index=3)])
+    # a link pasted into the table settles a pending job too
+    ledger.import_rows([_row(key="t.csv#b", row_index=3, link="https://medium.com/b")])
+    assert ledger.statuses(["t.csv#a", "t.csv#b"]) == {"t.csv#a": STATUS_DONE, "t.csv#b": STATUS_DONE}
+    assert ledger.pending_writeback() == []
+
+
+def test_fingerprint_finds_published_and_in_flight_copies(ledger):
+    ledger.import_rows([_row(key=key, fingerprint="same") for key in ("t.csv#a", "t.csv#b", "t.csv#c")])
+    assert ledger.check_fingerprint("t.csv#a", "same") == (VERDICT_OWN, "", "")
+    ledger.claim(["t.csv#a"])
+    assert ledger.check_fingerprint("t.csv#b", "same") == (VERDICT_IN_FLIGHT, "t.csv#a", "")
+
+    ledger.mark_duplicate("t.csv#b", "t.csv#a")
+    assert _status(ledger, "t.csv#b") == STATUS_DUPLICATE
+    ledger.record_result("t.csv#a", STATUS_DONE, "https://medium.com/a")
+    assert ledger.check_fingerprint("t.csv#c", "same") == (VERDICT_PUBLISHED, "t.csv#a", "https://medium.com/a")
+    # the waiting copy takes the URL once its twin is live
+    assert ledger.settle_duplicates("t.csv#a") == [("t.csv#b", "t.csv", 2, "https://medium.com/a")]
+    assert _status(ledger, "t.csv#b") == STATUS_DONE
+
+
+def test_duplicates_go_back_to_pending_when_the_twin_fails(ledger):
+    ledger.import_rows([_row(key=key, fingerprint="same") for key in ("t.csv#a", "t.csv#b")])
+    ledger.claim(["t.csv#a"])
+    ledger.mark_duplicate("t.csv#b", "t.csv#a")
+    ledger.fail_running(["t.csv#a"], "TimeoutException")
+    assert ledger.settle_duplicates("t.csv#a") == [("t.csv#b", "t.csv", 2, "")]
+    assert _status(ledger, "t.csv#b") == STATUS_PENDING
@@ -0,0 +1,40 @@
+from profile_ring import HashRing, rebalance
+
+PROFILES = [f"profile-{idx}" for idx in range(400)]
+
+
+def test_owner_is_stable_and_spread():
+    ring = HashRing(["a", "b", "c"])
+    assignment = ring.assignment(PROFILES)
+    assert HashRing(["c", "a", "b"]).assignment(PROFILES) == assignment
+    counts = {node: list(assignment.values()).count(node) for node in ring.nodes}
+    assert all(60 < count < 220 for count in counts.values()), counts
+    assert HashRing().owner("profile-0") is None
+
+
+def test_join_only_moves_profiles_to_the_new_node():
+    ring = HashRing(["a", "b", "c"])
+    result = rebalance(ring, PROFILES, {}, join="d")
+    assert result.moved
+    assert all(new == "d" for _old, new in result.moved.values())
+    # roughly the new node's share, not a reshuffle
+    assert len(result.moved) < len(PROFILES) / 2
+
+
+def test_leave_only_moves_the_profiles_of_the_leaving_node():
+    ring = HashRing(["a", "b", "c"])
+    owned = {profile for profile, owner in ring.assignment(PROFILES).items() if owner == "b"}
+    result = rebalance(ring, PROFILES, {}, leave="b")
+    assert set(result.moved) == owned
+    assert "b" not in ring
+    assert all(new in ("a", "c") for _old, new in result.moved.values())
+
+
+def test_cold_moves_are_moves_away_from_the_warm_node():
+    ring = HashRing(["a", "b"])
+    homes = ring.assignment(PROFILES)
+    result = rebalance(ring, PROFILES, homes, join="c")
+    assert sorted(result.cold) == sorted(result.moved)
+    assert result.summary() == f"moved={len(result.moved)} cold_moves={len(result.cold)}"
+    # a profile that never ran anywhere has no warm data to lose
+    assert rebalance(HashRing(["a"]), PROFILES, {}, join="b").cold == []
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from cancel_token import CANCELLED_MESSAGE
+from retry_policy import (
+    FAILURE_CANCELLED,
+    FAILURE_LOGIN,
+    FAILURE_PERMANENT,
+    FAILURE_QUOTA,
+    FAILURE_RETRYABLE,
+    backoff_delay,
+    classify_failure,
+    should_retry,
+)
+
+
+@pytest.mark.parametrize(
+    "error, failure",
+    [
+        ("TimeoutException: editor did not load", FAILURE_RETRYABLE),
+        ("worker exited with -9", FAILURE_RETRYABLE),
+        ("", FAILURE_RETRYABLE),
+        ("Publish quota exceeded for today", FAILURE_QUOTA),
+        ("Session expired, please sign in to Medium", FAILURE_LOGIN),
+        ("Profile 'bob' not found. Create it first", FAILURE_PERMANENT),
+        ("Published but no publish URL was captured", FAILURE_PERMANENT),
+        (CANCELLED_MESSAGE, FAILURE_CANCELLED),
+    ],
+)
+def test_classify_failure(error, failure):
+    assert classify_failure(error) == failure
+
+
+def test_only_retryable_failures_are_retried_within_the_budget():
+    assert should_retry(FAILURE_RETRYABLE, attempts=2, retries=2)
+    assert not should_retry(FAILURE_RETRYABLE, attempts=3, retries=2)
+    assert not should_retry(FAILURE_PERMANENT, attempts=1, retries=2)
+    assert not should_retry(FAILURE_LOGIN, attempts=1, retries=2)
+
+
+def test_backoff_doubles_with_jitter_up_to_the_cap():
+    random.seed(7)
+    for attempt, full in ((1, 10.0), (2, 20.0), (3, 40.0), (6, 100.0), (20, 100.0)):
+        delay = backoff_delay(attempt, base=10.0, cap=100.0)
+        assert full / 2 <= delay <= full
@@ -0,0 +1,181 @@
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+import schedule_reader
+from job_ledger import STATUS_PENDING
+
+TABLE = """platform,profile,type,title,content,images,schedule_time,date,link
+Medium,alice,,First,body one,,23:59,2099-12-31,
+Medium,bob,,Second,body two,,23:58,2099-12-31,
+"""
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule_reader, "SCHEDULE_LEDGER_PATH", str(tmp_path / "ledger.sqlite3"))
+    table = tmp_path / "schedule.csv"
+    table.write_text(TABLE, encoding="utf-8")
+    session = schedule_reader.ScheduleSession(table, 1, False, False, False)
+    session.table = table
+    yield session
+    session.ledger.close()
+
+
+def _job(session, title: str) -> schedule_reader.ScheduleJob:
+    return next(job for job, _target in session.known.values() if job.title == title)
+
+
+def test_reload_keeps_running_job_for_its_retry(session):
+    assert session.plan() == 2
+    job = _job(session, "First")
+    # its slot fired and the worker is publishing when the table is edited
+    session.timeline.cancel(job.key)
+    assert session.ledger.claim([job.key]) == [job.key]
+    session.table.write_text(TABLE.replace("body two", "body two, edited"), encoding="utf-8")
+
+    session.reload()
+    assert job.key in session.known
+
+    session._handle_failure(job.key, "timeout waiting for the editor")
+    assert job.key in session.timeline
+    assert session.ledger.statuses([job.key])[job.key] == STATUS_PENDING
+
+
+def test_reload_drops_rows_removed_from_the_table(session):
+    session.plan()
+    job = _job(session, "Second")
+    session.table.write_text("\n".join(TABLE.splitlines()[:2]) + "\n", encoding="utf-8")
+
+    session.reload()
+    assert job.key not in session.known
+    assert job.key not in session.timeline
+
+
+def test_timer_engine_fires_in_deadline_order():
+    engine = schedule_reader.TimerEngine(clock=lambda: 100.0)
+    fired = []
+    engine.schedule_at(30.0, fired.append, "c")
+    engine.schedule_at(10.0, fired.append, "a")
+    engine.schedule_at(10.0, fired.append, "b")  # ties fire in the order they were added
+    engine.run(until_idle=True)
+    assert fired == ["a", "b", "c"]
+    assert len(engine) == 0
+
+
+def test_timer_engine_cancel_reschedule_and_replace():
+    engine = schedule_reader.TimerEngine(clock=lambda: 100.0)
+    fired = []
+    engine.schedule_at(10.0, fired.append, "cancelled", timer_id="x")
+    engine.schedule_at(20.0, fired.append, "moved", timer_id="y")
+    engine.schedule_at(30.0, fired.append, "replaced", timer_id="z")
+    assert engine.cancel("x")
+    assert not engine.cancel("x")
+    assert engine.reschedule("y", 40.0)
+    engine.schedule_at(50.0, fired.append, "replacement", timer_id="z")
+    assert len(engine) == 2
+    engine.run(until_idle=True)
+    assert fired == ["moved", "replacement"]
+    # fired timers are gone: nothing is re-armed
+    assert not engine.reschedule("y", 60.0)
+
+
+def test_timer_engine_survives_a_failing_callback():
+    engine = schedule_reader.TimerEngine(clock=lambda: 100.0)
+    fired = []
+    engine.schedule_at(1.0, lambda: 1 / 0)
+    engine.schedule_at(2.0, fired.append, "next")
+    engine.run(until_idle=True)
+    assert fired == ["next"]
+
+
+def test_timer_engine_wakes_for_a_timer_added_while_sleeping():
+    engine = schedule_reader.TimerEngine()
+    fired = threading.Event()
+    runner = threading.Thread(target=engine.run, kwargs={"until_idle": False}, daemon=True)
+    runner.start()
+    engine.schedule_in(3600.0, fired.set)
+    engine.schedule_in(0.05, fired.set)
+    assert fired.wait(5.0)
+    engine.stop()
+    runner.join(5.0)
+    assert not runner.is_alive()
+
+
+def test_link_writeback_batches_rows_and_drops_repeats(tmp_path):
+    table = tmp_path / "schedule.csv"
+    table.write_text(TABLE, encoding="utf-8")
+    written = []
+    writer = schedule_reader.LinkWriteBack(on_written=lambda path, rows: written.append((path, rows)))
+    assert writer.submit(table, 2, "https://medium.com/a")
+    assert writer.submit(table, 3, "https://medium.com/b")
+    assert not writer.submit(table, 2, "https://medium.com/other")
+
+    assert writer.flush() == 2
+    assert written == [(table, [2, 3])]
+    links = {job.row_index: job.link for job in schedule_reader.iter_schedule_jobs(table, include_done=True)}
+    assert links == {2: "https://medium.com/a", 3: "https://medium.com/b"}
+    # a row is written once per run
+    assert not writer.submit(table, 3, "https://medium.com/b")
+    assert writer.flush() == 0
+
+
+def test_link_writeback_keeps_failed_rows_for_the_next_flush(tmp_path, monkeypatch):
+    table = tmp_path / "schedule.csv"
+    table.write_text(TABLE, encoding="utf-8")
+    writer = schedule_reader.LinkWriteBack()
+    writer.submit(table, 2, "https://medium.com/a")
+    real_write = schedule_reader.write_links_to_schedule
+
+    def locked(path, updates):
+        raise PermissionError("table is open in Excel")
+
+    monkeypatch.setattr(schedule_reader, "write_links_to_schedule", locked)
+    assert writer.flush() == 0
+    monkeypatch.setattr(schedule_reader, "write_links_to_schedule", real_write)
+    assert writer.flush() == 1
+
+
+def _timed_job(time_text: str, date_text: str, row_index: int) -> schedule_reader.ScheduleJob:
+    return schedule_reader.ScheduleJob(
+        "Medium", "alice", "", f"Row {row_index}", "body", "", time_text, date_text, "", row_index
+    )
+
+
+def test_time_parser_infers_the_dominant_formats():
+    now = datetime(2026, 3, 10, 8, 0)
+    jobs = [
+        _timed_job("09:30", "01/04", 2),
+        _timed_job("10:00", "02/04", 3),
+        _timed_job("10:15:30", "2026-04-03", 4),
+        _timed_job("", "", 5),
+    ]
+    parser = schedule_reader.ScheduleTimeParser.infer(jobs, now=now)
+    assert (parser.time_format, parser.date_format) == ("%H:%M", "%d/%m")
+
+    targets, errors = parser.parse_jobs(jobs)
+    assert errors == []
+    assert [targets[job.key] for job in jobs] == [
+        datetime(2026, 4, 1, 9, 30),
+        datetime(2026, 4, 2, 10, 0),
+        datetime(2026, 4, 3, 10, 15, 30),
+        None,  # no time: run now
+    ]
+    # the odd row still parses, but is reported
+    assert parser.fallback_rows == [4]
+
+
+def test_time_parser_defaults_to_the_captured_day():
+    parser = schedule_reader.ScheduleTimeParser("%H:%M", None, now=datetime(2026, 3, 10, 8, 0))
+    assert parser.parse("17:45") == datetime(2026, 3, 10, 17, 45)
+    assert parser.parse("2026-05-01 07:00") == datetime(2026, 5, 1, 7, 0)
+
+
+def test_time_parser_reports_rows_it_cannot_read():
+    jobs = [_timed_job("noon", "", 2), _timed_job("25:00", "", 3), _timed_job("09:00", "31/13", 4)]
+    parser = schedule_reader.ScheduleTimeParser("%H:%M", "%d/%m", now=datetime(2026, 3, 10))
+    targets, errors = parser.parse_jobs(jobs)
+    assert targets == {}
+    assert [job.row_index for job, _reason in errors] == [2, 3, 4]
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import schedule_sim
+from config import MEDIUM_PUBLISH_QUOTA, MEDIUM_PUBLISH_WINDOW_S
+from schedule_reader import SlotQueue
+
+HEADER = "platform,profile,type,title,content,images,schedule_time,date,link\n"
+
+
+def _simulate(tmp_path, rows, limit=2, overlap=True, seconds=60):
+    table = tmp_path / "schedule.csv"
+    table.write_text(HEADER + "".join(rows), encoding="utf-8")
+    return schedule_sim.simulate(table, limit, overlap, schedule_sim.FakeRunner(f"fixed:{seconds}"))
+
+
+def test_slot_queue_hands_slots_by_priority_then_arrival():
+    gate = SlotQueue(1)
+    assert gate.try_take()
+    gate.push((2, 0), "late")
+    gate.push((1, -5), "short")
+    gate.push((1, -9), "long")
+    assert not gate.ready()
+    order = []
+    while len(gate):
+        gate.release()
+        assert gate.ready()
+        order.append(gate.take())
+    assert order == ["long", "short", "late"]
+
+
+def test_publish_quota_defers_through_the_ledger(tmp_path):
+    rows = [f"Medium,alice,,T{i},body {i},,09:00,2099-01-01,\n" for i in range(MEDIUM_PUBLISH_QUOTA + 2)]
+    sim = _simulate(tmp_path, rows)
+    first = sim.slots[0]
+    assert first.deferred == 2
+    assert sim.done == len(rows)
+    # the held jobs wait until the first publishes leave the window
+    assert (sim.slots[-1].fired - first.fired).total_seconds() >= MEDIUM_PUBLISH_WINDOW_S
+
+
+def test_profile_never_runs_in_two_groups(tmp_path):
+    rows = [
+        "Medium,alice,,A,body a,,09:00,2099-01-01,\n",
+        "Medium,alice,,B,body b,,09:01,2099-01-01,\n",
+        "Medium,bob,,C,body c,,09:01,2099-01-01,\n",
+    ]
+    sim = _simulate(tmp_path, rows, limit=3, seconds=600)
+    second = sim.slots[1]
+    assert sim._peak == 2
+    # bob starts on time, alice's second group waits for her first one
+    assert sorted(second.start_lateness) == [0.0, 540.0]
+    assert sim.slots[0].fired == datetime(2099, 1, 1, 9, 0)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Sequence
+
+from config import SCHEDULE_PRELOAD, SCHEDULE_START_METHOD
+
+_context: Any = None
+
+
+def _log(message: str) -> None:
+    caller = inspect.currentframe().f_back  # type: ignore[assignment]
+    line = caller.f_lineno if caller else -1
+    pid = os.getpid()
+    formatted = f"[pid {pid:>6}] [line {line:04d}] {message}"
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    try:
+        sys.stdout.buffer.write((formatted + "\n").encode(encoding, errors="replace"))
+        sys.stdout.flush()
+    except Exception:
+        print(formatted)
+
+
+def _context_for(method: str | None, preload: Sequence[str] = SCHEDULE_PRELOAD) -> Any:
+    if method not in multiprocessing.get_all_start_methods():
+        method = None
+    ctx = multiprocessing.get_context(method)
+    if ctx.get_start_method() == "forkserver":
+        ctx.set_forkserver_preload(list(preload))
+    return ctx
+
+
+def mp_context(warm: bool = False) -> Any:
+    """Multiprocessing context every worker process, queue and event comes from.
+
+    By default workers start with the platform's default method. Opting in
+    with ``SCHEDULE_START_METHOD = "forkserver"`` has one server process
+    import ``SCHEDULE_PRELOAD`` (Selenium, the GUI stack, the scheduler)
+    once and each worker forked from it, instead of a fresh interpreter
+    importing all of it per profile group. Platforms without forkserver
+    (Windows) keep their default method. ``warm`` starts the server right
+    away so the preload overlaps with reading the tables.
+
+    ``__main__`` is not preloaded: the server would re-run whatever script
+    or REPL started the scheduler.
+    """
+    global _context
+    if _context is None:
+        _context = _context_for(SCHEDULE_START_METHOD)
+        _log(f"INFO:MP_CONTEXT method={_context.get_start_method()}")
+    if warm and _context.get_start_method() == "forkserver":
+        from multiprocessing import forkserver
+
+        forkserver.ensure_running()  # returns at once; the server imports in the background
+        _log(f"INFO:FORKSERVER_START preload={','.join(SCHEDULE_PRELOAD)}")
+    return _context
+
+
+def _probe(modules: Sequence[str], results: Any, started: float) -> None:
+    missing = []
+    for name in modules:
+        if name == "__main__":
+            continue
+        try:
+            importlib.import_module(name)
+        except Exception:  # pylint: disable=broad-except
+            missing.append(name)
+    results.put((time.time() - started, missing))
+
+
+def benchmark_startup(
+    workers: int = 4,
+    methods: Iterable[str] = ("spawn", "forkserver"),
+    modules: Sequence[str] = SCHEDULE_PRELOAD,
+) -> Dict[str, List[float]]:
+    """Time how long a worker takes from ``start()`` until ``modules`` are importable.
+
+    Workers start one after another; the first forkserver worker also pays
+    for starting the server and its preload, so it is reported apart.
+    """
+    timings: Dict[str, List[float]] = {}
+    available = multiprocessing.get_all_start_methods()
+    for method in methods:
+        if method not in available:
+            _log(f"WARN:STARTUP_BENCH method={method} unavailable on {sys.platform}")
+            continue
+        ctx = _context_for(method, [*modules, __name__])
+        results = ctx.Queue()
+        samples: List[float] = []
+        missing: List[str] = []
+        for _ in range(max(1, workers)):
+            proc = ctx.Process(target=_probe, args=(modules, results, time.time()))
+            proc.start()
+            ready, missing = results.get()
+            proc.join()
+            samples.append(ready)
+        timings[method] = samples
+        _log(
+            f"INFO:STARTUP_BENCH method={method} workers={len(samples)} first={samples[0] * 1000:.0f}ms "
+            f"mean={_steady(samples) * 1000:.1f}ms max={max(samples[1:] or samples) * 1000:.1f}ms "
+            f"missing={','.join(missing) or '-'}"
+        )
+    if "spawn" in timings and "forkserver" in timings:
+        spawn, forked = _steady(timings["spawn"]), _steady(timings["forkserver"])
+        _log(f"INFO:STARTUP_BENCH_GAIN spawn={spawn * 1000:.0f}ms forkserver={forked * 1000:.1f}ms x{spawn / forked:.1f}")
+    return timings
+
+
+def _steady(samples: List[float]) -> float:
+    # mean without the first start, which may include the forkserver's own preload
+    steady = samples[1:] or samples
+    return sum(steady) / len(steady)